@@ -1,2 +1 @@
-uv run src/main.py
-cd public && python3 -m http.server 8888
\ No newline at end of file
+uv run src/main.py serve --watch
\ No newline at end of file
@@ -0,0 +1,390 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import timeit
+import tracemalloc
+from block_markdown import markdown_to_blocks, classify_block, BlockType
+from inline_markdown import text_to_textnodes, text_to_textnodes_multipass
+from markdown_to_html import block_to_html_node
+from builder import Site
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode
+
+SHAPES = ("paragraphs", "lists", "links", "code", "mixed")
+TEMPLATE = '<html><head><title>{{ Title }}</title><link href="/index.css"></head><body>{{ Content }}</body></html>'
+WORDS = ("the", "ring", "of", "power", "hobbit", "shire", "elves", "journey", "mountain", "wizard", "road", "goes", "ever", "on")
+
+def link_heavy_paragraph(links=200):
+    """Build a paragraph made mostly of markdown links and images.
+
+    Args:
+        links (int): Number of links (every fifth one is an image).
+
+    Returns:
+        str: The paragraph text.
+    """
+    parts = []
+    for i in range(links):
+        if i % 5 == 4:
+            parts.append(f"see ![figure {i}](/images/figure-{i}.png)")
+        else:
+            parts.append(f"read [post number {i}](/blog/post-{i})")
+    return ", ".join(parts)
+
+def emphasis_heavy_paragraph(spans=200):
+    """Build a paragraph alternating bold, italic and code spans with plain text.
+
+    Args:
+        spans (int): Number of formatted spans.
+
+    Returns:
+        str: The paragraph text.
+    """
+    markers = ["**", "_", "`"]
+    parts = []
+    for i in range(spans):
+        marker = markers[i % len(markers)]
+        parts.append(f"plain words {i} {marker}formatted {i}{marker}")
+    return " ".join(parts)
+
+def words(count, seed):
+    """Return `count` filler words, varied by seed so pages aren't identical."""
+    return " ".join(WORDS[(seed + i * 7) % len(WORDS)] for i in range(count))
+
+def synthetic_page(shape, size, seed=0):
+    """Generate one markdown page of a given shape.
+
+    Args:
+        shape (str): One of SHAPES - "paragraphs" (long paragraphs), "lists"
+            (long unordered and ordered lists), "links" (link-dense text),
+            "code" (huge code blocks) or "mixed" (a bit of everything).
+        size (int): Rough number of blocks, items or spans on the page.
+        seed (int): Varies the generated text between pages.
+
+    Returns:
+        str: The markdown page, always starting with a "# " title.
+    """
+    blocks = [f"# Page {seed}"]
+    if shape == "paragraphs":
+        for i in range(size):
+            blocks.append(f"{words(60, seed + i)} **{words(3, i)}** {words(40, i)} _{words(2, seed)}_ {words(30, i + 1)}")
+    elif shape == "lists":
+        blocks.append("\n".join(f"- {words(8, seed + i)} **item {i}**" for i in range(size)))
+        blocks.append("\n".join(f"{i + 1}. {words(6, i)} [step {i}](/steps/{i})" for i in range(size)))
+    elif shape == "links":
+        for i in range(max(1, size // 20)):
+            blocks.append(link_heavy_paragraph(20))
+    elif shape == "code":
+        lines = "\n".join(f"    value_{i} = compute({i}, **options)  # {words(5, i)}" for i in range(size * 10))
+        blocks.append(f"```\n{lines}\n```")
+    elif shape == "mixed":
+        for i in range(max(1, size // 5)):
+            blocks.append(f"## Section {i}")
+            blocks.append(f"{words(40, seed + i)} with `code {i}` and a [link](/blog/{i}).")
+            blocks.append("\n".join(f"- {words(5, i + j)}" for j in range(5)))
+            blocks.append(f"> {words(20, i)}\n> {words(10, seed)}")
+            blocks.append(f"```\nprint({i})\n```")
+    else:
+        raise ValueError(f"Unknown corpus shape: {shape}")
+    return "\n\n".join(blocks) + "\n"
+
+def generate_corpus(pages, shape, size):
+    """Generate a synthetic corpus of markdown pages.
+
+    Args:
+        pages (int): Number of pages.
+        shape (str): Page shape, see synthetic_page.
+        size (int): Rough number of blocks, items or spans per page.
+
+    Returns:
+        dict: Maps relative source paths (e.g. "page-3/index.md") to markdown.
+    """
+    return {f"page-{i}/index.md": synthetic_page(shape, size, i) for i in range(pages)}
+
+def inline_texts(block_type, lines):
+    """Return the inline-markdown strings block_to_html_node would parse for a block.
+
+    Args:
+        block_type (BlockType): The block's type.
+        lines (list[str]): Its content lines, see classify_block.
+
+    Returns:
+        list[str]: The texts passed to text_to_textnodes (none for code blocks).
+    """
+    if block_type == BlockType.CODE:
+        return []
+    if block_type == BlockType.QUOTE:
+        return ["\n".join(lines)]
+    if block_type in (BlockType.ORDERED, BlockType.UNORDERED, BlockType.HEADING):
+        return lines
+    return [" ".join(lines)]
+
+def timed(stages, name, func):
+    """Run func once, recording its wall-clock time under stages[name]."""
+    start = time.perf_counter()
+    result = func()
+    stages[name] = time.perf_counter() - start
+    return result
+
+def bench_pipeline(corpus, static_files=200, static_file_size=64 * 1024):
+    """Time each stage of the markdown-to-HTML pipeline over a corpus.
+
+    Every stage runs over the whole corpus on the output of the previous one,
+    so the times isolate each stage's own cost.
+
+    Args:
+        corpus (dict): Relative source path -> markdown, see generate_corpus.
+        static_files (int): Number of synthetic static files for the copy stage.
+        static_file_size (int): Size in bytes of each synthetic static file.
+
+    Returns:
+        dict: Stage name -> seconds.
+    """
+    from main import BuildOptions, generate_site  # main dispatches to this module
+    from static_sync import sync_static
+
+    stages = {}
+    sources = list(corpus.values())
+    blocks = timed(stages, "markdown_to_blocks", lambda: [markdown_to_blocks(md) for md in sources])
+    types = timed(stages, "block_to_block_type", lambda: [[classify_block(b) for b in page] for page in blocks])
+    texts = [text for page_types in types for t, lines in page_types for text in inline_texts(t, lines)]
+    timed(stages, "text_to_textnodes", lambda: [text_to_textnodes(text) for text in texts])
+    nodes = timed(stages, "block_to_html_node",
+                  lambda: [[block_to_html_node(b, t, "/", lines) for b, (t, lines) in zip(page, page_types)]
+                           for page, page_types in zip(blocks, types)])
+    pages_html = timed(stages, "to_html", lambda: ["".join(node.to_html() for node in page) for page in nodes])
+    timed(stages, "in_memory_build", lambda: Site(TEMPLATE).build(corpus))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        static_dir = os.path.join(tmp, "static")
+        public_dir = os.path.join(tmp, "docs")
+        template_path = os.path.join(tmp, "template.html")
+
+        def write_files():
+            for (rel_path, markdown), html in zip(corpus.items(), pages_html):
+                md_path = os.path.join(content_dir, rel_path)
+                os.makedirs(os.path.dirname(md_path), exist_ok=True)
+                with open(md_path, "w") as f:
+                    f.write(markdown)
+                with open(os.path.splitext(md_path)[0] + ".html", "w") as f:
+                    f.write(html)
+        timed(stages, "file_write", write_files)
+
+        def read_files():
+            for rel_path in corpus:
+                with open(os.path.join(content_dir, rel_path)) as f:
+                    f.read()
+        timed(stages, "file_read", read_files)
+        for rel_path in corpus:
+            os.remove(os.path.splitext(os.path.join(content_dir, rel_path))[0] + ".html")
+
+        payload = os.urandom(static_file_size)
+        for i in range(static_files):
+            asset_path = os.path.join(static_dir, f"dir-{i % 10}", f"asset-{i}.bin")
+            os.makedirs(os.path.dirname(asset_path), exist_ok=True)
+            with open(asset_path, "wb") as f:
+                f.write(payload)
+        os.makedirs(public_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            timed(stages, "static_copy", lambda: sync_static(static_dir, public_dir, {}, {}))
+
+            with open(template_path, "w") as f:
+                f.write(TEMPLATE)
+            timed(stages, "full_build", lambda: generate_site(static_dir, public_dir, template_path, content_dir, "/"))
+            timed(stages, "noop_incremental_build",
+                  lambda: generate_site(static_dir, public_dir, template_path, content_dir, "/", BuildOptions(incremental=True)))
+    return stages
+
+class DictHTMLNode:
+    """An HTMLNode-shaped object with a per-instance __dict__, the baseline for bench_memory."""
+    def __init__(self, tag, value, children, props):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+class DictTextNode:
+    """A TextNode-shaped object with a per-instance __dict__, the baseline for bench_memory."""
+    def __init__(self, text, text_type, url):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+def slotted_html_node(tag, value, children, props):
+    if children is None:
+        return LeafNode(tag, value, props)
+    return ParentNode(tag, children, props)
+
+def clone_tree(node, make):
+    """Rebuild an HTML node tree with make(tag, value, children, props), sharing its strings."""
+    children = None if node.children is None else [clone_tree(child, make) for child in node.children]
+    return make(node.tag, node.value, children, node.props)
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children or ())
+
+def allocated_bytes(func):
+    """Run func under tracemalloc, returning its result and the bytes it left allocated."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+def bench_memory(corpus):
+    """Measure how much memory the node classes use for a corpus's node trees.
+
+    The trees are built once, then cloned into slotted nodes and into
+    equivalent plain objects with a per-instance __dict__. The clones share
+    every string with the originals, so the difference is purely the cost
+    of the node objects themselves.
+
+    Args:
+        corpus (dict): Relative source path -> markdown, see generate_corpus.
+
+    Returns:
+        dict: For "html_nodes" and "text_nodes", the node count, the bytes used
+        by "slotted" and "dict" nodes, and the fraction saved.
+    """
+    trees = []
+    text_nodes = []
+    for markdown in corpus.values():
+        for block in markdown_to_blocks(markdown):
+            block_type, lines = classify_block(block)
+            trees.append(block_to_html_node(block, block_type, "/", lines))
+            text_nodes.extend(node for text in inline_texts(block_type, lines) for node in text_to_textnodes(text))
+
+    results = {}
+    html_count = sum(count_nodes(tree) for tree in trees)
+    text_fields = [(node.text, node.text_type, node.url) for node in text_nodes]
+    for name, count, slotted, baseline in (
+        ("html_nodes", html_count,
+         lambda: [clone_tree(tree, slotted_html_node) for tree in trees],
+         lambda: [clone_tree(tree, DictHTMLNode) for tree in trees]),
+        ("text_nodes", len(text_nodes),
+         lambda: [TextNode(*fields) for fields in text_fields],
+         lambda: [DictTextNode(*fields) for fields in text_fields]),
+    ):
+        _, slotted_bytes = allocated_bytes(slotted)
+        _, dict_bytes = allocated_bytes(baseline)
+        results[name] = {
+            "count": count,
+            "slotted_bytes": slotted_bytes,
+            "dict_bytes": dict_bytes,
+            "saving": 1 - slotted_bytes / dict_bytes if dict_bytes else 0.0,
+        }
+    return results
+
+def time_call(func, arg, repeat=3):
+    """Time func(arg), returning the best average seconds per call.
+
+    Args:
+        func: The function to time.
+        arg: The single argument to pass.
+        repeat (int): Number of timing rounds; the fastest is kept.
+
+    Returns:
+        float: Seconds per call.
+    """
+    timer = timeit.Timer(lambda: func(arg))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def bench_inline(sizes=(10, 100, 1000)):
+    """Compare the single-pass inline scanner with the multi-pass chain.
+
+    Args:
+        sizes (tuple[int]): Span counts to generate paragraphs for.
+
+    Returns:
+        list[dict]: One result per paragraph shape and size.
+    """
+    results = []
+    for shape, build in (("links", link_heavy_paragraph), ("emphasis", emphasis_heavy_paragraph)):
+        for size in sizes:
+            text = build(size)
+            single_pass = time_call(text_to_textnodes, text)
+            multipass = time_call(text_to_textnodes_multipass, text)
+            results.append({
+                "shape": shape,
+                "spans": size,
+                "chars": len(text),
+                "single_pass_ms": single_pass * 1000,
+                "multipass_ms": multipass * 1000,
+                "speedup": multipass / single_pass,
+            })
+    return results
+
+def git_commit():
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(pages=200, shape="mixed", size=50, repeat=3, inline=True):
+    """Run the pipeline benchmark (best of `repeat` runs per stage), the node
+    memory comparison and the inline comparison.
+
+    Args:
+        pages (int): Number of synthetic pages.
+        shape (str): Page shape, see synthetic_page.
+        size (int): Rough number of blocks, items or spans per page.
+        repeat (int): Pipeline runs; the fastest time per stage is reported.
+        inline (bool): Also run the inline scanner comparison.
+
+    Returns:
+        dict: A JSON-serializable report.
+    """
+    corpus = generate_corpus(pages, shape, size)
+    runs = [bench_pipeline(corpus) for _ in range(repeat)]
+    stages = {name: {"seconds": min(run[name] for run in runs), "per_page_ms": min(run[name] for run in runs) * 1000 / pages}
+              for name in runs[0]}
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"pages": pages, "shape": shape, "size": size,
+                   "bytes": sum(len(md.encode()) for md in corpus.values())},
+        "repeat": repeat,
+        "stages": stages,
+        "memory": bench_memory(corpus),
+        "inline": bench_inline() if inline else [],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py bench", description="Benchmark the markdown-to-HTML pipeline.")
+    parser.add_argument("--pages", type=int, default=200, help="Number of synthetic pages")
+    parser.add_argument("--shape", choices=SHAPES, default="mixed", help="Shape of each page")
+    parser.add_argument("--size", type=int, default=50, help="Rough number of blocks, items or spans per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the fastest is reported")
+    parser.add_argument("--no-inline", action="store_true", help="Skip the inline scanner comparison")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.pages, args.shape, args.size, args.repeat, inline=not args.no_inline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        for name, stage in report["stages"].items():
+            print(f"{name:<24}{stage['seconds'] * 1000:>10.1f} ms{stage['per_page_ms']:>10.3f} ms/page")
+        for name, memory in report["memory"].items():
+            print(f"{name:<24}{memory['slotted_bytes'] / 1024:>10.1f} KB slotted, "
+                  f"{memory['dict_bytes'] / 1024:.1f} KB with __dict__ ({memory['saving']:.0%} saved)")
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
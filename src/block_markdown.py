@@ -1,3 +1,4 @@
+import re
 from enum import Enum
 
 class BlockType(Enum):
@@ -34,6 +35,169 @@ def markdown_to_blocks(markdown):
             stripped_blocks.append(stripped_block)
     return stripped_blocks
 
+def split_raw_blocks(markdown):
+    """Lazily yield the pieces of markdown.split("\\n\\n") without building the list.
+
+    Args:
+        markdown: The raw markdown string.
+
+    Yields:
+        str: Each raw (unstripped, possibly empty) piece between separators.
+    """
+    start = 0
+    while True:
+        end = markdown.find("\n\n", start)
+        if end == -1:
+            yield markdown[start:]
+            return
+        yield markdown[start:end]
+        start = end + 2
+
+def read_raw_blocks(stream, chunk_size=65536):
+    """Lazily split a text stream on blank lines, exactly like str.split("\\n\\n").
+
+    The stream is read in chunks and each piece is yielded as soon as its
+    terminating blank line has been read, so only the current block and one
+    chunk are ever held in memory.
+
+    Args:
+        stream: A text file object (anything with a read(size) method).
+        chunk_size (int): Number of characters to read at a time.
+
+    Yields:
+        str: Each raw (unstripped, possibly empty) piece between separators.
+
+    Example:
+        list(read_raw_blocks(io.StringIO("# Title\\n\\nText")))
+        # ["# Title", "Text"]
+    """
+    buffer = ""
+    for chunk in iter(lambda: stream.read(chunk_size), ""):
+        search_from = max(len(buffer) - 1, 0) # Everything before this was already searched
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find("\n\n", max(start, search_from))
+            if end == -1:
+                break
+            yield buffer[start:end]
+            start = end + 2
+        buffer = buffer[start:]
+    yield buffer
+
+def read_blocks(stream, chunk_size=65536):
+    """Lazily yield the markdown blocks of a text stream.
+
+    The streaming counterpart of markdown_to_blocks: blocks are trimmed and
+    empty blocks are skipped, but nothing beyond the current block is kept
+    in memory.
+
+    Args:
+        stream: A text file object (anything with a read(size) method).
+        chunk_size (int): Number of characters to read at a time.
+
+    Yields:
+        str: Each non-empty, trimmed markdown block.
+
+    Example:
+        with open("content/index.md") as f:
+            for block in read_blocks(f):
+                print(block_to_block_type(block))
+    """
+    for raw_block in read_raw_blocks(stream, chunk_size):
+        block = raw_block.strip()
+        if block != "":
+            yield block
+
+HEADING_PATTERN = re.compile(r"(#{1,6}) ")            # "# " to "###### " at the start of a block
+ORDERED_ITEM_PATTERN = re.compile(r"([1-9]\d*)\. ")   # "1. ", "2. ", ... at the start of a line
+
+def heading_lines(block):
+    match = HEADING_PATTERN.match(block)
+    return None if match is None else [block[match.end():]]
+
+def code_lines(block):
+    last_line = block.rfind("\n")
+    if last_line == -1 or not block.startswith("```") or not block.startswith("```", last_line + 1):
+        return None
+    return [block[4:-3]] # Skip "```\n" at start and "\n```" at end
+
+def quote_lines(block):
+    lines = []
+    for line in block.split("\n"):
+        if not line.startswith(">"):
+            return None
+        lines.append(line[1:].lstrip(" ")) # Remove ">" and then any leading space
+    return lines
+
+def unordered_lines(block):
+    lines = []
+    for line in block.split("\n"):
+        if not line.startswith("- "):
+            return None
+        lines.append(line[2:])
+    return lines
+
+def ordered_lines(block):
+    lines = []
+    for i, line in enumerate(block.split("\n"), 1):
+        match = ORDERED_ITEM_PATTERN.match(line)
+        if match is None or int(match.group(1)) != i:
+            return None
+        lines.append(line[match.end():])
+    return lines
+
+# Every non-paragraph block type is recognisable by its first character, so
+# classification is one dict lookup plus the checks for a single candidate type.
+BLOCK_CLASSIFIERS = {
+    "#": (BlockType.HEADING, heading_lines),
+    "`": (BlockType.CODE, code_lines),
+    ">": (BlockType.QUOTE, quote_lines),
+    "-": (BlockType.UNORDERED, unordered_lines),
+    "1": (BlockType.ORDERED, ordered_lines),
+}
+
+def classify_block(block):
+    """Determine a block's type and strip its markdown syntax in a single pass.
+
+    The block's first character selects the only type it could be, and that
+    type's line function checks and strips every line at once. Blocks that
+    fail the check are paragraphs.
+
+    Args:
+        block: A single markdown block string.
+
+    Returns:
+        tuple[BlockType, list[str]]: The block type and its content lines:
+        the heading text, the code (as one string), the quote lines without
+        ">", the list item texts without their markers, or the paragraph lines.
+
+    Example:
+        classify_block("1. First\\n2. Second")
+        # (BlockType.ORDERED, ["First", "Second"])
+    """
+    classifier = BLOCK_CLASSIFIERS.get(block[:1])
+    if classifier is not None:
+        block_type, strip_lines = classifier
+        lines = strip_lines(block)
+        if lines is not None:
+            return block_type, lines
+    return BlockType.PARAGRAPH, block.split("\n")
+
+def block_lines(block, block_type):
+    """Return a block's content lines (see classify_block) for an already known type.
+
+    Raises:
+        ValueError: If the block isn't valid markdown for that type.
+    """
+    if block_type == BlockType.PARAGRAPH:
+        return block.split("\n")
+    _, strip_lines = next(classifier for classifier in BLOCK_CLASSIFIERS.values() if classifier[0] == block_type)
+    lines = strip_lines(block)
+    if lines is None:
+        raise ValueError(f"Not a valid {block_type.value} block")
+    return lines
+
 def block_to_block_type(block):
     """Determine the block-level markdown type of a given block.
 
@@ -52,34 +216,25 @@ def block_to_block_type(block):
         block_type = block_to_block_type(block)
         # BlockType.ORDERED
     """
-    lines = block.split("\n")
-
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return BlockType.HEADING
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
-        return BlockType.CODE
-    if block.startswith(">"):
-        for line in lines:
-            if not line.startswith(">"):
-                return BlockType.PARAGRAPH
-        return BlockType.QUOTE
-    if block.startswith("- "):
-        for line in lines:
-            if not line.startswith("- "):
-                return BlockType.PARAGRAPH
-        return BlockType.UNORDERED
-    if block.startswith("1. "):
-        i = 1
-        for line in lines:
-            if not line.startswith(f"{i}. "):
-                return BlockType.PARAGRAPH
-            i += 1
-        return BlockType.ORDERED
-    return BlockType.PARAGRAPH
+    return classify_block(block)[0]
 
 def extract_title(markdown):
-    lines = markdown.split("\n\n")
-    for line in lines:
+    return find_title(split_raw_blocks(markdown))
+
+def read_title(stream):
+    """Find the page title in a text stream, reading no further than the title block.
+
+    Args:
+        stream: A text file object positioned at the start of the document.
+
+    Returns:
+        str: The text of the first "# " heading.
+    """
+    return find_title(read_raw_blocks(stream))
+
+def find_title(raw_blocks):
+    """Return the text of the first raw block that starts with "# ", stopping there."""
+    for line in raw_blocks:
         if line.startswith("# "):
             return line[2:].strip()
     raise Exception("No h1 header found - title could not be generated.")
\ No newline at end of file
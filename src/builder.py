@@ -0,0 +1,110 @@
+from block_markdown import extract_title, read_blocks, read_title
+from content_index import output_path
+from front_matter import read_front_matter, split_front_matter
+from markdown_to_html import markdown_to_html_node, write_markdown_html
+from render_cache import InlineMemo, DEFAULT_MEMO_BYTES
+from template import Template
+
+class Site:
+    def __init__(self, template, basepath: str = "/", cache=None, memo_size: int = DEFAULT_MEMO_BYTES, collector=None,
+                 asset_urls: dict = None):
+        """Renders markdown pages through a template entirely in memory.
+
+        This is the rendering core the command line build wraps: it knows
+        nothing about directories, so it can be embedded in a long-running
+        service, render pages on demand, or be benchmarked without disk I/O.
+        Everything a render touches (template, caches, term collector) belongs
+        to the Site, so separate Sites never share state; a single Site
+        renders one page at a time.
+
+        Args:
+            template (str | Template): The template text (e.g. the contents of
+                template.html), or an already compiled Template.
+            basepath (str): URL prefix the site is served from. Ignored when
+                template is already compiled.
+            cache (Optional[RenderCache]): Cache of rendered HTML per block.
+            memo_size (int): Inline memo size limit in bytes, 0 to disable it.
+                The memo lives as long as the Site.
+            collector (Optional[TermCollector]): Receives every rendered
+                block, for the search index.
+            asset_urls (Optional[dict]): Fingerprinted asset names (see
+                rewrite_url). Ignored when template is already compiled.
+
+        Example:
+            site = Site("<title>{{ Title }}</title>{{ Content }}")
+            site.build({"index.md": "# Home\n\nWelcome"})
+            # => {"index.html": "<title>Home</title><div><h1>Home</h1><p>Welcome</p></div>"}
+        """
+        self.template = template if isinstance(template, Template) else Template(template, basepath, asset_urls)
+        self.cache = cache
+        self.memo = InlineMemo(memo_size) if memo_size else None
+        self.collector = collector
+
+    @property
+    def basepath(self):
+        return self.template.basepath
+
+    def render(self, markdown):
+        """Render one markdown document into a full HTML page.
+
+        Root-relative URLs are rewritten for the basepath while the node tree
+        is built, so the finished document is never rescanned. Front matter
+        is left out of the page; its "title" field, if any, wins over the
+        first heading.
+
+        Args:
+            markdown (str): The raw markdown document.
+
+        Returns:
+            str: The rendered HTML page.
+        """
+        metadata, body = split_front_matter(markdown)
+        html_nodes = markdown_to_html_node(body, self.basepath, self.cache, self.memo, self.collector,
+                                           self.template.asset_urls).to_html()
+        page_title = metadata.get("title") or extract_title(body)
+        return self.template.render(Title=page_title, Content=html_nodes)
+
+    def render_stream(self, stream, write):
+        """Render a seekable markdown stream block by block, writing as it goes.
+
+        Memory use is bounded by the largest single block rather than the size
+        of the document.
+
+        Args:
+            stream: A seekable text file object positioned at the start.
+            write: A callable taking a string, e.g. an open file's write method.
+        """
+        metadata, body_start = read_front_matter(stream)
+        page_title = metadata.get("title") or read_title(stream)
+        stream.seek(body_start)
+        self.template.write(write, Title=page_title,
+                            Content=lambda content_write: write_markdown_html(read_blocks(stream), content_write, self.basepath,
+                                                                              self.cache, self.memo, self.collector,
+                                                                              self.template.asset_urls))
+
+    def pages(self, sources):
+        """Lazily render every source, sharing the Site's inline memo between them.
+
+        Args:
+            sources: A mapping of relative source path to markdown, or an
+                iterable of (path, markdown) pairs (which may itself be lazy).
+
+        Yields:
+            tuple[str, str]: The output path (e.g. "blog/tom/index.html") and
+            the rendered page, in source order.
+        """
+        items = sources.items() if hasattr(sources, "items") else sources
+        for rel_path, markdown in items:
+            yield output_path(rel_path), self.render(markdown)
+
+    def build(self, sources):
+        """Render every source into a mapping of output path to HTML.
+
+        Args:
+            sources: A mapping of relative source path to markdown, or an
+                iterable of (path, markdown) pairs.
+
+        Returns:
+            dict: Output path (e.g. "index.html") -> rendered page.
+        """
+        return dict(self.pages(sources))
@@ -0,0 +1,136 @@
+import contextlib
+import fnmatch
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from manifest import entry_outputs
+from writer import AtomicFile
+
+try:
+    import brotli
+except ImportError:  # Optional; only gzip siblings are written without it
+    brotli = None
+
+COMPRESS_WORKERS = 4
+MIN_COMPRESS_SIZE = 1024  # Smaller files don't gain enough to be worth a sibling
+COMPRESSIBLE_PATTERNS = ("*.html", "*.css", "*.js", "*.json", "*.svg", "*.xml", "*.txt")
+
+def available_encodings():
+    """Return the sibling suffixes that can be written here, e.g. (".gz", ".br")."""
+    return (".gz", ".br") if brotli is not None else (".gz",)
+
+def encode(data, suffix):
+    """Compress bytes for the given sibling suffix at the highest level.
+
+    Gzip output has its timestamp zeroed, so the same input always gives
+    the same bytes.
+    """
+    if suffix == ".gz":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+def compress_file(path, suffixes, min_size=MIN_COMPRESS_SIZE):
+    """Write the compressed siblings of one file, unless they're already up to date.
+
+    A sibling gets the mtime of the file it was compressed from, so a
+    matching mtime means it's current. Files below min_size get no siblings
+    (and lose any they had from when they were bigger).
+
+    Args:
+        path (str): The file to compress (e.g. "docs/index.html").
+        suffixes (tuple[str]): Sibling suffixes to write, see available_encodings.
+        min_size (int): Smallest file size in bytes worth compressing.
+
+    Returns:
+        tuple[list[str], list[str]]: The sibling paths that exist after the
+        call, and the ones among them that were (re)written.
+    """
+    src_stat = os.stat(path)
+    if src_stat.st_size < min_size:
+        for suffix in suffixes:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path + suffix)
+        return [], []
+    siblings, written = [], []
+    data = None
+    for suffix in suffixes:
+        sibling = path + suffix
+        siblings.append(sibling)
+        try:
+            if os.stat(sibling).st_mtime_ns == src_stat.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        with AtomicFile(sibling, "wb", skip_unchanged=False) as f:
+            f.write(encode(data, suffix))
+        os.utime(sibling, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        written.append(sibling)
+    return siblings, written
+
+def compress_outputs(public_dir, outputs, patterns=COMPRESSIBLE_PATTERNS, min_size=MIN_COMPRESS_SIZE,
+                     workers=COMPRESS_WORKERS):
+    """Write precompressed .gz (and .br, with the brotli module) siblings for text outputs.
+
+    Static file servers can send these directly instead of compressing
+    every response. Files are compressed on a thread pool (zlib and brotli
+    release the GIL), and siblings that are already up to date are skipped.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        outputs (Iterable[str]): Output paths relative to public_dir.
+        patterns (tuple[str]): Glob patterns of file names to compress.
+        min_size (int): Smallest file size in bytes worth compressing.
+        workers (int): Number of compression threads.
+
+    Returns:
+        dict: Counts of "compressed", "unchanged" and "failed" files, the
+        relative paths of every sibling ("siblings") and of those written
+        this time ("written_paths").
+
+    Example:
+        compress_outputs("docs", ["index.html", "index.css"])
+        # => {"compressed": 2, "unchanged": 0, "failed": 0, "siblings": ["index.css.gz", ...], ...}
+    """
+    suffixes = available_encodings()
+    stats = {"compressed": 0, "unchanged": 0, "failed": 0, "siblings": [], "written_paths": []}
+    rel_paths = sorted(path for path in outputs if any(fnmatch.fnmatch(os.path.basename(path), p) for p in patterns))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [(rel_path, executor.submit(compress_file, os.path.join(public_dir, rel_path), suffixes, min_size))
+                   for rel_path in rel_paths]
+        for rel_path, future in futures:
+            try:
+                siblings, written = future.result()
+            except Exception as e:
+                print(f"Error compressing {rel_path} : {e}")
+                stats["failed"] += 1
+                continue
+            stats["siblings"].extend(os.path.relpath(path, public_dir) for path in siblings)
+            stats["written_paths"].extend(os.path.relpath(path, public_dir) for path in written)
+            if written:
+                stats["compressed"] += 1
+            elif siblings:
+                stats["unchanged"] += 1
+    return stats
+
+def compress_site(public_dir, manifest):
+    """Precompress every text output recorded in a build's manifest.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        manifest (dict): This build's manifest; the siblings are added to its
+            "generated" section.
+
+    Returns:
+        dict: As compress_outputs.
+    """
+    outputs = [output for section in ("pages", "static", "generated") for entry in manifest[section].values()
+               for output in entry_outputs(entry)]
+    stats = compress_outputs(public_dir, outputs)
+    for sibling in stats["siblings"]:
+        manifest["generated"][sibling] = {"output": sibling}
+    print(f"Compressed ({', '.join(available_encodings())}): {stats['compressed']} compressed, "
+          f"{stats['unchanged']} up to date, {stats['failed']} failed")
+    return stats
@@ -0,0 +1,176 @@
+import fnmatch
+import json
+import os
+import time
+from manifest import hash_file
+from writer import AtomicFile
+
+INDEX_FILE = "content-index.json"
+INDEX_FORMAT = 1  # Bump to discard saved indexes when the file layout changes
+
+def output_path(rel_path):
+    """Return the HTML output path for a content file (blog/tom/index.md -> blog/tom/index.html)."""
+    return os.path.splitext(rel_path)[0] + ".html"
+
+class ContentIndex:
+    def __init__(self, root, include=("*.md",), exclude=()):
+        """An index of the source files under the content directory.
+
+        Each entry records a file's modification time, size, content hash and
+        output path. The tree is walked with os.scandir, whose directory
+        entries already know their type, so discovering a file costs one stat
+        rather than an isdir, an isfile and a stat. Saved between builds, the
+        index also remembers each directory's listing and mtime: directories
+        whose mtime is unchanged aren't listed again, and files whose mtime and
+        size are unchanged keep their hash instead of being read again.
+
+        Args:
+            root (str): The content directory.
+            include (tuple[str]): Glob patterns (matched against the path
+                relative to root) a file must match to be indexed.
+            exclude (tuple[str]): Glob patterns for files and directories to skip.
+
+        Example:
+            index = ContentIndex("content").scan()
+            index.get("blog/tom/index.md")
+            # => {"mtime_ns": ..., "size": 1043, "hash": "9f2c...", "output": "blog/tom/index.html"}
+        """
+        self.root = root
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.entries = {}
+        self.dirs = {}
+        self.scanned_ns = 0
+        self.stats = {"dirs_listed": 0, "dirs_reused": 0, "files_hashed": 0, "files_reused": 0}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        """Iterate over the indexed relative paths in sorted order."""
+        return iter(sorted(self.entries))
+
+    def __contains__(self, rel_path):
+        return rel_path in self.entries
+
+    def get(self, rel_path):
+        """Return the entry for a relative path, or None if it isn't indexed."""
+        return self.entries.get(rel_path)
+
+    def glob(self, pattern):
+        """Return the sorted relative paths matching a glob pattern (e.g. "blog/*")."""
+        return sorted(path for path in self.entries if fnmatch.fnmatch(path, pattern))
+
+    def is_included(self, rel_path):
+        return any(fnmatch.fnmatch(rel_path, p) for p in self.include) and not self.is_excluded(rel_path)
+
+    def is_excluded(self, rel_path):
+        return any(fnmatch.fnmatch(rel_path, p) for p in self.exclude)
+
+    def scan(self):
+        """Bring the index up to date with the content directory.
+
+        Returns:
+            ContentIndex: self, so a fresh index can be built in one expression.
+        """
+        previous, previous_dirs, previous_scan = self.entries, self.dirs, self.scanned_ns
+        self.entries, self.dirs = {}, {}
+        self.stats = dict.fromkeys(self.stats, 0)
+        scan_start = time.time_ns()
+
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            path = os.path.join(self.root, rel_dir)
+            dir_mtime = os.stat(path).st_mtime_ns
+            cached = previous_dirs.get(rel_dir)
+            if cached is not None and cached["mtime_ns"] == dir_mtime and dir_mtime < previous_scan:
+                self.stats["dirs_reused"] += 1
+                listing = cached
+                files = []
+                for name in cached["files"]:
+                    try:
+                        files.append((name, os.stat(os.path.join(path, name))))
+                    except FileNotFoundError:
+                        continue
+            else:
+                self.stats["dirs_listed"] += 1
+                listing = {"mtime_ns": dir_mtime, "files": [], "dirs": []}
+                files = []
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        rel_path = os.path.join(rel_dir, entry.name)
+                        if entry.is_dir():
+                            if not self.is_excluded(rel_path):
+                                listing["dirs"].append(entry.name)
+                        elif entry.is_file() and self.is_included(rel_path):
+                            listing["files"].append(entry.name)
+                            files.append((entry.name, entry.stat()))
+            self.dirs[rel_dir] = listing
+            pending.extend(os.path.join(rel_dir, name) for name in listing["dirs"])
+
+            for name, stat in files:
+                rel_path = os.path.join(rel_dir, name)
+                old = previous.get(rel_path)
+                # A file modified during the previous scan may have been hashed
+                # before its last write landed, so only trust older mtimes
+                if old is not None and old["mtime_ns"] == stat.st_mtime_ns and old["size"] == stat.st_size \
+                        and stat.st_mtime_ns < previous_scan:
+                    file_hash = old["hash"]
+                    self.stats["files_reused"] += 1
+                else:
+                    file_hash = hash_file(os.path.join(path, name))
+                    self.stats["files_hashed"] += 1
+                self.entries[rel_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                                          "hash": file_hash, "output": output_path(rel_path)}
+        self.scanned_ns = scan_start
+        return self
+
+    @classmethod
+    def load(cls, cache_dir, root, include=("*.md",), exclude=()):
+        """Load the index saved by a previous build.
+
+        A missing or unreadable file, or one saved for a different root or
+        different patterns, gives an empty index.
+
+        Args:
+            cache_dir (Optional[str]): Directory holding the index file, None for an empty index.
+            root (str): The content directory.
+            include (tuple[str]): Glob patterns of files to index.
+            exclude (tuple[str]): Glob patterns of files and directories to skip.
+
+        Returns:
+            ContentIndex: The loaded index; call scan() to bring it up to date.
+        """
+        index = cls(root, include, exclude)
+        if cache_dir is None:
+            return index
+        try:
+            with open(os.path.join(cache_dir, INDEX_FILE)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        settings = [os.path.abspath(root), list(index.include), list(index.exclude)]
+        if data.get("format") != INDEX_FORMAT or data.get("settings") != settings:
+            return index
+        index.entries = data["entries"]
+        index.dirs = data["dirs"]
+        index.scanned_ns = data["scanned_ns"]
+        return index
+
+    def save(self, cache_dir):
+        """Write the index to disk for the next build.
+
+        Args:
+            cache_dir (str): Directory to write the index file into.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        index_path = os.path.join(cache_dir, INDEX_FILE)
+        with AtomicFile(index_path) as f:
+            json.dump({
+                "format": INDEX_FORMAT,
+                "settings": [os.path.abspath(self.root), list(self.include), list(self.exclude)],
+                "scanned_ns": self.scanned_ns,
+                "entries": self.entries,
+                "dirs": self.dirs,
+            }, f)
@@ -0,0 +1,120 @@
+import os
+import re
+from inline_markdown import IMAGE_PATTERN, PLAIN_LINK_PATTERN
+
+TEMPLATE_URL_PATTERN = re.compile(r'(?:href|src)="/([^"?#]*)')  # Root-relative URLs in the template
+
+def url_to_path(url):
+    """Turn a root-relative URL into a path relative to the site root, or None for other URLs.
+
+    Example:
+        url_to_path("/images/tom.png?v=2")  # => "images/tom.png"
+    """
+    if not url.startswith("/") or url.startswith("//"):
+        return None
+    path = url[1:].split("?", 1)[0].split("#", 1)[0]
+    return os.path.normpath(path) if path else None
+
+def markdown_references(lines):
+    """Collect the root-relative URLs a markdown document links to or embeds.
+
+    Args:
+        lines: An iterable of markdown lines (e.g. an open file), so even huge
+            documents are scanned without being read into memory at once.
+
+    Returns:
+        list[str]: Sorted, de-duplicated site-relative paths (e.g. "images/tom.png").
+    """
+    references = set()
+    for line in lines:
+        if "](" not in line:
+            continue
+        for pattern in (IMAGE_PATTERN, PLAIN_LINK_PATTERN):
+            for _, url in pattern.findall(line):
+                path = url_to_path(url)
+                if path is not None:
+                    references.add(path)
+    return sorted(references)
+
+def template_references(text):
+    """Collect the root-relative href/src paths in template text (e.g. "index.css")."""
+    return sorted({os.path.normpath(path) for path in TEMPLATE_URL_PATTERN.findall(text) if path})
+
+def explain_rebuild(previous, entry, output_exists):
+    """List the reasons a page has to be rendered again.
+
+    Args:
+        previous (Optional[dict]): The page's manifest entry from the previous build.
+        entry (dict): The page's entry for this build.
+        output_exists (bool): Whether the previous output file is still there.
+
+    Returns:
+        list[str]: Human-readable reasons; empty when the page is up to date.
+
+    Example:
+        explain_rebuild({"source": "a", "template": "t", ...}, {"source": "b", "template": "t", ...}, True)
+        # => ["source changed"]
+        explain_rebuild({..., "assets": {"tom.png": "tom.0123456789.png"}}, {..., "assets": {"tom.png": "tom.9876543210.png"}}, True)
+        # => ["referenced files changed: tom.png"]
+    """
+    if previous is None:
+        return ["new page"]
+    reasons = []
+    if previous.get("source") != entry["source"]:
+        reasons.append("source changed")
+    if previous.get("template") != entry["template"]:
+        reasons.append("template changed")
+    if previous.get("basepath") != entry["basepath"]:
+        reasons.append(f"basepath changed from {previous.get('basepath')} to {entry['basepath']}")
+    # A page's references are read from its source, so only assets it referenced both times can have changed on their own
+    old_assets, assets = previous.get("assets", {}), entry.get("assets", {})
+    changed = sorted(path for path in old_assets.keys() & assets.keys() if old_assets[path] != assets[path])
+    if changed:
+        reasons.append(f"referenced files changed: {', '.join(changed)}")
+    if not reasons and set(previous) != set(entry):
+        reasons.append("build settings changed")
+    if not reasons and not output_exists:
+        reasons.append("output missing")
+    return reasons
+
+class DependencyGraph:
+    def __init__(self, manifest):
+        """What each page was built from, as recorded in a build manifest.
+
+        Every page depends on its markdown source, the template (and everything
+        the template references), the basepath and the root-relative paths
+        its markdown references. The manifest is written with every build, so
+        the graph persists between runs.
+
+        Args:
+            manifest (dict): A manifest from load_manifest or a finished build.
+
+        Example:
+            graph = DependencyGraph(load_manifest("docs"))
+            graph.dependents("images/tom.png")
+            # => ["blog/tom/index.md"]
+        """
+        self.pages = manifest["pages"]
+        self.template = manifest.get("template", {})
+        self.referenced_by = {}
+        for rel_path, entry in self.pages.items():
+            for path in entry.get("references", ()):
+                self.referenced_by.setdefault(path, set()).add(rel_path)
+
+    def dependents(self, path):
+        """Return the pages that have to be rebuilt when a file changes.
+
+        Args:
+            path (str): A content path (e.g. "blog/tom/index.md"), "template"
+                for the page template, or a site-relative static path
+                (e.g. "images/tom.png").
+
+        Returns:
+            list[str]: Sorted content paths of the affected pages.
+        """
+        if path == "template" or path in self.template.get("references", ()):
+            return sorted(self.pages)
+        affected = set(self.referenced_by.get(path, ()))
+        if path in self.pages:
+            affected.add(path)
+        return sorted(affected)
@@ -0,0 +1,195 @@
+import datetime
+import json
+import os
+import time
+from xml.sax.saxutils import escape, quoteattr
+from block_markdown import BlockType, classify_block, read_blocks
+from front_matter import read_front_matter
+from inline_markdown import text_to_textnodes
+from textnode import TextType
+from writer import AtomicFile
+
+SITEMAP_FILE = "sitemap.xml"
+FEED_FILE = "atom.xml"
+PAGES_FILE = "pages.json"
+FEED_SECTION = "blog/"  # Pages under content/blog/ are the feed's entries
+SUMMARY_LENGTH = 280    # Characters of the first paragraph kept as a page's summary
+
+def page_url(site_url, basepath, output):
+    """Return the absolute URL of an output file, as a directory URL for index pages.
+
+    Example:
+        page_url("https://example.com", "/static-site-generator/", "blog/tom/index.html")
+        # => "https://example.com/static-site-generator/blog/tom/"
+    """
+    path = output.replace(os.sep, "/")
+    if path == "index.html" or path.endswith("/index.html"):
+        path = path[:-len("index.html")]
+    return site_url.rstrip("/") + basepath + path
+
+def iso_time(mtime_ns):
+    """Format a modification time as an RFC 3339 UTC timestamp (e.g. "2025-06-01T12:00:00Z")."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(mtime_ns / 1e9))
+
+def plain_text(text):
+    """Render inline markdown as plain text: formatting is dropped, link text kept, images skipped.
+
+    Paragraphs made of nothing but links and images (navigation like
+    "[< Back Home](/)") give "", so they aren't mistaken for a summary.
+    """
+    nodes = [node for node in text_to_textnodes(text) if node.text_type != TextType.IMAGE]
+    if all(node.text_type == TextType.LINK or not node.text.strip() for node in nodes):
+        return ""
+    return "".join(node.text for node in nodes).strip()
+
+def read_summary(md_path):
+    """Read a page's summary, stopping at its first paragraph.
+
+    A front matter "summary" field takes precedence over the paragraph. The
+    title and date come from the MetadataIndex, so nothing else is read.
+
+    Args:
+        md_path (str): Path of the markdown source.
+
+    Returns:
+        str: The summary as plain text, shortened to SUMMARY_LENGTH ("" if
+        the page has no paragraph).
+    """
+    with open(md_path) as m:
+        metadata, _ = read_front_matter(m)
+        summary = metadata.get("summary")
+        for block in read_blocks(m) if summary is None else ():
+            block_type, lines = classify_block(block)
+            if block_type == BlockType.PARAGRAPH:
+                summary = plain_text(" ".join(lines)) or None
+                if summary is not None:
+                    break
+    summary = str(summary or "")
+    if len(summary) > SUMMARY_LENGTH:
+        summary = summary[:SUMMARY_LENGTH].rsplit(" ", 1)[0] + "..."
+    return summary
+
+def updated_time(page):
+    """Return a page's RFC 3339 timestamp: its front matter date if it has one, else its mtime."""
+    date = page.get("date")
+    if not date:
+        return iso_time(page["mtime_ns"])
+    if "T" not in date:
+        return f"{date}T00:00:00Z"
+    return date if date.endswith("Z") or "+" in date[10:] or "-" in date[10:] else f"{date}Z"
+
+def timestamp_key(updated):
+    """Sort key for updated_time values, so timestamps with different UTC offsets compare correctly.
+
+    A date that isn't ISO 8601 sorts as the oldest rather than failing the build.
+    """
+    try:
+        return datetime.datetime.fromisoformat(updated.replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+def write_feeds(public_dir, pages, site_url, basepath="/", site_title="", summarize=None):
+    """Write sitemap.xml, an Atom feed of the blog and pages.json in one pass over the pages.
+
+    The three files are written side by side, and each page's summary is
+    only read as the page is written, so page bodies are never held in
+    memory. The feed's <updated> is the newest of its entries'. Files whose
+    contents didn't change are left untouched.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        pages (list[dict]): One dict per page with "source", "output",
+            "title", "date" (ISO string or None), "mtime_ns" and, without
+            summarize, "summary".
+        site_url (str): The site's origin (e.g. "https://example.com").
+        basepath (str): URL prefix the site is served from.
+        site_title (str): Title of the feed.
+        summarize (Optional[Callable[[dict], str]]): Returns a page's
+            summary (e.g. via read_summary), called once per page.
+
+    Returns:
+        dict: The "outputs" written, the ones that "changed", and the number
+        of "pages" and "entries" (pages in the feed).
+    """
+    summarize = summarize or (lambda page: page["summary"])
+    entries = [updated_time(page) for page in pages if page["source"].replace(os.sep, "/").startswith(FEED_SECTION)]
+    feed_updated = max(entries, key=timestamp_key, default=iso_time(0))
+    home = page_url(site_url, basepath, "index.html")
+    feed_url = page_url(site_url, basepath, FEED_FILE)
+    stats = {"outputs": [SITEMAP_FILE, FEED_FILE, PAGES_FILE], "changed": [], "pages": 0, "entries": 0}
+    files = [AtomicFile(os.path.join(public_dir, name)) for name in stats["outputs"]]
+    with files[0] as sitemap, files[1] as feed, files[2] as listing:
+        sitemap.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        feed.write('<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n'
+                   f"  <title>{escape(site_title)}</title>\n  <id>{escape(home)}</id>\n"
+                   f"  <link href={quoteattr(home)}/>\n  <link rel=\"self\" href={quoteattr(feed_url)}/>\n"
+                   f"  <updated>{feed_updated}</updated>\n  <author><name>{escape(site_title)}</name></author>\n")
+        listing.write("[")
+        for page in pages:
+            url = page_url(site_url, basepath, page["output"])
+            updated = updated_time(page)
+            summary = summarize(page)
+            sitemap.write(f"  <url><loc>{escape(url)}</loc><lastmod>{updated}</lastmod></url>\n")
+            if page["source"].replace(os.sep, "/").startswith(FEED_SECTION):
+                feed.write(f"  <entry>\n    <title>{escape(page['title'])}</title>\n    <link href={quoteattr(url)}/>\n"
+                           f"    <id>{escape(url)}</id>\n    <updated>{updated}</updated>\n"
+                           f"    <summary>{escape(summary)}</summary>\n  </entry>\n")
+                stats["entries"] += 1
+            listing.write(",\n" if stats["pages"] else "\n")
+            listing.write(json.dumps({"url": url, "title": page["title"], "output": page["output"].replace(os.sep, "/"),
+                                      "updated": updated, "summary": summary}))
+            stats["pages"] += 1
+        sitemap.write("</urlset>\n")
+        feed.write("</feed>\n")
+        listing.write("\n]\n")
+    stats["changed"] = [name for name, output in zip(stats["outputs"], files) if output.changed]
+    return stats
+
+def generate_feeds(public_dir, manifest, metadata_index, content_index, content_dir, site_url, basepath="/", failures=()):
+    """Write the sitemap, feed and pages.json for the pages in a build's manifest.
+
+    Titles and dates come from the MetadataIndex, modification times from
+    the ContentIndex, and summaries are read from the sources as they're
+    written (see read_summary). The feed is titled after the home page.
+    Pages that failed this build keep their previous output but get an
+    empty summary, since their source can't be trusted to parse.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        manifest (dict): This build's manifest; the three files are added to
+            its "generated" section.
+        metadata_index (MetadataIndex): Front matter of every content file.
+        content_index (ContentIndex): The scanned content files.
+        content_dir (str): Path to the markdown content directory.
+        site_url (str): The site's origin (e.g. "https://example.com").
+        basepath (str): URL prefix the site is served from.
+        failures (Iterable[str]): Content paths of the pages that failed this build.
+
+    Returns:
+        dict: As write_feeds.
+    """
+    pages = []
+    for rel_path, entry in sorted(manifest["pages"].items()):
+        metadata = metadata_index.get(rel_path)
+        pages.append({"source": rel_path, "output": entry["output"], "title": metadata["title"] or rel_path,
+                      "date": metadata["date"], "mtime_ns": content_index.get(rel_path)["mtime_ns"]})
+    site_title = metadata_index.get("index.md")["title"] if "index.md" in manifest["pages"] else None
+
+    failed = set(failures)
+
+    def summarize(page):
+        if page["source"] in failed:
+            return ""  # Its previous output is kept, but the source can't be read or rendered
+        try:
+            return read_summary(os.path.join(content_dir, page["source"]))
+        except (OSError, ValueError) as e:
+            print(f"Error summarizing {page['source']}: {e}")
+            return ""
+
+    stats = write_feeds(public_dir, pages, site_url, basepath, site_title or site_url, summarize)
+    for output in stats["outputs"]:
+        manifest["generated"][output] = {"output": output}
+    print(f"Feeds: {stats['pages']} pages in the sitemap, {stats['entries']} feed entries, "
+          f"{len(stats['changed'])} file(s) changed")
+    return stats
@@ -0,0 +1,64 @@
+import fnmatch
+import json
+import os
+from writer import AtomicFile
+
+FINGERPRINT_LENGTH = 10  # Hex digits of the content hash kept in the file name
+DEFAULT_PATTERNS = ("*.css", "*.js", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.woff", "*.woff2", "*.ico")
+ASSET_MANIFEST_FILE = "asset-manifest.json"  # Written to the public directory for servers and deploy tools
+
+def should_fingerprint(rel_path, patterns):
+    """Return True if a static file's name matches one of the fingerprint glob patterns."""
+    name = os.path.basename(rel_path)
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+def fingerprinted_name(rel_path, digest):
+    """Insert a content hash into a file name, before its extension.
+
+    Args:
+        rel_path (str): The asset's path relative to the static directory.
+        digest (str): Hex digest of the asset's contents.
+
+    Returns:
+        str: The path the asset is published under.
+
+    Example:
+        fingerprinted_name("images/tom.png", "3f2a1b9c0d5e...")
+        # => "images/tom.3f2a1b9c0d.png"
+    """
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+def asset_urls(static_entries):
+    """Map site paths to fingerprinted site paths from the static manifest entries.
+
+    Args:
+        static_entries (dict): The "static" section of a build manifest.
+
+    Returns:
+        dict: e.g. {"images/tom.png": "images/tom.3f2a1b9c0d.png"}, using "/"
+        separators like the URLs they replace. Files that weren't
+        fingerprinted are left out.
+    """
+    return {rel_path.replace(os.sep, "/"): entry["fingerprinted"].replace(os.sep, "/")
+            for rel_path, entry in sorted(static_entries.items()) if "fingerprinted" in entry}
+
+def write_asset_manifest(public_dir, mapping):
+    """Write the original-to-fingerprinted asset mapping into the public directory.
+
+    Servers can use it to send far-future cache headers for exactly the
+    fingerprinted files, and tools outside the build to resolve asset URLs.
+    The file is left untouched when its contents wouldn't change.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        mapping (dict): See asset_urls.
+
+    Returns:
+        bool: True if the file was written.
+    """
+    output = AtomicFile(os.path.join(public_dir, ASSET_MANIFEST_FILE))
+    with output as f:
+        json.dump(mapping, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return output.changed
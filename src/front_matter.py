@@ -0,0 +1,274 @@
+import datetime
+import io
+import json
+import os
+from block_markdown import read_title
+from writer import AtomicFile
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11; TOML front matter is reported as unsupported there
+    tomllib = None
+
+DELIMITERS = {"---": "yaml", "+++": "toml"}  # Opening/closing line -> front matter format
+MAX_HEADER_LINES = 200  # A header longer than this is treated as missing its closing delimiter
+METADATA_FILE = "metadata-index.json"
+
+def parse_scalar(value):
+    """Parse a YAML-subset value: a quoted or bare string, a boolean, an integer or an inline [list]."""
+    if value[:1] in ('"', "'") and value[-1:] == value[0] and len(value) > 1:
+        return value[1:-1]
+    if value.startswith("[") and value.endswith("]"):
+        return [parse_scalar(item.strip()) for item in value[1:-1].split(",") if item.strip()]
+    lowered = value.lower()
+    if lowered in ("true", "yes"):
+        return True
+    if lowered in ("false", "no"):
+        return False
+    if value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+def parse_yaml(lines):
+    """Parse the subset of YAML that front matter uses in practice.
+
+    Supports "key: value" pairs with the scalars parse_scalar understands,
+    "- item" lists under an empty key, and # comments. Anything else (nested
+    mappings, multi-line strings) is rejected rather than misread.
+
+    Args:
+        lines (list[str]): The lines between the --- delimiters.
+
+    Returns:
+        dict: The parsed metadata.
+
+    Raises:
+        ValueError: On a line that isn't part of the subset.
+
+    Example:
+        parse_yaml(["title: Tom", "tags:", "- elves", "- songs", "draft: false"])
+        # => {"title": "Tom", "tags": ["elves", "songs"], "draft": False}
+    """
+    data, key = {}, None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and key is not None and line[0] in " -":
+            if data[key] is None:
+                data[key] = []
+            if not isinstance(data[key], list):
+                raise ValueError(f"List item under non-list key {key!r}: {line!r}")
+            data[key].append(parse_scalar(stripped[2:].strip()))
+            continue
+        name, separator, value = line.partition(":")
+        if not separator or not name.strip() or line[0].isspace():
+            raise ValueError(f"Unsupported front matter line: {line!r}")
+        key = name.strip()
+        value = value.strip()
+        data[key] = parse_scalar(value) if value else None
+    return data
+
+def parse_front_matter(text, kind):
+    """Parse the text between the delimiters as "yaml" or "toml" front matter."""
+    if kind == "toml":
+        if tomllib is None:
+            raise ValueError("TOML front matter needs Python 3.11 or later (tomllib)")
+        return tomllib.loads(text)
+    return parse_yaml(text.split("\n"))
+
+def read_front_matter(stream):
+    """Read the front matter at the top of a markdown stream, and nothing more.
+
+    Front matter is a block at the very start of the file between "---"
+    lines (the YAML subset of parse_yaml) or "+++" lines (TOML). Only the
+    header lines are read, so the cost doesn't depend on the body's size.
+
+    Args:
+        stream: A text file object positioned at the start of the document.
+
+    Returns:
+        tuple[dict, int]: The metadata ({} without front matter) and the
+        stream position where the body starts; the stream is left there.
+
+    Raises:
+        ValueError: If the front matter is never closed or can't be parsed.
+    """
+    start = stream.tell()
+    first = stream.readline()
+    kind = DELIMITERS.get(first.rstrip())
+    if kind is None:
+        stream.seek(start)
+        return {}, start
+    lines = []
+    for _ in range(MAX_HEADER_LINES):
+        line = stream.readline()
+        if line == "":
+            break
+        if line.rstrip() == first.rstrip():
+            return normalize(parse_front_matter("".join(lines), kind)), stream.tell()
+        lines.append(line)
+    raise ValueError(f"Front matter opened with {first.rstrip()} is never closed")
+
+def split_front_matter(markdown):
+    """Separate a markdown document into its metadata and body.
+
+    Returns:
+        tuple[dict, str]: The metadata ({} without front matter) and the body.
+
+    Example:
+        split_front_matter("---\\ntitle: Tom\\n---\\n# Tom")
+        # => ({"title": "Tom"}, "# Tom")
+    """
+    if markdown[:3] not in DELIMITERS:
+        return {}, markdown
+    stream = io.StringIO(markdown)
+    metadata, body_start = read_front_matter(stream)
+    return metadata, markdown[body_start:]
+
+def normalize(metadata):
+    """Give the fields the build relies on consistent types.
+
+    Dates (TOML dates or datetimes) become ISO strings, the title and
+    summary become strings (so "title: 2024" can be escaped and rendered), a
+    single tag becomes a one-item list and draft becomes a bool. Other
+    fields are kept as is.
+    """
+    metadata = dict(metadata)
+    for key, value in metadata.items():
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            metadata[key] = value.isoformat()
+    for key in ("date", "title", "summary"):
+        if metadata.get(key) is not None:
+            metadata[key] = str(metadata[key])
+    tags = metadata.get("tags")
+    if tags is not None and not isinstance(tags, list):
+        metadata["tags"] = [tags]
+    if "tags" in metadata:
+        metadata["tags"] = [str(tag) for tag in metadata["tags"] or []]
+    if "draft" in metadata:
+        metadata["draft"] = bool(metadata["draft"])
+    return metadata
+
+def read_page_metadata(path):
+    """Read the fields the metadata index keeps for one page, from its header only.
+
+    Pages without a "title" field fall back to their first "# " heading,
+    which is read up to and no further.
+
+    Args:
+        path (str): Path of the markdown file.
+
+    Returns:
+        dict: "title" (None if there is none), "date" (ISO string or None),
+        "tags" (list) and "draft" (bool).
+    """
+    with open(path) as f:
+        try:
+            metadata, _ = read_front_matter(f)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+        title = metadata.get("title")
+        if not title:
+            try:
+                title = read_title(f)
+            except Exception:
+                title = None
+    return {"title": title, "date": metadata.get("date"), "tags": metadata.get("tags", []),
+            "draft": metadata.get("draft", False)}
+
+class MetadataIndex:
+    def __init__(self):
+        """Titles, dates, tags and draft flags of every content file.
+
+        Built by reading only each file's header (see read_page_metadata),
+        and saved between builds keyed by content hash, so only files that
+        changed are read at all. Listings and filters (drafts, tags, date
+        order) then run against the index instead of the documents.
+
+        Example:
+            index = MetadataIndex.load(".cache").update(content_index, "content")
+            index.select(tag="elves")
+            # => ["blog/glorfindel/index.md"]
+        """
+        self.entries = {}
+        self.stats = {"files_read": 0, "files_reused": 0}
+
+    def __contains__(self, rel_path):
+        return rel_path in self.entries
+
+    def get(self, rel_path):
+        """Return the metadata for a content path, or None if it isn't indexed."""
+        return self.entries.get(rel_path)
+
+    def update(self, content_index, content_dir):
+        """Bring the index in line with a scanned ContentIndex.
+
+        A file whose front matter can't be read doesn't stop the others: its
+        entry gets empty fields and the message under "error", and
+        errors() lists it so the build can report that page alone.
+
+        Returns:
+            MetadataIndex: self.
+        """
+        previous, self.entries = self.entries, {}
+        for rel_path in content_index:
+            source_hash = content_index.get(rel_path)["hash"]
+            old_entry = previous.get(rel_path)
+            if old_entry is not None and old_entry["hash"] == source_hash:
+                self.entries[rel_path] = old_entry
+                self.stats["files_reused"] += 1
+            else:
+                try:
+                    entry = read_page_metadata(os.path.join(content_dir, rel_path))
+                except ValueError as e:
+                    entry = {"title": None, "date": None, "tags": [], "draft": False, "error": str(e)}
+                entry["hash"] = source_hash
+                self.entries[rel_path] = entry
+                self.stats["files_read"] += 1
+        return self
+
+    def errors(self):
+        """Return {content path: message} for the files whose front matter couldn't be read."""
+        return {rel_path: entry["error"] for rel_path, entry in sorted(self.entries.items()) if entry.get("error")}
+
+    def drafts(self):
+        """Return the sorted content paths marked as drafts."""
+        return sorted(rel_path for rel_path, entry in self.entries.items() if entry["draft"])
+
+    def select(self, tag=None, drafts=False, newest_first=False):
+        """Return content paths matching a filter, in path or date order.
+
+        Args:
+            tag (Optional[str]): Only pages with this tag.
+            drafts (bool): Include drafts.
+            newest_first (bool): Order by date, newest first (undated pages
+                last), instead of by path.
+
+        Returns:
+            list[str]: The matching content paths.
+        """
+        paths = [rel_path for rel_path, entry in sorted(self.entries.items())
+                 if (drafts or not entry["draft"]) and (tag is None or tag in entry["tags"])]
+        if newest_first:
+            paths.sort(key=lambda rel_path: self.entries[rel_path]["date"] or "", reverse=True)
+        return paths
+
+    @classmethod
+    def load(cls, cache_dir):
+        """Load the index saved by a previous build; empty without a cache_dir or a readable file."""
+        index = cls()
+        if not cache_dir:
+            return index
+        try:
+            with open(os.path.join(cache_dir, METADATA_FILE)) as f:
+                index.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+        return index
+
+    def save(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, METADATA_FILE)
+        with AtomicFile(path) as f:
+            json.dump(self.entries, f)
@@ -1,6 +1,8 @@
 from typing import Optional
 
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")  # No per-instance __dict__; documents allocate a node per span
+
     def __init__(self, tag: Optional[str] = None, value: Optional[str] = None, children: Optional[list] = None, props: Optional[dict] = None):
         """Initialize an HTMLNode.
 
@@ -22,18 +24,34 @@ class HTMLNode:
         return f"HTMLNode(tag: {self.tag}, value: {self.value}, children: {self.children}, props: {self.props})"
     
     def to_html(self):
+        """Render this node and everything below it into a single string.
+
+        The tree is walked once, with every node appending its pieces to one
+        shared buffer, so rendering is linear in the size of the output no
+        matter how deeply the tree is nested.
+        """
+        parts = []
+        self.write_html(parts.append)
+        return "".join(parts)
+
+    def write_html(self, write):
+        """Write this node's HTML by calling `write` with successive string pieces.
+
+        Args:
+            write: A callable taking a string, e.g. `list.append` or the
+                `write` method of an open file or io.StringIO.
+        """
         raise NotImplementedError("Not implemented yet")
     
     def props_to_html(self):
         if not self.props:
             return ""
-        all_props = ""
-        for key, value in self.props.items():
-            all_props += f' {key}="{value}"'
-        return all_props
+        return "".join([f' {key}="{value}"' for key, value in self.props.items()])
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: Optional[str], value, props: Optional[dict] = None):
         """
         Represents an HTML node that cannot have child nodes (a "leaf" node in the DOM tree).
@@ -52,7 +70,10 @@ class LeafNode(HTMLNode):
             node.to_html()  # returns: '<a href="https://example.com">Click me</a>'
             ```
         """
-        super().__init__(tag, value, props=props)
+        self.tag = tag  # Assigned directly rather than through HTMLNode.__init__ - this runs once per inline span
+        self.value = value
+        self.children = None
+        self.props = props
     
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
@@ -66,8 +87,13 @@ class LeafNode(HTMLNode):
             return f"<{self.tag}{self.props_to_html()}>"
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
 
+    def write_html(self, write):
+        write(self.to_html())
+
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: str, children: list, props: Optional[dict] = None):
         """
         Represents an HTML node that can have child nodes.
@@ -85,18 +111,20 @@ class ParentNode(HTMLNode):
             parent.to_html()  # returns: '<ul><li>Item 1</li><li>Item 2</li></ul>'
             ```
         """
-
-        super().__init__(tag, children=children, props=props)
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props
     
     def __repr__(self):
         return f"ParentNode({self.tag}, children: {self.children}, {self.props})"
     
-    def to_html(self):
+    def write_html(self, write):
         if not self.tag:
             raise ValueError("No tag given - parent nodes must have a tag")
         if not self.children:
             raise ValueError("No children given - parent nodes must have children")
-        children_html = ""
+        write(f"<{self.tag}{self.props_to_html()}>")
         for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
\ No newline at end of file
+            child.write_html(write) # Children write into the same buffer instead of returning strings to copy
+        write(f"</{self.tag}>")
\ No newline at end of file
@@ -1,6 +1,12 @@
 from textnode import TextNode, TextType
 import re
 
+INLINE_START_PATTERN = re.compile(r"\*\*|[_`]|!?\[")                    # Anything that can open an inline span
+LINK_PATTERN = re.compile(r"\[([^\[\]]*)\]\(([^\(\)]*)\)")              # [text](url), matched at a "[" position
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")            # ![alt](url) anywhere in a string
+PLAIN_LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")  # [text](url) not preceded by "!"
+DELIMITER_TYPES = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
+
 def split_nodes_delimiter(old_nodes: list[TextNode], delimiter: str, text_type: TextType):
     """Split text nodes on a specific inline formatting delimiter.
 
@@ -121,7 +127,17 @@ def text_to_textnodes(text):
     """Convert a markdown string with inline formatting into a list of TextNodes.
 
     Parses a string for bold, italic, inline code, links, and images, returning
-    a sequence of TextNodes representing each segment.
+    a sequence of TextNodes representing each segment. The string is scanned
+    once, left to right: each span is emitted as soon as its closing delimiter
+    is found, and the text between spans is sliced out without being copied
+    into intermediate nodes.
+
+    Spans are atomic, so delimiters inside inline code, a link's text or its
+    URL (or an image's alt text or URL) are kept as written: "[the _docs_](url)"
+    is one LINK whose text is "the _docs_", where the multi-pass chain split
+    the italic out first and left the brackets as plain text (or raised if a
+    delimiter count was odd). Otherwise the result matches
+    text_to_textnodes_multipass.
 
     Args:
         text: The raw markdown text to parse.
@@ -129,11 +145,58 @@ def text_to_textnodes(text):
     Returns:
         list[TextNode]: The parsed inline elements as TextNodes.
 
+    Raises:
+        ValueError: If a bold, italic or code delimiter is never closed.
+
     Example:
         text_to_textnodes("This is **bold** and [linked](url)")
         # => [TextNode("This is ", TEXT), TextNode("bold", BOLD), TextNode(" and ", TEXT),
         #     TextNode("linked", LINK, "url")]
     """
+    nodes = []
+    plain_start = 0  # Start of plain text that hasn't been emitted yet
+    pos = 0
+    while True:
+        match = INLINE_START_PATTERN.search(text, pos)
+        if match is None:
+            break
+        token = match.group()
+        if token in DELIMITER_TYPES:
+            close = text.find(token, match.end())
+            if close == -1:
+                raise ValueError("Invalid syntax - unmatched delimiter")
+            inner = text[match.end():close]
+            node = TextNode(inner, DELIMITER_TYPES[token]) if inner else None
+            end = close + len(token)
+        else:
+            link = LINK_PATTERN.match(text, match.end() - 1)
+            if link is None: # A bracket that isn't a link is plain text
+                pos = match.end()
+                continue
+            text_type = TextType.IMAGE if token == "![" else TextType.LINK
+            node = TextNode(link.group(1), text_type, link.group(2))
+            end = link.end()
+        if match.start() > plain_start:
+            nodes.append(TextNode(text[plain_start:match.start()], TextType.TEXT))
+        if node is not None:
+            nodes.append(node)
+        plain_start = pos = end
+    if plain_start < len(text):
+        nodes.append(TextNode(text[plain_start:], TextType.TEXT))
+    return nodes
+
+def text_to_textnodes_multipass(text):
+    """Convert inline markdown to TextNodes by chaining the split_nodes_* passes.
+
+    This is the original five-pass implementation. It is kept as the reference
+    that text_to_textnodes is tested and benchmarked against.
+
+    Args:
+        text: The raw markdown text to parse.
+
+    Returns:
+        list[TextNode]: The parsed inline elements as TextNodes.
+    """
     current = [TextNode(text, TextType.TEXT)]
     current = split_nodes_delimiter(current, "**", TextType.BOLD)
     current = split_nodes_delimiter(current, "_", TextType.ITALIC)
@@ -155,7 +218,7 @@ def extract_markdown_images(text):
         extract_markdown_images("![alt](img.png)")
         # => [("alt", "img.png")]
     """
-    matches = re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    matches = IMAGE_PATTERN.findall(text)
     return matches
 
 def extract_markdown_links(text):
@@ -173,5 +236,5 @@ def extract_markdown_links(text):
         extract_markdown_links("[title](https://example.com)")
         # => [("title", "https://example.com")]
     """
-    matches = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    matches = PLAIN_LINK_PATTERN.findall(text)
     return matches
\ No newline at end of file
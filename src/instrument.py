@@ -0,0 +1,159 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+class Instrumentation:
+    def __init__(self, profile_path=None, trace_memory=False):
+        """Collects stage timers, per-page timings and counters for one build.
+
+        Everything is recorded as Chrome trace events ("X" complete events with
+        microsecond timestamps), which Perfetto, speedscope and chrome://tracing
+        can load as a flamegraph.
+
+        Args:
+            profile_path (Optional[str]): If set, run cProfile for the duration of
+                the build and write the stats to this path.
+            trace_memory (bool): Track peak Python memory per stage with tracemalloc.
+
+        Example:
+            instrument = Instrumentation()
+            with instrument.stage("render"):
+                ...
+            print(instrument.summary())
+        """
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.profiler = None
+        self.events = []
+        self.stage_seconds = defaultdict(float)
+        self.stage_memory = {}
+        self.page_seconds = {}
+        self.counters = Counter()
+
+    def start(self):
+        """Start the optional profilers. Call once before the build."""
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile_path:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        """Stop the optional profilers and write the cProfile stats file."""
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_path)
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a build stage (nested stages show up nested in the trace)."""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start_time = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stage_seconds[name] += seconds
+            args = {}
+            if self.trace_memory:
+                self.stage_memory[name] = max(self.stage_memory.get(name, 0), tracemalloc.get_traced_memory()[1])
+                args["peak_bytes"] = self.stage_memory[name]
+            self.add_event(name, "stage", start_time, seconds, args=args)
+
+    def page(self, name, seconds, start_time=None, pid=None):
+        """Record how long one page took to render.
+
+        Args:
+            name (str): The page's source path.
+            seconds (float): Render time.
+            start_time (Optional[float]): time.time() when rendering began,
+                defaults to `seconds` ago.
+            pid (Optional[int]): Process that rendered it, so worker pages get
+                their own rows in the trace.
+        """
+        self.page_seconds[name] = seconds
+        if start_time is None:
+            start_time = time.time() - seconds
+        self.add_event(name, "page", start_time, seconds, pid=pid)
+
+    def count(self, name, amount=1):
+        """Add to a named counter (e.g. pages rendered, files copied)."""
+        self.counters[name] += amount
+
+    def add_event(self, name, category, start_time, seconds, pid=None, args=None):
+        self.events.append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": int(start_time * 1_000_000), "dur": int(seconds * 1_000_000),
+            "pid": pid or os.getpid(), "tid": threading.get_ident() if pid is None else pid,
+            "args": args or {},
+        })
+
+    def summary(self, limit=10):
+        """Return a text table of the slowest stages and pages, plus counters.
+
+        Args:
+            limit (int): Number of pages to list.
+
+        Returns:
+            str: The formatted summary.
+        """
+        lines = [f"{'stage':<28}{'seconds':>10}" + (f"{'peak MB':>10}" if self.trace_memory else "")]
+        for name, seconds in sorted(self.stage_seconds.items(), key=lambda item: item[1], reverse=True):
+            line = f"{name:<28}{seconds:>10.3f}"
+            if self.trace_memory:
+                line += f"{self.stage_memory.get(name, 0) / (1024 * 1024):>10.1f}"
+            lines.append(line)
+        if self.page_seconds:
+            lines.append("")
+            lines.append(f"{'slowest pages':<60}{'ms':>10}")
+            slowest = sorted(self.page_seconds.items(), key=lambda item: item[1], reverse=True)[:limit]
+            for name, seconds in slowest:
+                lines.append(f"{name[-60:]:<60}{seconds * 1000:>10.2f}")
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{name}: {value}" for name, value in sorted(self.counters.items()))
+        if self.profiler is not None and os.path.exists(self.profile_path):  # Missing if the build died before stop()
+            lines.append("")
+            stream = io.StringIO()
+            pstats.Stats(self.profile_path, stream=stream).sort_stats("cumulative").print_stats(limit)
+            lines.append(stream.getvalue().strip())
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        """Write the recorded events as a Chrome trace JSON file.
+
+        Args:
+            path (str): Where to write the trace.
+        """
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms",
+                       "otherData": {"counters": dict(self.counters)}}, f)
+
+class NullInstrumentation(Instrumentation):
+    """Instrumentation that records nothing, used when a build isn't being measured."""
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def page(self, name, seconds, start_time=None, pid=None):
+        pass
+
+    def count(self, name, amount=1):
+        pass
@@ -1,74 +1,706 @@
+import argparse
+import hashlib
+import json
 import shutil
 import os
 import sys
+import threading
+import time
 from pathlib import Path
-from markdown_to_html import markdown_to_html_node
-from block_markdown import extract_title
+from builder import Site
+from manifest import hash_file, new_manifest, load_manifest, save_manifest, remove_stale_outputs, remove_untracked_outputs
+from static_sync import sync_static
+from writer import PageWriter, AtomicFile
+from content_index import ContentIndex
+from depgraph import DependencyGraph, explain_rebuild, markdown_references, template_references
+from render_pool import run_jobs, default_jobs
+from template import Template
+from search_index import TermCollector, generate_search_index
+from front_matter import MetadataIndex
+from taxonomy import PAGE_SIZE, generate_listings
+from feeds import generate_feeds
+from compress import compress_site
+from fingerprint import ASSET_MANIFEST_FILE, DEFAULT_PATTERNS, asset_urls, write_asset_manifest
+from serve import Watcher, start_server, try_rebuild, watch
+from render_cache import RenderCache, DEFAULT_MAX_BYTES, DEFAULT_MEMO_BYTES
+from instrument import Instrumentation, NullInstrumentation
+import bench
 
-def main():
+STREAM_THRESHOLD = 8 * 1024 * 1024  # Markdown files larger than this are rendered block by block
+SERVE_DIR = "serve"  # Output directory of the dev server, inside the cache directory
+
+worker_site = None  # Each render worker process's Site: its own copy of the block cache, inline memo and term collector
+
+def main(argv=None):
     """
     Entry point for the static site generator.
 
     Determines the paths for the script directory, static directory,
-    and public directory, then calls generate_site().
+    and public directory, then calls generate_site(), which reads sources
+    from disk and renders them through a Site (see builder.py). `main.py serve ...`
+    runs the development server instead (see serve_command), and
+    `main.py bench ...` runs the benchmark suite (see bench.main).
+
+    Args:
+        argv (Optional[list]): Command line arguments, defaults to sys.argv[1:].
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        return serve_command(argv[1:])
+    if argv[:1] == ["bench"]:
+        return bench.main(argv[1:])
+
+    args = build_parser().parse_args(argv)
+
+    instrument = None
+    if args.timings or args.trace or args.cprofile or args.tracemalloc:
+        instrument = Instrumentation(profile_path=args.cprofile, trace_memory=args.tracemalloc)
+
+    static_dir, public_dir, template_file, content_dir, cache_dir = project_paths()
+    try:
+        generate_site(static_dir, public_dir, template_file, content_dir, args.basepath, BuildOptions.from_args(args, cache_dir),
+                      instrument)
+    finally:
+        if instrument is not None:
+            print(instrument.summary())
+            if args.trace:
+                instrument.write_trace(args.trace)
+                print(f"Trace written to {args.trace}")
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def build_parser():
+    """
+    Builds the command line parser for a site build (see main).
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(description="Generate the static site into docs/.")
+    parser.add_argument("basepath", nargs="?", default="/", help='URL prefix the site is served from (e.g. "/static-site-generator/")')
+    parser.add_argument("--incremental", action="store_true", help="Only rebuild pages and assets that changed since the last build")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Render pages on N worker processes (0 for one per CPU core)")
+    parser.add_argument("--clean", action="store_true", help="Delete docs/ before a full build instead of overwriting it in place")
+    parser.add_argument("--explain", action="store_true", help="Print why each page is rebuilt")
+    parser.add_argument("--changes", metavar="FILE", help="Write the output paths this build changed or removed to FILE (JSON)")
+    parser.add_argument("--hardlink-static", action="store_true",
+                        help="Hard-link static files into docs/ instead of copying them (docs/ must not be edited in place)")
+    parser.add_argument("--checksum", action="store_true",
+                        help="Compare static file contents when sizes match but modification times don't")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="Publish CSS, JS, images and fonts under content-hashed names and point pages at them")
+    parser.add_argument("--compress", action="store_true",
+                        help="Write precompressed .gz (and .br, if brotli is installed) siblings of HTML, CSS and other text outputs")
+    parser.add_argument("--search", action="store_true",
+                        help="Write a sharded full-text search index of every page to docs/search/")
+    parser.add_argument("--site-url", metavar="URL",
+                        help="The site's origin (e.g. https://example.com); writes sitemap.xml, atom.xml and pages.json")
+    parser.add_argument("--drafts", action="store_true", help='Also build pages whose front matter says "draft: true"')
+    parser.add_argument("--listings", action="store_true",
+                        help="Generate paginated blog listing, tag and yearly archive pages")
+    parser.add_argument("--page-size", type=positive_int, default=PAGE_SIZE, help="Posts per listing page")
+    parser.add_argument("--include", action="append", metavar="GLOB",
+                        help='Only build content files matching GLOB (repeatable, defaults to "*.md")')
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="Skip content files and directories matching GLOB (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the on-disk block render cache or content index")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help="Render cache size limit in MB")
+    parser.add_argument("--inline-memo-size", type=int, default=DEFAULT_MEMO_BYTES // (1024 * 1024),
+                        help="Size limit in MB of the in-memory memo of rendered inline fragments (0 disables it)")
+    parser.add_argument("--timings", action="store_true", help="Print a summary of the slowest stages and pages")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome trace (JSON) of the build for a flamegraph viewer")
+    parser.add_argument("--cprofile", metavar="FILE", help="Profile the build with cProfile and write the stats to FILE")
+    parser.add_argument("--tracemalloc", action="store_true", help="Report peak Python memory per stage")
+    return parser
+
+def serve_command(argv):
+    """
+    Builds the site into .cache/serve/, serves it over HTTP and optionally
+    rebuilds on change.
+
+    The committed docs/ is never touched, so the dev loop can't overwrite the
+    deployed build (made with the /static-site-generator/ basepath). A first
+    build that fails is reported like any later one and the server still
+    starts, so the error can be fixed without restarting.
+
+    With --watch the process stays warm: content/, static/ and template.html
+    are polled, bursts of saves are debounced into one incremental rebuild,
+    and the latency of every rebuild is reported. The render cache is loaded
+    once, kept in memory across rebuilds and saved when the server stops.
+
+    Args:
+        argv (list): Arguments after "serve".
+    """
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Build and serve the site locally.")
+    parser.add_argument("basepath", nargs="?", default="/", help="URL prefix to build with (defaults to /)")
+    parser.add_argument("--port", type=int, default=8888, help="Port to listen on")
+    parser.add_argument("--watch", action="store_true", help="Rebuild affected pages when sources change")
+    args = parser.parse_args(argv)
+
+    static_dir, _, template_file, content_dir, cache_dir = project_paths()
+    public_dir = os.path.join(cache_dir, SERVE_DIR)
+    os.makedirs(public_dir, exist_ok=True)
+    options = BuildOptions(incremental=True, cache_dir=cache_dir, render_cache=RenderCache.load(cache_dir))
+
+    def rebuild(changed=None):
+        if changed:
+            graph = DependencyGraph(load_manifest(public_dir))
+            affected = set()
+            for path in changed:
+                if path == template_file:
+                    affected.update(graph.dependents("template"))
+                elif path.startswith(content_dir):
+                    affected.update(graph.dependents(os.path.relpath(path, content_dir)))
+                else:
+                    affected.update(graph.dependents(os.path.relpath(path, static_dir)))
+            print(f"{len(affected)} page(s) depend on the changed files")
+        generate_site(static_dir, public_dir, template_file, content_dir, args.basepath, options)
+
+    try_rebuild(rebuild)
+    server = start_server(public_dir, args.port)
+    print(f"Serving {public_dir} at http://localhost:{args.port}{args.basepath}")
+    try:
+        if args.watch:
+            print(f"Watching {content_dir}, {static_dir} and {template_file} for changes")
+            watch(Watcher([content_dir, static_dir, template_file]), rebuild)
+        else:
+            threading.Event().wait() # Serve until interrupted
+    except KeyboardInterrupt:
+        print("Stopping server")
+    finally:
+        server.shutdown()
+        options.render_cache.save(cache_dir)
+
+def project_paths():
+    """
+    Locates the project directories relative to this file.
+
+    Returns:
+        tuple[str, str, str, str, str]: The static directory, public directory,
+        template file, content directory and build cache directory.
     """
-    basepath = sys.argv[1]
     script_dir = os.path.dirname(os.path.abspath(__file__)) # Should always return the location of this main.py file
     parent_dir = os.path.dirname(script_dir) # Go up one level
     static_dir = os.path.join(parent_dir, "static") # Add static to parent dir
     public_dir = os.path.join(parent_dir, "docs") # Add docs to parent dir
     content_dir = os.path.join(parent_dir, "content") # Add content to parent dir
     template_file = os.path.join(parent_dir, "template.html")
-    generate_site(static_dir, public_dir, template_file, content_dir, basepath)
+    cache_dir = os.path.join(parent_dir, ".cache") # Build caches live outside docs/ so they are never published
+    return static_dir, public_dir, template_file, content_dir, cache_dir
+
+class BuildOptions:
+    def __init__(self, incremental=False, jobs=1, clean=False, explain=False, changes_path=None, cache_dir=None,
+                 cache_size=DEFAULT_MAX_BYTES, memo_size=DEFAULT_MEMO_BYTES, static_mode="auto", checksum=False,
+                 include=("*.md",), exclude=(), drafts=False, fingerprint=(), listings=False, page_size=PAGE_SIZE,
+                 search=False, site_url=None, compress=False, render_cache=None):
+        """How generate_site builds the site, including which optional stages run.
+
+        Args:
+            incremental (bool): Reuse outputs from the previous build where possible.
+            jobs (int): Number of worker processes used to render pages.
+            clean (bool): Delete the public directory before a full build.
+            explain (bool): Print the reasons each page is rebuilt.
+            changes_path (Optional[str]): Write the public-directory-relative paths
+                this build "changed" and "removed" to this JSON file, for deploy
+                tools that only push the delta.
+            cache_dir (Optional[str]): Directory for the render cache and the
+                indexes kept between builds, None to disable them.
+            cache_size (int): Render cache size limit in bytes.
+            memo_size (int): Inline memo size limit in bytes, 0 to disable it.
+            static_mode (str): "auto" to copy static files (reflink, copy_file_range or
+                sendfile where supported), "hardlink" to link them.
+            checksum (bool): Compare static file contents when modification times differ.
+            include (tuple[str]): Glob patterns of content files to build.
+            exclude (tuple[str]): Glob patterns of content files and directories to skip.
+            drafts (bool): Build pages marked "draft: true" too.
+            fingerprint (tuple[str]): Glob patterns of static file names to publish
+                under content-hashed names (e.g. DEFAULT_PATTERNS), empty for none.
+            listings (bool): Generate blog listing, tag and archive pages (see generate_listings).
+            page_size (int): Posts per listing page.
+            search (bool): Write a search index to public_dir/search/ (see generate_search_index).
+            site_url (Optional[str]): The site's origin; writes the sitemap, feed and
+                pages.json (see generate_feeds). None to skip them.
+            compress (bool): Write .gz/.br siblings of text outputs (see compress_site).
+            render_cache (Optional[RenderCache]): A render cache owned by the caller (e.g.
+                the dev server's, kept warm between rebuilds), used instead of loading
+                and saving the one in cache_dir.
+        """
+        self.incremental = incremental
+        self.jobs = jobs
+        self.clean = clean
+        self.explain = explain
+        self.changes_path = changes_path
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.memo_size = memo_size
+        self.static_mode = static_mode
+        self.checksum = checksum
+        self.include = include
+        self.exclude = exclude
+        self.drafts = drafts
+        self.fingerprint = fingerprint
+        self.listings = listings
+        self.page_size = page_size
+        self.search = search
+        self.site_url = site_url
+        self.compress = compress
+        self.render_cache = render_cache
+
+    @classmethod
+    def from_args(cls, args, cache_dir):
+        """Return the options for a parsed command line (see build_parser).
+
+        Args:
+            args (argparse.Namespace): The parsed arguments.
+            cache_dir (str): The project's build cache directory.
+
+        Returns:
+            BuildOptions: The options.
+        """
+        return cls(incremental=args.incremental, jobs=args.jobs or default_jobs(), clean=args.clean, explain=args.explain,
+                   changes_path=args.changes, cache_dir=None if args.no_cache else cache_dir,
+                   cache_size=args.cache_size * 1024 * 1024, memo_size=args.inline_memo_size * 1024 * 1024,
+                   static_mode="hardlink" if args.hardlink_static else "auto", checksum=args.checksum,
+                   include=args.include or ("*.md",), exclude=args.exclude, drafts=args.drafts,
+                   fingerprint=DEFAULT_PATTERNS if args.fingerprint else (), listings=args.listings,
+                   page_size=args.page_size, search=args.search, site_url=args.site_url, compress=args.compress)
 
-def generate_site(static_dir, public_dir, template_path, content_dir, basepath):
+def generate_site(static_dir, public_dir, template_path, content_dir, basepath, options=None, instrument=None):
     """
     Orchestrates site generation.
 
+    A full build renders every page and then deletes any file in the public
+    directory it didn't produce (with options.clean, it deletes the
+    directory first instead). An incremental build compares every source
+    with the manifest of the previous build (see DependencyGraph) and only
+    re-renders the pages that changed. Both write a fresh manifest.
+
+    Pages are rendered through a Site on options.jobs processes and written
+    by a PageWriter, which leaves files whose HTML didn't change untouched.
+    A page that can't be read, rendered or written is reported without
+    stopping the others and keeps the output of the last build, full or
+    incremental; an exception listing the failures is raised once the rest
+    of the build is done. The optional stages (listings,
+    search index, feeds and compression) then run over the manifest.
+
     Args:
         static_dir (str): Path to the static assets directory.
         public_dir (str): Path to the public output directory.
+        template_path (str): Path to the HTML template.
+        content_dir (str): Path to the markdown content directory.
+        basepath (str): URL prefix the site is served from.
+        options (Optional[BuildOptions]): How to build; a plain full build when None.
+        instrument (Optional[Instrumentation]): Collects stage and per-page timings;
+            nothing is measured when None.
     """
-    clean_public_directory(public_dir)
-    check_static_directory(static_dir)
-    copy_to_public(static_dir, public_dir)
-    content_files = get_content(content_dir)
+    options = options or BuildOptions()
+    instrument = instrument or NullInstrumentation()
+    instrument.start()
+    try:
+        build_start = time.time()
+
+        with instrument.stage("clean"):
+            if options.incremental:
+                previous = load_manifest(public_dir)
+                kept = previous["pages"]
+                os.makedirs(public_dir, exist_ok=True)
+            else:
+                previous = new_manifest()
+                if options.clean:
+                    clean_public_directory(public_dir)
+                    kept = {}
+                else:
+                    kept = load_manifest(public_dir)["pages"]  # Failing pages keep their output on full builds too
+                    os.makedirs(public_dir, exist_ok=True)
+        manifest = new_manifest()
+
+        check_static_directory(static_dir)
+        with instrument.stage("static_copy"):
+            static_stats = sync_static(static_dir, public_dir, previous["static"], manifest["static"], options.static_mode,
+                                       options.checksum, fingerprint=options.fingerprint)
+            url_map = asset_urls(manifest["static"])
+            generated_changed = []
+            if url_map:
+                if write_asset_manifest(public_dir, url_map):
+                    generated_changed.append(ASSET_MANIFEST_FILE)
+                manifest["generated"][ASSET_MANIFEST_FILE] = {"output": ASSET_MANIFEST_FILE}
+        print(f"Static files: {static_stats['copied']} copied, {static_stats['unchanged']} unchanged, "
+              f"{static_stats['removed']} removed, {static_stats['failed']} failed"
+              + (f", {len(url_map)} fingerprinted" if url_map else ""))
+        with instrument.stage("scan_content"):
+            content_index = ContentIndex.load(options.cache_dir, content_dir, options.include, options.exclude).scan()
+            metadata_index = MetadataIndex.load(options.cache_dir).update(content_index, content_dir)
+            if options.cache_dir:
+                content_index.save(options.cache_dir)
+                metadata_index.save(options.cache_dir)
+            content_files = list(content_index)  # Sorted so every build processes pages in the same order
+            if not options.drafts and metadata_index.drafts():
+                skipped = set(metadata_index.drafts())
+                content_files = [rel_path for rel_path in content_files if rel_path not in skipped]
+                print(f"Skipping {len(skipped)} draft(s): {', '.join(sorted(skipped))}")
+            template, template_hash = compile_template(template_path, basepath, url_map, manifest)
+            dirty, failures = plan_pages(content_files, content_index, metadata_index, content_dir, public_dir,
+                                         previous, kept, manifest, template_hash, basepath, url_map, options.explain)
+            unreadable = len(failures)  # Pages whose front matter couldn't be read are never rendered
+        with instrument.stage("load_cache"):
+            cache = options.render_cache
+            if cache is None and options.cache_dir:
+                cache = RenderCache.load(options.cache_dir, options.cache_size)
+
+        writer = PageWriter()
+        site = Site(template, cache=cache, memo_size=options.memo_size, collector=TermCollector() if options.search else None)
+        with instrument.stage("render"):
+            page_terms = render_pages(dirty, site, writer, options, template_path, kept, manifest, failures, instrument)
+        with instrument.stage("write"):
+            write_errors = writer.close()
+        for rel_path, md_path, html_path, entry in dirty:
+            if html_path in write_errors:
+                print(f"Error writing page {html_path}: {write_errors[html_path]}")
+                failures.append(rel_path)
+                manifest["pages"].pop(rel_path, None)
+                if rel_path in kept:
+                    manifest["pages"][rel_path] = kept[rel_path]
+
+        if options.listings:
+            with instrument.stage("listings"):
+                listing_stats = generate_listings(public_dir, manifest, previous, metadata_index, template, template_hash,
+                                                  options.page_size)
+            generated_changed += listing_stats["changed"]
+            instrument.count("listings_rendered", listing_stats["rendered"])
+        if options.search:
+            with instrument.stage("search_index"):
+                search_stats = generate_search_index(public_dir, manifest, metadata_index, page_terms, content_dir,
+                                                     options.cache_dir, failures)
+            generated_changed += search_stats["changed"]
+            instrument.count("search_terms", search_stats["terms"])
+            instrument.count("search_bytes", search_stats["bytes"])
+        if options.site_url:
+            with instrument.stage("feeds"):
+                feed_stats = generate_feeds(public_dir, manifest, metadata_index, content_index, content_dir,
+                                            options.site_url, basepath, failures)
+            generated_changed += feed_stats["changed"]
+        if options.compress:
+            with instrument.stage("compress"):
+                compress_stats = compress_site(public_dir, manifest)
+            generated_changed += compress_stats["written_paths"]
+            instrument.count("files_compressed", compress_stats["compressed"])
 
-    for md_path in content_files:
-        rel_path = os.path.relpath(md_path, content_dir)  # blog/glorfindel/index.md
-        html_path = os.path.join(public_dir, os.path.splitext(rel_path)[0] + ".html")
+        with instrument.stage("prune"):
+            if options.incremental:
+                removed_paths = remove_stale_outputs(public_dir, previous["pages"], manifest["pages"])
+                removed_paths += remove_stale_outputs(public_dir, previous.get("generated", {}), manifest["generated"])
+            else:
+                removed_paths = remove_untracked_outputs(public_dir, manifest)
+            for removed_path in removed_paths:
+                print(f"Removed stale output {removed_path}")
+        print(f"Pages: {len(writer.changed)} changed, {writer.unchanged} identical to the existing output")
+        with instrument.stage("save_manifest"):
+            save_manifest(public_dir, manifest)
+        if cache is not None:
+            if options.render_cache is None:
+                with instrument.stage("save_cache"):
+                    cache.save(options.cache_dir)
+            print(f"Render cache: {cache.stats()}")
+        if site.memo is not None:
+            print(f"Inline memo: {site.memo.hits} hits, {site.memo.misses} misses ({site.memo.hit_rate():.0%} hit rate)")
+            instrument.count("inline_memo_hits", site.memo.hits)
+        if options.incremental:
+            print(f"Incremental build: {len(dirty)} page(s) rebuilt, {len(content_files) - len(dirty) - unreadable} unchanged")
+        if options.changes_path:
+            changes = {
+                "changed": sorted([os.path.relpath(path, public_dir) for path in writer.changed] + static_stats["copied_paths"]
+                                  + generated_changed),
+                "removed": sorted([os.path.relpath(path, public_dir) for path in removed_paths] + static_stats["removed_paths"]),
+            }
+            with open(options.changes_path, "w") as f:
+                json.dump(changes, f, indent=2)
 
-        generate_page(md_path, template_path, html_path, basepath)
+        instrument.count("pages_rendered", len(dirty) - len(failures) + unreadable)
+        instrument.count("pages_unchanged", len(content_files) - len(dirty) - unreadable)
+        instrument.count("pages_failed", len(failures))
+        instrument.count("pages_changed", len(writer.changed))
+        instrument.count("static_copied", static_stats["copied"])
+        instrument.count("static_unchanged", static_stats["unchanged"])
+        instrument.count("content_files_hashed", content_index.stats["files_hashed"])
+        instrument.add_event("build", "build", build_start, time.time() - build_start)
+        if failures:
+            raise Exception(f"{len(failures)} page(s) failed to generate: {', '.join(failures)}")
+    finally:
+        instrument.stop()
+
+def compile_template(template_path, basepath, url_map, manifest):
+    """
+    Compiles the page template and records it in the manifest.
+
+    Returns:
+        tuple[Template, str]: The template, and its version: a hash of the
+        file and of the fingerprinted assets it references.
+    """
+    with open(template_path) as t:
+        template_text = t.read()
+    template_hash = hash_file(template_path)
+    template = Template(template_text, basepath, url_map)  # Compiled once and shared by every page
+    manifest["template"] = {"hash": template_hash, "references": template_references(template_text)}
+    template_assets = {path: url_map[path] for path in manifest["template"]["references"] if path in url_map}
+    if template_assets:  # The compiled template embeds fingerprinted names, so they version it too
+        manifest["template"]["assets"] = template_assets
+        template_hash = hashlib.sha256(json.dumps([template_hash, template_assets], sort_keys=True).encode()).hexdigest()
+    return template, template_hash
+
+def plan_pages(content_files, content_index, metadata_index, content_dir, public_dir, previous, kept, manifest,
+               template_hash, basepath, url_map, explain=False):
+    """
+    Decides which pages have to be rendered.
+
+    Pages that are up to date with `previous` (see explain_rebuild) go
+    straight into the manifest. Pages whose front matter couldn't be read
+    are reported as failures and keep their entry in `kept`, if any.
+
+    Returns:
+        tuple[list, list]: The pages to render, as (content path, markdown
+        path, HTML path, manifest entry), and the content paths that failed.
+    """
+    dirty, failures = [], []
+    metadata_errors = metadata_index.errors()
+    for rel_path in content_files:  # blog/glorfindel/index.md
+        if rel_path in metadata_errors:
+            print(f"Error reading front matter: {metadata_errors[rel_path]}")
+            failures.append(rel_path)
+            if rel_path in kept:
+                manifest["pages"][rel_path] = kept[rel_path]  # Keep the old output; retried next build
+            continue
+        source = content_index.get(rel_path)
+        md_path = os.path.join(content_dir, rel_path)
+        html_path = os.path.join(public_dir, source["output"])
+        entry = {"source": source["hash"], "template": template_hash, "basepath": basepath, "output": source["output"]}
+        old_entry = previous["pages"].get(rel_path)
+        if old_entry is not None and old_entry.get("source") == entry["source"]:
+            entry["references"] = old_entry.get("references", [])  # Same markdown, same references
+        else:
+            with open(md_path) as m:
+                entry["references"] = markdown_references(m)
+        if url_map:
+            entry["assets"] = {path: url_map[path] for path in entry["references"] if path in url_map}
+
+        reasons = explain_rebuild(old_entry, entry, os.path.exists(html_path))
+        if reasons:
+            dirty.append((rel_path, md_path, html_path, entry))
+            if explain:
+                print(f"Rebuilding {rel_path}: {', '.join(reasons)}")
+        else:
+            manifest["pages"][rel_path] = entry
+    return dirty, failures
 
-def generate_page(from_path, template_path, dest_path, basepath):
+def render_pages(dirty, site, writer, options, template_path, kept, manifest, failures, instrument):
+    """
+    Renders the planned pages and queues them on the writer.
+
+    With more than one job (and page) the pages are rendered on worker
+    processes, each with its own copy of the site (see init_worker), whose
+    cache entries and memo counts are merged back into `site`. A page that
+    fails is added to failures and keeps its entry in `kept`, if any.
+
+    Returns:
+        dict: Content path -> search terms of each page rendered (empty
+        unless the site has a collector).
+    """
+    parallel = options.jobs > 1 and len(dirty) > 1
+    if parallel:
+        # Workers stay quiet; the parent prints progress in page order instead
+        results = run_jobs(render_page_in_worker, [(md_path, html_path) for _, md_path, html_path, _ in dirty], options.jobs,
+                           initializer=init_worker, initargs=(site.template, site.cache, options.memo_size, options.search))
+    else:
+        results = run_jobs(generate_page, [(md_path, template_path, html_path, site.basepath, site, writer)
+                                           for _, md_path, html_path, _ in dirty])
+    page_terms = {}
+    for (rel_path, md_path, html_path, entry), (result, error) in zip(dirty, results):
+        terms = site.collector.take() if site.collector is not None and not parallel else None  # Serial pages render in this order
+        if error:
+            print(f"Error generating page from {md_path}: {error}")
+            failures.append(rel_path)
+            if rel_path in kept:
+                manifest["pages"][rel_path] = kept[rel_path]  # Keep the old output; retried next build
+            continue
+        if parallel:
+            print(f"Generating page from {md_path} to {html_path} using {template_path}")
+            if result["html"] is None:
+                writer.record(html_path, result["changed"])
+            else:
+                writer.write(html_path, result["html"])
+            if site.cache is not None:
+                site.cache.merge(result["cache"])
+            if site.memo is not None:
+                site.memo.hits += result["memo"][0]
+                site.memo.misses += result["memo"][1]
+            terms = result["terms"]
+            instrument.page(rel_path, result["seconds"], result["start"], result["pid"])
+        else:
+            instrument.page(rel_path, result)
+        if terms is not None:
+            page_terms[rel_path] = terms
+        manifest["pages"][rel_path] = entry
+    return page_terms
+
+def generate_page(from_path, template_path, dest_path, basepath, site=None, writer=None):
+    """
+    Prints progress and renders one page (see render_file).
+
+    Args:
+        site (Optional[Site]): Renders the page; one is built from
+            template_path when None.
+        writer (Optional[PageWriter]): Queue the page here instead of writing it
+            before returning.
+
+    Returns:
+        float: Seconds spent rendering the page (and writing it, without a writer).
+    """
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    start = time.perf_counter()
+    if site is None:
+        site = Site(Template.from_file(template_path, basepath))
+    if writer is None:
+        write_page(from_path, site, dest_path)
+    else:
+        generated_file, changed = render_file(from_path, site, dest_path)
+        if generated_file is None:
+            writer.record(dest_path, changed)
+        else:
+            writer.write(dest_path, generated_file)
+    return time.perf_counter() - start
+
+def init_worker(template, cache, memo_size=0, search=False):
+    """
+    Sets up a render worker process with its own Site: its own copy of the
+    block cache, its own inline memo and, with search, its own term collector.
+
+    Args:
+        template (Template): The compiled page template.
+        cache (Optional[RenderCache]): The parent's cache, or None.
+        memo_size (int): Inline memo size limit in bytes, 0 for no memo.
+        search (bool): Collect each page's search terms.
+    """
+    global worker_site
+    worker_site = Site(template, cache=cache, memo_size=memo_size, collector=TermCollector() if search else None)
+
+def render_page_in_worker(from_path, dest_path):
+    """
+    Runs render_file in a worker process against the worker's Site.
+
+    Returns:
+        dict: The rendered page ("html", None if it was streamed straight to
+        dest_path, in which case "changed" says whether dest_path changed),
+        when the page started ("start", as time.time()), how long
+        it took ("seconds"), the worker's "pid", and the cache keys used and
+        entries added for this page ("cache", see RenderCache.drain) for the
+        parent to merge into its cache, the inline memo's (hits, misses)
+        for this page ("memo"), and the page's search "terms" (None unless
+        the worker collects them).
+    """
+    start_time = time.time()
+    start = time.perf_counter()
+    site = worker_site
+    if site.collector is not None:
+        site.collector.take()  # Drop anything left over from a page that failed
+    generated_file, changed = render_file(from_path, site, dest_path)
+    return {
+        "html": generated_file,
+        "changed": changed,
+        "start": start_time,
+        "seconds": time.perf_counter() - start,
+        "pid": os.getpid(),
+        "cache": site.cache.drain() if site.cache is not None else ([], {}),
+        "memo": site.memo.take_stats() if site.memo is not None else (0, 0),
+        "terms": site.collector.take() if site.collector is not None else None,
+    }
+
+def write_page(from_path, site, dest_path):
+    """
+    Renders a markdown file through the site's template and writes the HTML page.
+
+    This is generate_page without the progress output or background writer.
+
+    Args:
+        from_path (str): Path to the markdown source.
+        site (Site): Renders the page.
+        dest_path (str): Path of the HTML file to write.
+
+    Returns:
+        bool: False if dest_path already held the same page and was left untouched.
+    """
+    generated_file, changed = render_file(from_path, site, dest_path)
+    if generated_file is None:
+        return changed
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    output = AtomicFile(dest_path)
+    with output as d:
+        d.write(generated_file)
+    return output.changed
+
+def render_file(from_path, site, dest_path):
+    """
+    Renders a markdown file through the site's template.
+
+    Files larger than STREAM_THRESHOLD are streamed straight to dest_path
+    instead of being returned, so they never have to fit in memory.
+
+    Args:
+        from_path (str): Path to the markdown source.
+        site (Site): Renders the page.
+        dest_path (str): Path of the HTML file, used for streamed pages.
+
+    Returns:
+        tuple[Optional[str], bool]: The rendered page, or None if it was
+        streamed, and whether a streamed page changed dest_path.
+    """
+    if os.path.getsize(from_path) > STREAM_THRESHOLD:
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        return None, stream_page(from_path, site, dest_path)
+
     with open(from_path) as m:
         markdown_file = m.read()
-    with open(template_path) as t:
-        template_file = t.read()
 
-    html_nodes = markdown_to_html_node(markdown_file).to_html()
-    page_title = extract_title(markdown_file)
+    return site.render(markdown_file), True
 
-    generated_file = template_file.replace("{{ Title }}", page_title).replace("{{ Content }}", html_nodes)
-    generated_file = generated_file.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
+def stream_page(from_path, site, dest_path):
+    """
+    Renders a markdown file to HTML block by block, writing as it goes.
 
-    dest_dir = os.path.dirname(dest_path)
+    Memory use is bounded by the largest single block rather than the size of
+    the file, which keeps huge changelogs or docs dumps renderable. The page
+    only replaces dest_path once it is complete, and only if it differs.
 
-    os.makedirs(dest_dir, exist_ok=True)
-    
-    with open(dest_path, "w") as d:
-        d.write(generated_file)
+    Args:
+        from_path (str): Path to the markdown source.
+        site (Site): Renders the page.
+        dest_path (str): Path of the HTML file to write.
+
+    Returns:
+        bool: False if dest_path already held the same page and was left untouched.
+    """
+    output = AtomicFile(dest_path)
+    with open(from_path) as m, output as d:
+        site.render_stream(m, d.write)
+    return output.changed
 
-def get_content(content_dir):
-    files = []
-    for item in os.listdir(content_dir):
-        path_to_item = os.path.join(content_dir, item)
-        if os.path.isdir(path_to_item):
-            files.extend(get_content(path_to_item))
-        elif os.path.isfile(path_to_item):
-            files.append(path_to_item)
-    return files
+def render_page(markdown, template, cache=None):
+    """
+    Renders a markdown document into a full HTML page (see Site.render).
+
+    Args:
+        markdown (str): The raw markdown document.
+        template (Template): The compiled page template.
+        cache (Optional[RenderCache]): Cache of rendered HTML per block.
+
+    Returns:
+        str: The rendered HTML page.
+    """
+    return Site(template, cache=cache).render(markdown)
 
 def convert_paths(file_list, content_dir="content", public_dir="public"):
     new_paths = []
@@ -124,30 +756,6 @@ def check_static_directory(static_dir):
         else:
             raise SystemExit(f"Invalid response: {user_response}")
 
-def copy_to_public(from_dir, to_dir):
-    """
-    Recursively copies files and directories from the static directory to the public directory.
-
-    Args:
-        from_dir (str): Source directory (static).
-        to_dir (str): Destination directory (public).
-    """
-    dir_list = os.listdir(from_dir)
-    for item in dir_list:
-        path_to_item = os.path.join(from_dir, item)
-        if os.path.isdir(path_to_item):
-            new_to_dir = os.path.join(to_dir, item)
-            create_directory(new_to_dir)
-            copy_to_public(path_to_item, new_to_dir)
-        elif os.path.isfile(path_to_item):
-            try:
-                shutil.copy(path_to_item, to_dir)
-                print(f"Successfully copied {path_to_item} to {os.path.join(to_dir, item)}")
-            except Exception as e:
-                print(f"Error copying file {path_to_item} : {e}")
-        else:
-            raise Exception(f"{path_to_item} is neither a file nor a directory, or it does not exist.")
-
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from writer import AtomicFile
+
+MANIFEST_FILE = ".manifest.json"  # Stored in the public directory next to the outputs it describes
+MANIFEST_VERSION = 1
+
+def hash_file(path, chunk_size=65536):
+    """Return the SHA-256 hex digest of a file's contents.
+
+    Reads the file in chunks so large assets never have to fit in memory.
+
+    Args:
+        path (str): Path to the file to hash.
+        chunk_size (int): Number of bytes to read at a time.
+
+    Returns:
+        str: The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def new_manifest():
+    """Return an empty manifest.
+
+    Returns:
+        dict: A manifest with no recorded pages, static files, template or
+        generated files (outputs such as the asset manifest that have no
+        source file of their own, keyed by their output path).
+    """
+    return {"version": MANIFEST_VERSION, "pages": {}, "static": {}, "template": {}, "generated": {}}
+
+def load_manifest(public_dir):
+    """Load the build manifest written by the previous build.
+
+    A missing, unreadable or outdated manifest is treated as empty, which
+    makes the next build rebuild everything.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+
+    Returns:
+        dict: The previous manifest, or an empty one.
+    """
+    manifest_path = os.path.join(public_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return new_manifest()
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return new_manifest()
+    return manifest
+
+def save_manifest(public_dir, manifest):
+    """Write the build manifest into the public directory.
+
+    The manifest is written atomically (see AtomicFile), so an interrupted
+    build never leaves a truncated manifest behind.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        manifest (dict): The manifest describing the current build.
+    """
+    manifest_path = os.path.join(public_dir, MANIFEST_FILE)
+    with AtomicFile(manifest_path) as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def entry_outputs(entry):
+    """Return the output paths a manifest entry publishes.
+
+    That is its "output", plus the content-hashed copy of a fingerprinted
+    static file (see sync_static).
+
+    Example:
+        entry_outputs({"output": "index.css", "fingerprinted": "index.0123456789.css"})
+        # => ["index.css", "index.0123456789.css"]
+    """
+    return [entry["output"], entry["fingerprinted"]] if "fingerprinted" in entry else [entry["output"]]
+
+def remove_stale_outputs(public_dir, old_entries, new_entries):
+    """Delete outputs whose sources no longer exist.
+
+    Any entry recorded by the previous build but missing from the current one
+    has its output file removed, along with any directories left empty.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        old_entries (dict): Manifest entries from the previous build.
+        new_entries (dict): Manifest entries from the current build.
+
+    Returns:
+        list[str]: Paths of the output files that were removed.
+
+    Example:
+        remove_stale_outputs("docs", {"tom/index.md": {"output": "tom/index.html"}}, {})
+        # => ["docs/tom/index.html"]
+    """
+    removed = []
+    for key, entry in old_entries.items():
+        if key in new_entries:
+            continue
+        output_path = os.path.join(public_dir, entry["output"])
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            continue
+        removed.append(output_path)
+        remove_empty_dirs(os.path.dirname(output_path), public_dir)
+    return removed
+
+def remove_untracked_outputs(public_dir, manifest):
+    """Delete every file in the public directory that the manifest doesn't list.
+
+    Used by full builds, which overwrite the public directory in place rather
+    than deleting it, so files whose contents didn't change keep their mtimes.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        manifest (dict): The manifest describing the current build.
+
+    Returns:
+        list[str]: Paths of the files that were removed.
+    """
+    keep = {MANIFEST_FILE}
+    for section in ("pages", "static", "generated"):
+        keep.update(os.path.normpath(output) for entry in manifest.get(section, {}).values() for output in entry_outputs(entry))
+    removed = []
+    for dirpath, dirnames, filenames in os.walk(public_dir, topdown=False):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.relpath(path, public_dir) not in keep:
+                os.remove(path)
+                removed.append(path)
+        if dirpath != public_dir and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
+
+def remove_empty_dirs(path, stop_dir):
+    """Remove empty directories from path upwards, stopping at stop_dir.
+
+    Args:
+        path (str): The directory to start from.
+        stop_dir (str): A parent directory that is never removed.
+    """
+    stop_dir = os.path.abspath(stop_dir)
+    path = os.path.abspath(path)
+    while path != stop_dir and path.startswith(stop_dir):
+        try:
+            os.rmdir(path)
+        except OSError:
+            return  # Not empty (or already gone) - nothing more to prune
+        path = os.path.dirname(path)
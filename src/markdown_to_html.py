@@ -1,9 +1,9 @@
-from block_markdown import markdown_to_blocks, block_to_block_type, BlockType
-from htmlnode import ParentNode
+from block_markdown import markdown_to_blocks, classify_block, block_lines, BlockType, HEADING_PATTERN
+from htmlnode import LeafNode, ParentNode
 from inline_markdown import text_to_textnodes
 from textnode import TextNode, text_node_to_html_node, TextType
 
-def markdown_to_html_node(markdown):
+def markdown_to_html_node(markdown, basepath="/", cache=None, memo=None, collector=None, asset_urls=None):
     """Convert full markdown text into an HTML node tree.
 
     Splits the input markdown into blocks, maps each block to the
@@ -12,6 +12,14 @@ def markdown_to_html_node(markdown):
 
     Args:
         markdown (str): The raw markdown document.
+        basepath (str): URL prefix applied to root-relative link and image URLs.
+        cache (Optional[RenderCache]): Cache of rendered HTML per block. Blocks
+            found in it become raw HTML leaves instead of being re-parsed.
+        memo (Optional[InlineMemo]): Converted nodes per short inline fragment,
+            see text_to_children.
+        collector (Optional[TermCollector]): Receives each block's search
+            terms, see block_to_cached_node.
+        asset_urls (Optional[dict]): Fingerprinted asset names, see rewrite_url.
 
     Returns:
         ParentNode: A <div> node containing the converted HTML structure
@@ -24,14 +32,86 @@ def markdown_to_html_node(markdown):
     blocks = markdown_to_blocks(markdown)
     children_nodes = []
     for block in blocks:
-        block_type = block_to_block_type(block) # Determine the type of block
-        node = block_to_html_node(block, block_type)
-        children_nodes.append(node)
+        children_nodes.append(block_to_cached_node(block, basepath, cache, memo, asset_urls, collector))
     add_parent_div = ParentNode(tag="div", children=children_nodes)
     return add_parent_div
 
+def block_to_cached_node(block, basepath="/", cache=None, memo=None, asset_urls=None, collector=None):
+    """Convert a markdown block into an HTML node, going through the render cache if given.
 
-def block_to_html_node(block, block_type):
+    On a cache hit the block isn't parsed at all: its stored HTML is returned
+    as a tagless LeafNode, which renders its value as-is. On a miss the block
+    is rendered normally and the result is stored for next time.
+
+    A collector gets the block's search terms either way. The terms are
+    counted from the fresh node tree and cached next to the HTML, so a hit
+    indexes exactly the words a miss would. A cached entry stored without
+    terms counts as a miss while collecting.
+
+    Args:
+        block (str): A single block of markdown text.
+        basepath (str): URL prefix applied to root-relative link and image URLs.
+        cache (Optional[RenderCache]): The block cache, or None to skip caching.
+        memo (Optional[InlineMemo]): Converted nodes per short inline fragment.
+        asset_urls (Optional[dict]): Fingerprinted asset names, see rewrite_url.
+        collector (Optional[TermCollector]): Receives the block's search terms.
+
+    Returns:
+        HTMLNode: The HTML node for this block.
+    """
+    if cache is None:
+        block_type, lines = classify_block(block)
+        node = block_to_html_node(block, block_type, basepath, lines, memo, asset_urls)
+        if collector is not None:
+            collector.add(node)
+        return node
+    key = cache.key(block, basepath, asset_urls)
+    entry = cache.get(key)
+    if entry is None or (collector is not None and entry[1] is None):
+        block_type, lines = classify_block(block)
+        node = block_to_html_node(block, block_type, basepath, lines, memo, asset_urls)
+        entry = [node.to_html(), collector.add(node) if collector is not None else None]
+        cache.put(key, entry)
+    elif collector is not None:
+        collector.add_terms(entry[1])
+    return LeafNode(None, entry[0])
+
+def write_markdown_html(blocks, write, basepath="/", cache=None, memo=None, collector=None, asset_urls=None):
+    """Render markdown blocks as HTML, writing each block as soon as it's converted.
+
+    Produces the same output as markdown_to_html_node(...).to_html(), but only
+    one block's node tree exists at a time, so it can render documents far
+    larger than memory when fed by read_blocks.
+
+    Args:
+        blocks: An iterable of markdown blocks (e.g. read_blocks(file)).
+        write: A callable taking a string, e.g. an open file's write method.
+        basepath (str): URL prefix applied to root-relative link and image URLs.
+        cache (Optional[RenderCache]): Cache of rendered HTML per block.
+        memo (Optional[InlineMemo]): Converted nodes per short inline fragment.
+        collector (Optional[TermCollector]): Receives each block's search terms.
+        asset_urls (Optional[dict]): Fingerprinted asset names, see rewrite_url.
+
+    Raises:
+        ValueError: If there are no blocks, matching the empty <div> error.
+
+    Example:
+        with open("big.md") as src, open("big.html", "w") as dest:
+            write_markdown_html(read_blocks(src), dest.write)
+    """
+    blocks = iter(blocks)
+    block = next(blocks, None)
+    if block is None:
+        raise ValueError("No children given - parent nodes must have children")
+    write("<div>")
+    while block is not None:
+        node = block_to_cached_node(block, basepath, cache, memo, asset_urls, collector)
+        node.write_html(write)
+        block = next(blocks, None)
+    write("</div>")
+
+
+def block_to_html_node(block, block_type, basepath="/", lines=None, memo=None, asset_urls=None):
     """Convert a markdown block into its corresponding HTML node.
 
     Maps each block type (heading, code, quote, list, paragraph) to
@@ -41,6 +121,12 @@ def block_to_html_node(block, block_type):
     Args:
         block (str): A single block of markdown text.
         block_type (BlockType): The type of block (e.g., HEADING, QUOTE).
+        basepath (str): URL prefix applied to root-relative link and image URLs.
+        lines (Optional[list[str]]): The block's content lines from
+            classify_block, so the block isn't split and stripped again.
+            Computed from the block when omitted.
+        memo (Optional[InlineMemo]): Converted nodes per short inline fragment.
+        asset_urls (Optional[dict]): Fingerprinted asset names, see rewrite_url.
 
     Returns:
         ParentNode: The root HTML node for this block.
@@ -49,46 +135,26 @@ def block_to_html_node(block, block_type):
         block_to_html_node("## Subtitle", BlockType.HEADING)
         # => ParentNode("h2", [LeafNode(None, "Subtitle")])
     """
+    if lines is None:
+        lines = block_lines(block, block_type)
     node = None
     if block_type == BlockType.HEADING:
-        h_num = heading_number(block)
-        index = int(h_num) + 1
-        text = block[index:]
-        node = ParentNode(tag=f"h{h_num}", children=text_to_children(text))
+        node = ParentNode(tag=f"h{heading_number(block)}", children=text_to_children(lines[0], basepath, memo, asset_urls))
     elif block_type == BlockType.CODE:
-        code = block[4:-3] # Skip "```\n" at start and "\n```" at end
-        code_text_node = TextNode(text=code, text_type=TextType.TEXT)
+        code_text_node = TextNode(text=lines[0], text_type=TextType.TEXT)
         code_html_node = text_node_to_html_node(code_text_node)
         code_tags = ParentNode(tag="code", children=[code_html_node])
         node = ParentNode(tag="pre", children=[code_tags])
     elif block_type == BlockType.QUOTE:
-        lines = block.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            cleaned_line = line
-            if line.startswith(">"): # Remove ">" and then any leading space    
-                cleaned_line = line[1:].lstrip(" ")
-            cleaned_lines.append(cleaned_line)
-        text = "\n".join(cleaned_lines)
-        node = ParentNode(tag="blockquote", children=text_to_children(text))
+        node = ParentNode(tag="blockquote", children=text_to_children("\n".join(lines), basepath, memo, asset_urls))
     elif block_type == BlockType.ORDERED:
-        lines = block.split("\n")
-        list_items = []
-        for line in lines:
-            cleaned_line = line.split(". ", 1)[1]
-            list_items.append(ParentNode(tag="li", children=text_to_children(cleaned_line)))
+        list_items = [ParentNode(tag="li", children=text_to_children(line, basepath, memo, asset_urls)) for line in lines]
         node = ParentNode(tag="ol", children=list_items)
     elif block_type == BlockType.UNORDERED:
-        lines = block.split("\n")
-        list_items = []
-        for line in lines:
-            cleaned_line = line.split("- ", 1)[1]
-            list_items.append(ParentNode(tag="li", children=text_to_children(cleaned_line)))
+        list_items = [ParentNode(tag="li", children=text_to_children(line, basepath, memo, asset_urls)) for line in lines]
         node = ParentNode(tag="ul", children=list_items)
     elif block_type == BlockType.PARAGRAPH:
-        lines = block.split("\n")
-        paragraph_text = " ".join(lines)
-        node = ParentNode(tag="p", children=text_to_children(paragraph_text))
+        node = ParentNode(tag="p", children=text_to_children(" ".join(lines), basepath, memo, asset_urls))
     return node
 
 def heading_number(block):
@@ -103,26 +169,25 @@ def heading_number(block):
     Example:
         heading_number("### Title")  # => "3"
     """
-    if block.startswith("# "):
-        return "1"
-    elif block.startswith("## "):
-        return "2"
-    elif block.startswith("### "):
-        return "3"
-    elif block.startswith("#### "):
-        return "4"
-    elif block.startswith("##### "):
-        return "5"
-    return "6" # defaults to 6 if it doesn't match 1-5
-    
-def text_to_children(text):
+    match = HEADING_PATTERN.match(block)
+    if match is None:
+        return "6" # defaults to 6 if it doesn't match 1-5
+    return str(len(match.group(1)))
+
+def text_to_children(text, basepath="/", memo=None, asset_urls=None):
     """Convert a string of markdown text into a list of HTML nodes.
 
     Splits the text into TextNodes with inline formatting (bold,
     italics, links, images, etc.), then converts them into HTML nodes.
+    With an inline memo, short fragments that were already converted get
+    their nodes back without being parsed again.
 
     Args:
         text (str): The raw inline markdown text.
+        basepath (str): URL prefix applied to root-relative link and image URLs.
+        memo (Optional[InlineMemo]): Converted nodes per short fragment. Only
+            share one between renders that use the same asset_urls.
+        asset_urls (Optional[dict]): Fingerprinted asset names, see rewrite_url.
 
     Returns:
         list[LeafNode]: A list of HTML nodes representing the inline content.
@@ -131,9 +196,18 @@ def text_to_children(text):
         text_to_children("Hello **world**")
         # => [LeafNode(None, "Hello "), LeafNode("b", "world")]
     """
+    if memo is not None and len(text) <= memo.max_fragment:
+        key = (basepath, text)
+        nodes = memo.get(key)
+        if nodes is not None:
+            return list(nodes)
+    else:
+        key = None
     list_text_nodes = text_to_textnodes(text)
     children_nodes = []
     for node in list_text_nodes:
-        html_node = text_node_to_html_node(node)
+        html_node = text_node_to_html_node(node, basepath, asset_urls)
         children_nodes.append(html_node)
+    if key is not None and children_nodes:
+        memo.put(key, tuple(children_nodes))
     return children_nodes
\ No newline at end of file
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from template import asset_digest
+from writer import AtomicFile
+
+CACHE_FILE = "render-cache.json"
+CACHE_FORMAT = 2  # Bump to invalidate every cache when the file layout changes
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MEMO_BYTES = 16 * 1024 * 1024
+MAX_FRAGMENT_LENGTH = 256  # Longer inline texts are almost always unique paragraphs - not worth memoizing
+NODE_BYTES = 64            # Rough size of one memoized LeafNode besides its text
+RENDERER_MODULES = ("block_markdown.py", "inline_markdown.py", "markdown_to_html.py", "textnode.py", "htmlnode.py", "template.py")
+
+def renderer_version():
+    """Fingerprint the code that turns a markdown block into HTML.
+
+    Any edit to one of the renderer modules changes the version, which
+    invalidates every cached block on the next build.
+
+    Returns:
+        str: A short hex digest of the renderer source files.
+    """
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in RENDERER_MODULES:
+        with open(os.path.join(src_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class LRUCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """A string-valued least-recently-used cache bounded by total size.
+
+        Args:
+            max_bytes: Approximate upper bound on the size of all cached values.
+                The oldest entries are evicted once it is exceeded.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return the cached value for key (marking it recently used), or None."""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Cache a value, evicting the least recently used entries if over budget."""
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= self.sizeof(key, old)
+        self.entries[key] = value
+        self.size += self.sizeof(key, value)
+        while self.size > self.max_bytes and self.entries:
+            evicted_key, evicted = self.entries.popitem(last=False)
+            self.size -= self.sizeof(evicted_key, evicted)
+
+    def sizeof(self, key, value):
+        """Return the size an entry counts towards max_bytes."""
+        return len(value)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Return a one-line summary of hits, misses and size."""
+        return (f"{self.hits} hits, {self.misses} misses ({self.hit_rate():.0%} hit rate), "
+                f"{len(self.entries)} entries, {self.size / (1024 * 1024):.1f} MB")
+
+class InlineMemo(LRUCache):
+    def __init__(self, max_bytes: int = DEFAULT_MEMO_BYTES, max_fragment: int = MAX_FRAGMENT_LENGTH):
+        """Converted nodes per inline markdown fragment, shared by every page in a build.
+
+        Doc sites repeat the same short strings (list items, footers, link
+        lines) across thousands of pages; the memo parses each one once.
+        It keeps the nodes themselves rather than their HTML, so a page
+        built from memoized fragments has the same node tree (and search
+        terms) as one parsed from scratch. It lives only as long as the
+        build, so it needs no versioning.
+
+        Args:
+            max_bytes: Approximate upper bound on the size of all cached
+                fragments and their nodes.
+            max_fragment: Fragments longer than this many characters are
+                never memoized.
+        """
+        super().__init__(max_bytes)
+        self.max_fragment = max_fragment
+
+    def sizeof(self, key, value):
+        # Keys are (basepath, fragment) and values are tuples of LeafNodes
+        return len(key[1]) + sum(NODE_BYTES + len(str(node.value)) for node in value)
+
+    def take_stats(self):
+        """Return and reset the hit and miss counts, for worker processes to report."""
+        stats = (self.hits, self.misses)
+        self.hits = self.misses = 0
+        return stats
+
+class RenderCache(LRUCache):
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, version: str = None):
+        """Rendered HTML per markdown block, keyed by block text, basepath and renderer version.
+
+        Each value is [html, terms]: the block's HTML and its search terms
+        ({term: frequency}, or None if the block was rendered without a
+        TermCollector). Tracks which keys were used and added since the last drain(), so worker
+        processes can report their activity back to the cache in the parent.
+
+        Args:
+            max_bytes: Approximate upper bound on the size of all cached HTML.
+            version: Renderer version the entries belong to. Defaults to renderer_version().
+        """
+        super().__init__(max_bytes)
+        self.version = version or renderer_version()
+        self.used = []
+        self.added = {}
+        self.assets = (None, "")  # Last asset mapping seen by key() and its digest, swapped as one tuple
+
+    def key(self, block, basepath, asset_urls=None):
+        """Return the cache key for a block rendered with the given basepath and asset fingerprints.
+
+        The mapping's digest is remembered for the mapping object last seen, so
+        a Site passing its template's asset_urls doesn't re-hash it per block.
+        """
+        assets = self.assets
+        if assets[0] is not asset_urls:
+            assets = self.assets = (asset_urls, asset_digest(asset_urls))
+        digest = hashlib.blake2b(digest_size=16, person=self.version.encode()[:16])
+        digest.update(basepath.encode())
+        digest.update(assets[1].encode())
+        digest.update(b"\0")
+        digest.update(block.encode())
+        return digest.hexdigest()
+
+    def sizeof(self, key, value):
+        html, terms = value
+        return len(html) + (sum(len(term) + 4 for term in terms) if terms else 0)
+
+    def get(self, key):
+        value = super().get(key)
+        if value is not None:
+            self.used.append(key)
+        return value
+
+    def put(self, key, value):
+        super().put(key, value)
+        self.added[key] = value
+
+    def drain(self):
+        """Return and reset the keys used and entries added since the last drain.
+
+        Returns:
+            tuple[list[str], dict]: Keys that were hit, and new key -> [html, terms] entries.
+        """
+        delta = (self.used, self.added)
+        self.used, self.added = [], {}
+        return delta
+
+    def merge(self, delta):
+        """Apply a worker's drain() result: refresh hit keys and store new entries."""
+        used, added = delta
+        for key in used:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        for key, value in added.items():
+            LRUCache.put(self, key, value)
+        self.hits += len(used)
+        self.misses += len(added)
+
+    @classmethod
+    def load(cls, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        """Load the cache saved by a previous build.
+
+        A missing or unreadable file, or one written by a different renderer
+        version, gives an empty cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache file.
+            max_bytes (int): Size budget for the loaded cache.
+
+        Returns:
+            RenderCache: The loaded cache.
+        """
+        cache = cls(max_bytes)
+        try:
+            with open(os.path.join(cache_dir, CACHE_FILE)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") != cache.version:
+            return cache  # Renderer code changed - everything cached is stale
+        for key, value in data.get("entries", []):
+            LRUCache.put(cache, key, value)
+        return cache
+
+    def save(self, cache_dir):
+        """Write the cache to disk, oldest entries first so LRU order survives a reload.
+
+        Args:
+            cache_dir (str): Directory to write the cache file into.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_path = os.path.join(cache_dir, CACHE_FILE)
+        with AtomicFile(cache_path) as f:
+            json.dump({"version": self.version, "entries": list(self.entries.items())}, f)
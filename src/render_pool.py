@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+CHUNKS_PER_WORKER = 4  # Enough chunks to balance uneven pages without paying per-task IPC
+
+def default_jobs():
+    """Return the number of CPU cores available to this process.
+
+    Returns:
+        int: The number of usable cores (at least 1).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def chunk_size(task_count, workers):
+    """Pick how many tasks to hand a worker at a time.
+
+    Args:
+        task_count (int): Total number of tasks.
+        workers (int): Number of worker processes.
+
+    Returns:
+        int: The chunk size passed to Executor.map.
+
+    Example:
+        chunk_size(1000, 4)  # => 62
+    """
+    return max(1, task_count // (workers * CHUNKS_PER_WORKER))
+
+def run_jobs(func, tasks, jobs=1, initializer=None, initargs=()):
+    """Call func(*task) for every task, optionally across a process pool.
+
+    Exceptions are caught per task, so one failing page never stops the
+    others. Results are yielded in the same order as tasks regardless of
+    which worker finished first, which keeps build output deterministic.
+
+    Args:
+        func: A top-level (picklable) function to call.
+        tasks (list[tuple]): Argument tuples, one per call.
+        jobs (int): Number of worker processes. 1 runs everything in-process.
+        initializer: Optional function called once in each worker process
+            before it runs any task (not called when running in-process).
+        initargs (tuple): Arguments for initializer.
+
+    Yields:
+        tuple: (result, error) per task, where error is None on success or
+        a "ExceptionType: message" string on failure.
+
+    Example:
+        list(run_jobs(divmod, [(7, 2), (1, 0)]))
+        # => [((3, 1), None), (None, "ZeroDivisionError: integer division or modulo by zero")]
+    """
+    guarded = partial(_guarded_call, func)
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield guarded(task)
+        return
+    workers = min(jobs, len(tasks))
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        yield from executor.map(guarded, tasks, chunksize=chunk_size(len(tasks), workers))
+
+def _guarded_call(func, task):
+    try:
+        return func(*task), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
@@ -0,0 +1,280 @@
+import json
+import os
+import re
+import time
+from collections import Counter
+from front_matter import split_front_matter
+from markdown_to_html import markdown_to_html_node
+from writer import AtomicFile
+
+SEARCH_DIR = "search"               # Index files live in docs/search/
+TERMS_FILE = "search-terms.json"    # Per-page terms saved in the cache directory between builds
+SHARD_MAGIC = b"SSG1"               # First bytes of every shard, identifying the format version
+MIN_TERM_LENGTH = 2
+TOKEN_PATTERN = re.compile(r"\w+")  # Runs of letters, digits and underscores
+
+def node_text(node):
+    """Yield the text content of an HTML node tree, in document order.
+
+    Images contribute their alt text.
+
+    Args:
+        node (HTMLNode): The root of the tree, e.g. from markdown_to_html_node.
+
+    Yields:
+        str: Text fragments.
+    """
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if node.children is not None:
+            pending.extend(reversed(node.children))
+        elif node.tag == "img":
+            yield (node.props or {}).get("alt", "")
+        else:
+            yield str(node.value)
+
+def count_terms(fragments):
+    """Count the lowercased search terms in some text fragments.
+
+    Example:
+        count_terms(["Tom Bombadil", "old Tom"])
+        # => {"tom": 2, "bombadil": 1, "old": 1}
+    """
+    counts = Counter()
+    for fragment in fragments:
+        counts.update(term for term in TOKEN_PATTERN.findall(fragment.lower()) if len(term) >= MIN_TERM_LENGTH)
+    return dict(counts)
+
+class TermCollector:
+    def __init__(self):
+        """Accumulates the terms of the page being rendered.
+
+        Given to a Site (or markdown_to_html_node), it is handed each block's
+        node tree as the page renders, so pages are indexed without a second
+        parse. take() returns the page's terms and starts the next page.
+
+        Example:
+            site = Site(template, collector=TermCollector())
+            html = site.render(markdown)
+            terms = site.collector.take()
+        """
+        self.counts = Counter()
+
+    def add(self, node):
+        """Count a freshly converted block's terms.
+
+        Returns:
+            dict: The block's terms, for the render cache to store.
+        """
+        terms = count_terms(node_text(node))
+        self.counts.update(terms)
+        return terms
+
+    def add_terms(self, terms):
+        """Count a block's terms stored by the render cache."""
+        self.counts.update(terms)
+
+    def take(self):
+        """Return the terms collected since the last call as {term: frequency}."""
+        terms, self.counts = dict(self.counts), Counter()
+        return terms
+
+def encode_varint(value, out):
+    """Append an unsigned integer to a bytearray, 7 bits per byte, low bits first."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(data, pos):
+    """Read an unsigned integer written by encode_varint.
+
+    Returns:
+        tuple[int, int]: The value and the position after it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def shard_name(term):
+    """Return the shard a term lives in, named after its first character ("t" for "tom")."""
+    first = term[0]
+    return first if first.isascii() and first.isalnum() else "_"
+
+def encode_shard(postings):
+    """Serialize part of an inverted index.
+
+    The layout is SHARD_MAGIC, then the number of terms, then for each term
+    in sorted order: its UTF-8 length and bytes, the number of pages it
+    appears on, and a (page id delta, term frequency) pair per page. Page ids
+    are delta-encoded, so common terms cost about two bytes per page. Every
+    number is a varint.
+
+    Args:
+        postings (dict): Term -> list of (page id, frequency), by ascending page id.
+
+    Returns:
+        bytes: The encoded shard.
+    """
+    out = bytearray(SHARD_MAGIC)
+    encode_varint(len(postings), out)
+    for term in sorted(postings):
+        encoded = term.encode("utf-8")
+        encode_varint(len(encoded), out)
+        out += encoded
+        encode_varint(len(postings[term]), out)
+        last = 0
+        for page_id, frequency in postings[term]:
+            encode_varint(page_id - last, out)
+            encode_varint(frequency, out)
+            last = page_id
+    return bytes(out)
+
+def decode_shard(data):
+    """Read a shard written by encode_shard back into {term: [(page id, frequency)]}."""
+    if data[:len(SHARD_MAGIC)] != SHARD_MAGIC:
+        raise ValueError("Not a search index shard")
+    pos = len(SHARD_MAGIC)
+    count, pos = decode_varint(data, pos)
+    postings = {}
+    for _ in range(count):
+        length, pos = decode_varint(data, pos)
+        term = data[pos:pos + length].decode("utf-8")
+        pos += length
+        pages, pos = decode_varint(data, pos)
+        page_id = 0
+        postings[term] = []
+        for _ in range(pages):
+            delta, pos = decode_varint(data, pos)
+            frequency, pos = decode_varint(data, pos)
+            page_id += delta
+            postings[term].append((page_id, frequency))
+    return postings
+
+def write_search_index(public_dir, pages):
+    """Write an inverted index of the pages into public_dir/search/.
+
+    search/index.json lists the pages (a page id is its position) and the
+    shards; each shard (search/t.bin, see encode_shard) holds the terms
+    starting with one character, so a browser only fetches the shards for the
+    terms it is looking up. Files whose bytes didn't change aren't rewritten.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        pages (list[tuple[str, str, dict]]): (output path, title, terms) per page.
+
+    Returns:
+        dict: The written "outputs" (relative paths), the ones that "changed",
+        and the number of "pages", "terms" and index "bytes".
+    """
+    shards = {}
+    for page_id, (_, _, terms) in enumerate(pages):
+        for term in sorted(terms):
+            shards.setdefault(shard_name(term), {}).setdefault(term, []).append((page_id, terms[term]))
+    files = {
+        os.path.join(SEARCH_DIR, f"{name}.bin"): encode_shard(postings) for name, postings in sorted(shards.items())
+    }
+    listing = {
+        "pages": [[output.replace(os.sep, "/"), title] for output, title, _ in pages],
+        "shards": sorted(shards),
+    }
+    files[os.path.join(SEARCH_DIR, "index.json")] = json.dumps(listing, separators=(",", ":")).encode("utf-8")
+
+    stats = {"outputs": sorted(files), "changed": [], "pages": len(pages),
+             "terms": sum(len(postings) for postings in shards.values()), "bytes": sum(map(len, files.values()))}
+    os.makedirs(os.path.join(public_dir, SEARCH_DIR), exist_ok=True)
+    for rel_path, data in files.items():
+        output = AtomicFile(os.path.join(public_dir, rel_path), "wb")
+        with output as f:
+            f.write(data)
+        if output.changed:
+            stats["changed"].append(rel_path)
+    return stats
+
+def load_terms(cache_dir):
+    """Load the per-page terms saved by the previous build, {} if there are none.
+
+    Returns:
+        dict: Content path -> {"source": hash, "title": str, "terms": dict}.
+    """
+    if not cache_dir:
+        return {}
+    try:
+        with open(os.path.join(cache_dir, TERMS_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_terms(cache_dir, stored):
+    """Save per-page terms so unchanged pages aren't re-indexed next build."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, TERMS_FILE)
+    with AtomicFile(path) as f:
+        json.dump(stored, f)
+
+def index_page(from_path, source_hash, title):
+    """Parse a markdown file just for its search terms, for pages that weren't
+    rendered this build and have no saved terms.
+
+    Returns:
+        dict: The page's "source" hash, "title" and "terms".
+    """
+    with open(from_path) as m:
+        _, body = split_front_matter(m.read())
+    return {"source": source_hash, "title": title, "terms": count_terms(node_text(markdown_to_html_node(body)))}
+
+def generate_search_index(public_dir, manifest, metadata_index, page_terms, content_dir, cache_dir=None, failures=()):
+    """Write the search index for the pages in a build's manifest.
+
+    A page's terms come from this build's render if it was rendered (see
+    TermCollector), else from the terms saved in cache_dir by an earlier
+    build of the same source, else from parsing the page again (see
+    index_page). The terms are saved back to cache_dir for the next build.
+
+    A page that failed this build keeps its previous output, so it keeps
+    its saved terms too, or is left out of the index if there are none. A
+    page that can't be parsed for its terms is reported and left out.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        manifest (dict): This build's manifest; the index files are added to
+            its "generated" section.
+        metadata_index (MetadataIndex): Front matter of every content file.
+        page_terms (dict): Content path -> terms of the pages rendered this build.
+        content_dir (str): Path to the markdown content directory.
+        cache_dir (Optional[str]): Where per-page terms are kept between builds.
+        failures (Iterable[str]): Content paths of the pages that failed this build.
+
+    Returns:
+        dict: As write_search_index.
+    """
+    start = time.perf_counter()
+    stored = load_terms(cache_dir)
+    failed = set(failures)
+    indexed = {}
+    for rel_path, entry in sorted(manifest["pages"].items()):
+        metadata = metadata_index.get(rel_path)
+        if rel_path in page_terms:
+            indexed[rel_path] = {"source": entry["source"], "title": metadata["title"], "terms": page_terms[rel_path]}
+        elif stored.get(rel_path, {}).get("source") == entry["source"]:
+            indexed[rel_path] = stored[rel_path]
+        elif rel_path not in failed:  # A failed page's source no longer matches its kept output
+            try:
+                indexed[rel_path] = index_page(os.path.join(content_dir, rel_path), entry["source"], metadata["title"])
+            except (OSError, ValueError) as e:
+                print(f"Error indexing page {rel_path}: {e}")
+    stats = write_search_index(public_dir, [(manifest["pages"][rel_path]["output"], record["title"], record["terms"])
+                                            for rel_path, record in indexed.items()])
+    for output in stats["outputs"]:
+        manifest["generated"][output] = {"output": output}
+    if cache_dir:
+        save_terms(cache_dir, indexed)
+    print(f"Search index: {stats['pages']} pages, {stats['terms']} terms, {stats['bytes'] / 1024:.1f} KB "
+          f"in {len(stats['outputs'])} files ({time.perf_counter() - start:.2f}s)")
+    return stats
@@ -0,0 +1,162 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+POLL_INTERVAL = 0.25  # Seconds between filesystem scans
+DEBOUNCE = 0.2        # Quiet period required before a burst of saves triggers a rebuild
+
+def snapshot(paths):
+    """Record the modification time and size of every file under the given paths.
+
+    Args:
+        paths (list[str]): Files and/or directories to scan recursively.
+
+    Returns:
+        dict: Maps each file path to its (mtime_ns, size).
+    """
+    files = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                file_path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue  # Deleted between listing and stat (editor swap files)
+                files[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def diff_snapshots(old, new):
+    """Return the paths that were added, removed or modified between two snapshots.
+
+    Args:
+        old (dict): An earlier result of snapshot().
+        new (dict): A later result of snapshot().
+
+    Returns:
+        set[str]: The changed file paths.
+
+    Example:
+        diff_snapshots({"a.md": (1, 5)}, {"a.md": (2, 5), "b.md": (1, 1)})
+        # => {"a.md", "b.md"}
+    """
+    changed = {path for path, stat in new.items() if old.get(path) != stat}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+class Watcher:
+    def __init__(self, paths, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        """Poll a set of files and directories for changes.
+
+        Polling keeps the watcher dependency-free and works the same on every
+        platform and filesystem, including network mounts where inotify is
+        unreliable.
+
+        Args:
+            paths (list[str]): Files and directories to watch.
+            interval (float): Seconds between scans.
+            debounce (float): Seconds without further changes before a batch is reported.
+        """
+        self.paths = paths
+        self.interval = interval
+        self.debounce = debounce
+        self.state = snapshot(paths)
+
+    def poll(self):
+        """Scan once and return the paths changed since the previous scan.
+
+        Returns:
+            set[str]: The changed file paths (empty if nothing changed).
+        """
+        current = snapshot(self.paths)
+        changed = diff_snapshots(self.state, current)
+        self.state = current
+        return changed
+
+    def wait_for_changes(self):
+        """Block until files change, then keep collecting until they settle.
+
+        Editors often write a file several times per save, and a checkout can
+        touch hundreds of files; all of them are returned as one batch once
+        nothing has changed for `debounce` seconds.
+
+        Returns:
+            set[str]: Every path changed during the burst.
+        """
+        changed = set()
+        while not changed:
+            time.sleep(self.interval)
+            changed = self.poll()
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < self.debounce:
+            time.sleep(min(self.interval, self.debounce))
+            more = self.poll()
+            if more:
+                changed |= more
+                quiet_since = time.monotonic()
+        return changed
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves files without logging every request, so rebuild reports stay readable."""
+    def log_message(self, format, *args):
+        pass
+
+def start_server(public_dir, port):
+    """Serve the public directory over HTTP on a background thread.
+
+    Args:
+        public_dir (str): Directory to serve.
+        port (int): Port to listen on.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it.
+    """
+    handler = functools.partial(QuietHandler, directory=public_dir)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def try_rebuild(rebuild, changed=None):
+    """Run a rebuild, printing the error instead of raising it.
+
+    Args:
+        rebuild: A callable taking the set of changed paths (None for a first build).
+        changed (Optional[set]): The changed paths.
+
+    Returns:
+        bool: True if the rebuild succeeded.
+    """
+    try:
+        rebuild(changed)
+    except Exception as e:
+        print(f"Rebuild failed: {e}")
+        return False
+    return True
+
+def watch(watcher, rebuild):
+    """Rebuild whenever watched files change, reporting the latency of each rebuild.
+
+    Build errors are printed and the loop carries on, so a broken page can be
+    fixed without restarting the server.
+
+    Args:
+        watcher (Watcher): The watcher to wait on.
+        rebuild: A callable taking the set of changed paths.
+    """
+    while True:
+        changed = watcher.wait_for_changes()
+        names = ", ".join(sorted(os.path.basename(path) for path in changed)[:5])
+        if len(changed) > 5:
+            names += ", ..."
+        start = time.perf_counter()
+        if not try_rebuild(rebuild, changed):
+            continue
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Rebuilt in {elapsed_ms:.1f} ms after {len(changed)} change(s): {names}")
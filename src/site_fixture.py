@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+import tempfile
+
+import main
+
+class SiteFixture:
+    """Test mixin that sets up a throwaway project and builds it.
+
+    setUp creates a temporary directory laid out like the real project
+    (static/, content/, docs/, .cache/ and template.html, written from
+    TEMPLATE). Mix it in ahead of unittest.TestCase, and call super() when
+    overriding setUp or build.
+    """
+    TEMPLATE = "<title>{{ Title }}</title>{{ Content }}"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.static_dir = os.path.join(root, "static")
+        self.public_dir = os.path.join(root, "docs")
+        self.content_dir = os.path.join(root, "content")
+        self.cache_dir = os.path.join(root, ".cache")
+        self.template_path = os.path.join(root, "template.html")
+        os.makedirs(self.static_dir)
+        self.write(self.template_path, self.TEMPLATE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        """Write a file, creating its directories. Relative paths start at the project root (e.g. "content/index.md")."""
+        path = os.path.join(self.tmp.name, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read_output(self, rel_path):
+        """Return the text of a file in the public directory."""
+        with open(os.path.join(self.public_dir, rel_path)) as f:
+            return f.read()
+
+    def build(self, options=None, basepath="/", public_dir=None):
+        """Run generate_site over the project without printing its progress.
+
+        Args:
+            options (Optional[main.BuildOptions]): How to build; a full build when None.
+            basepath (str): URL prefix the site is served from.
+            public_dir (Optional[str]): Where to build instead of self.public_dir.
+
+        Returns:
+            str: Everything the build printed.
+        """
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main.generate_site(self.static_dir, public_dir or self.public_dir, self.template_path, self.content_dir,
+                               basepath, options)
+        return output.getvalue()
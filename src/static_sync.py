@@ -0,0 +1,238 @@
+import contextlib
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from fingerprint import fingerprinted_name, should_fingerprint
+from manifest import entry_outputs, hash_file, remove_empty_dirs
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; reflinks are skipped there
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl that clones a file's extents (btrfs, XFS, bcachefs)
+COPY_WORKERS = 8
+FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.EPERM}
+
+def scan_static(from_dir):
+    """List every file under the static directory with its stat result.
+
+    Uses os.scandir so file types come from the directory listing itself
+    instead of a separate isdir/isfile call per entry.
+
+    Args:
+        from_dir (str): The static directory.
+
+    Returns:
+        list[tuple[str, str, os.stat_result]]: (relative path, full path, stat)
+        for each file, in a stable order.
+    """
+    files = []
+    pending = [("", from_dir)]
+    while pending:
+        rel_dir, path = pending.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name)
+                if entry.is_dir():
+                    pending.append((rel_path, entry.path))
+                elif entry.is_file():
+                    files.append((rel_path, entry.path, entry.stat()))
+                else:
+                    raise Exception(f"{entry.path} is neither a file nor a directory, or it does not exist.")
+    files.sort()
+    return files
+
+def is_up_to_date(src_stat, dest_path, checksum=False, src_path=None):
+    """Check whether a destination file already matches its source.
+
+    Like rsync's quick check, matching size and modification time mean the
+    file is unchanged. With checksum, files whose mtime differs but whose
+    contents are identical (e.g. after a fresh git checkout) also count as
+    up to date, and get the source mtime so the quick check passes next time.
+
+    Args:
+        src_stat (os.stat_result): Stat of the source file.
+        dest_path (str): Path of the destination file.
+        checksum (bool): Fall back to comparing content hashes.
+        src_path (Optional[str]): Source path, required when checksum is True.
+
+    Returns:
+        bool: True if the destination doesn't need to be copied.
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    if dest_stat.st_size != src_stat.st_size:
+        return False
+    if dest_stat.st_mtime_ns == src_stat.st_mtime_ns:
+        return True
+    if checksum and hash_file(src_path) == hash_file(dest_path):
+        os.utime(dest_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        return True
+    return False
+
+def copy_file(src_path, dest_path, src_stat, mode="auto"):
+    """Copy one file using the cheapest mechanism the filesystem supports.
+
+    The file is written under a temporary name and renamed into place, so a
+    reader never sees a half-copied asset. In "hardlink" mode the destination
+    shares the source's inode (falling back to a copy across devices). In
+    "auto" mode a reflink is tried first, then copy_file_range, then
+    sendfile, then a plain read/write copy. The source mtime is preserved so
+    the next sync's quick check can skip the file.
+
+    Args:
+        src_path (str): The file to copy.
+        dest_path (str): Where to copy it.
+        src_stat (os.stat_result): Stat of the source file.
+        mode (str): "auto" or "hardlink".
+
+    Returns:
+        str: The mechanism that was used (e.g. "reflink", "copy_file_range").
+    """
+    tmp_path = f"{dest_path}.tmp-{os.getpid()}"
+    if mode == "hardlink":
+        try:
+            os.link(src_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            return "hardlink"
+        except OSError:
+            # Different filesystem, or links unsupported - copy instead. If the link was made but
+            # couldn't replace dest_path, drop it first: copying through it would truncate the source.
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+    try:
+        with open(src_path, "rb") as src, open(tmp_path, "wb") as dest:
+            method = copy_contents(src, dest, src_stat.st_size)
+        os.utime(tmp_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return method
+
+def copy_contents(src, dest, size):
+    """Copy an open file's bytes into another, preferring zero-copy syscalls.
+
+    Args:
+        src: The source file, opened for binary reading.
+        dest: The destination file, opened for binary writing.
+        size (int): Number of bytes to copy.
+
+    Returns:
+        str: The mechanism that was used.
+    """
+    src_fd, dest_fd = src.fileno(), dest.fileno()
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(dest_fd, FICLONE, src_fd)
+            return "reflink"
+        except OSError:
+            pass
+    for name in ("copy_file_range", "sendfile"):
+        if not hasattr(os, name):
+            continue
+        try:
+            copied = 0
+            while copied < size:
+                if name == "copy_file_range":
+                    sent = os.copy_file_range(src_fd, dest_fd, size - copied)
+                else:
+                    sent = os.sendfile(dest_fd, src_fd, copied, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            if copied == size:
+                return name
+        except OSError as e:
+            if e.errno not in FALLBACK_ERRNOS:
+                raise
+        os.lseek(src_fd, 0, os.SEEK_SET)  # Start over with the next mechanism
+        os.lseek(dest_fd, 0, os.SEEK_SET)
+        os.ftruncate(dest_fd, 0)
+    shutil.copyfileobj(src, dest)
+    return "read/write"
+
+def sync_static(from_dir, to_dir, previous, current, mode="auto", checksum=False, workers=COPY_WORKERS, fingerprint=()):
+    """Bring the static files in the public directory in line with the static directory.
+
+    Files whose destination already matches (see is_up_to_date) are skipped,
+    the rest are copied on a thread pool (the copy syscalls release the GIL),
+    and files that were synced by the previous build but no longer exist in
+    the static directory (or now have a different output name) are deleted.
+
+    Files matching a fingerprint pattern are also published under a
+    content-hashed name (see fingerprinted_name), recorded as the entry's
+    "fingerprinted" output, so they can be cached indefinitely. Their hash is
+    kept in the entry and reused while size and mtime match. The plain name
+    stays published too: only pages and the template are rewritten to the
+    hashed names, so url() references in stylesheets, srcset attributes and
+    scripts still load the plain file.
+
+    Args:
+        from_dir (str): Source directory (static).
+        to_dir (str): Destination directory (public).
+        previous (dict): Static manifest entries from the previous build.
+        current (dict): Static manifest entries for this build, filled in place.
+        mode (str): "auto" or "hardlink", see copy_file.
+        checksum (bool): Compare content hashes when size matches but mtime doesn't.
+        workers (int): Number of copy threads.
+        fingerprint (tuple[str]): Glob patterns of file names to fingerprint.
+
+    Returns:
+        dict: Counts of "copied", "unchanged", "removed" and "failed" output
+        files, plus the relative output paths that were copied
+        ("copied_paths") and removed ("removed_paths").
+    """
+    stats = {"copied": 0, "unchanged": 0, "removed": 0, "failed": 0, "copied_paths": [], "removed_paths": []}
+    to_copy = []
+    for rel_path, src_path, src_stat in scan_static(from_dir):
+        entry = {"size": src_stat.st_size, "mtime_ns": src_stat.st_mtime_ns, "output": rel_path}
+        if fingerprint and should_fingerprint(rel_path, fingerprint):
+            old_entry = previous.get(rel_path, {})
+            if "hash" in old_entry and (old_entry["size"], old_entry["mtime_ns"]) == (entry["size"], entry["mtime_ns"]):
+                entry["hash"] = old_entry["hash"]
+            else:
+                entry["hash"] = hash_file(src_path)
+            entry["fingerprinted"] = fingerprinted_name(rel_path, entry["hash"])
+        current[rel_path] = entry
+        for output in entry_outputs(entry):
+            dest_path = os.path.join(to_dir, output)
+            if is_up_to_date(src_stat, dest_path, checksum, src_path):
+                stats["unchanged"] += 1
+            else:
+                to_copy.append((rel_path, output, src_path, dest_path, src_stat))
+
+    for dest_dir in {os.path.dirname(dest_path) for _, _, _, dest_path, _ in to_copy}:
+        os.makedirs(dest_dir, exist_ok=True)  # Once per directory, not once per file
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [(rel_path, output, src_path, executor.submit(copy_file, src_path, dest_path, src_stat, mode))
+                   for rel_path, output, src_path, dest_path, src_stat in to_copy]
+        for rel_path, output, src_path, future in futures:
+            try:
+                future.result()
+                stats["copied"] += 1
+                stats["copied_paths"].append(output)
+            except Exception as e:
+                print(f"Error copying file {src_path} : {e}")
+                stats["failed"] += 1
+                current.pop(rel_path, None)
+
+    published = {output for entry in current.values() for output in entry_outputs(entry)}
+    for entry in previous.values():
+        for output in entry_outputs(entry):
+            if output in published:
+                continue
+            dest_path = os.path.join(to_dir, output)
+            try:
+                os.remove(dest_path)
+            except FileNotFoundError:
+                continue
+            stats["removed"] += 1
+            stats["removed_paths"].append(output)
+            remove_empty_dirs(os.path.dirname(dest_path), to_dir)
+    return stats
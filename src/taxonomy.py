@@ -0,0 +1,204 @@
+import hashlib
+import html
+import json
+import os
+import re
+from htmlnode import LeafNode, ParentNode
+from template import rewrite_url
+from writer import AtomicFile
+
+LISTING_SECTION = "blog/"  # Content under here is listed, tagged and archived
+PAGE_SIZE = 10             # Posts per listing page
+TAGS_DIR = "tags"
+ARCHIVE_DIR = "archive"
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+def slugify(text):
+    """Turn a tag into a URL path segment (e.g. "Middle-earth Lore" -> "middle-earth-lore")."""
+    return SLUG_PATTERN.sub("-", text.lower()).strip("-") or "tag"
+
+def tag_slugs(tags):
+    """Give each tag its own URL path segment, numbering tags whose slugs collide.
+
+    Tags are taken in sorted order, so the same set of tags always gets the
+    same slugs.
+
+    Example:
+        tag_slugs(["C", "C++", "Elves"])
+        # => {"C": "c", "C++": "c-2", "Elves": "elves"}
+    """
+    slugs, taken = {}, set()
+    for tag in sorted(tags):
+        base = slug = slugify(tag)
+        number = 1
+        while slug in taken:
+            number += 1
+            slug = f"{base}-{number}"
+        slugs[tag] = slug
+        taken.add(slug)
+    return slugs
+
+def listing_path(base, number):
+    """Return the output path of page `number` of a listing rooted at `base` (e.g. "blog/page/2/index.html")."""
+    return f"{base}index.html" if number == 1 else f"{base}page/{number}/index.html"
+
+def page_url(output):
+    """Return the root-relative URL of an output, as a directory URL for index pages."""
+    path = output.replace(os.sep, "/")
+    return "/" + (path[:-len("index.html")] if path.endswith("index.html") else path)
+
+def paginate(base, title, posts, page_size):
+    """Split one listing's posts (already in order) into pages linked to each other."""
+    count = max(1, -(-len(posts) // page_size))
+    return [{
+        "output": listing_path(base, number),
+        "title": title if number == 1 else f"{title} (page {number})",
+        "members": posts[(number - 1) * page_size:number * page_size],
+        "prev": listing_path(base, number - 1) if number > 1 else None,
+        "next": listing_path(base, number + 1) if number < count else None,
+    } for number in range(1, count + 1)]
+
+def collect_listings(posts, page_size=PAGE_SIZE):
+    """Group posts into the blog listing, per-tag listings and per-year archives.
+
+    The posts are sorted once, newest first, and dealt into every listing
+    they belong to in that one pass, so each listing comes out already in
+    order and the work grows with posts + listing pages rather than their
+    product.
+
+    Args:
+        posts (list[dict]): One dict per post with "output", "title",
+            "date" (ISO string or None) and "tags".
+        page_size (int): Posts per listing page, at least 1.
+
+    Returns:
+        list[dict]: Listing pages, each with "output", "title", "members"
+        (the posts on that page), and "prev"/"next" output paths or None.
+
+    Example:
+        collect_listings([{"output": "blog/tom/index.html", "title": "Tom", "date": "2024-05-01", "tags": ["songs"]}])
+        # => [{"output": "blog/index.html", ...}, {"output": "tags/songs/index.html", ...},
+        #     {"output": "archive/2024/index.html", ...}]
+    """
+    if page_size < 1:
+        raise ValueError(f"Listing page size must be at least 1, got {page_size}")
+    ordered = sorted(posts, key=lambda post: (post["date"] or "", post["output"]), reverse=True)
+    tags, years = {}, {}
+    for post in ordered:
+        for tag in post["tags"]:
+            tags.setdefault(tag, []).append(post)
+        if post["date"]:
+            years.setdefault(post["date"][:4], []).append(post)
+    listings = paginate(LISTING_SECTION, "Blog", ordered, page_size)
+    slugs = tag_slugs(tags)
+    for tag in sorted(tags):
+        listings += paginate(f"{TAGS_DIR}/{slugs[tag]}/", f"Posts tagged {tag}", tags[tag], page_size)
+    for year in sorted(years, reverse=True):
+        listings += paginate(f"{ARCHIVE_DIR}/{year}/", f"Archive: {year}", years[year], page_size)
+    return listings
+
+def listing_signature(listing, template_version, basepath):
+    """Fingerprint everything a listing page is rendered from, so unchanged pages can be skipped."""
+    members = [(post["output"], post["title"], post["date"]) for post in listing["members"]]
+    data = [listing["title"], listing["prev"], listing["next"], members, template_version, basepath]
+    return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+def render_listing(listing, template, basepath):
+    """Render a listing page through the page template.
+
+    Returns:
+        str: The HTML page.
+    """
+    def link(output, text):
+        return LeafNode("a", text, {"href": rewrite_url(page_url(output), basepath)})
+
+    items = []
+    for post in listing["members"]:
+        children = [link(post["output"], html.escape(post["title"]))]
+        if post["date"]:
+            date = html.escape(post["date"], quote=True)  # props_to_html doesn't escape attribute values
+            children.append(LeafNode("time", date, {"datetime": date}))
+        items.append(ParentNode("li", children))
+    children = [LeafNode("h1", html.escape(listing["title"]))]
+    children.append(ParentNode("ul", items) if items else LeafNode("p", "Nothing here yet."))
+    nav = [link(listing[key], label) for key, label in (("prev", "Newer posts"), ("next", "Older posts")) if listing[key]]
+    if nav:
+        children.append(ParentNode("nav", nav))
+    content = ParentNode("div", children).to_html()
+    return template.render(Title=html.escape(listing["title"]), Content=content)
+
+def write_listings(public_dir, listings, template, basepath, template_version, previous):
+    """Write the listing pages whose membership (or template) changed.
+
+    Each page's signature (see listing_signature) is compared with the one
+    recorded by the previous build; a page whose signature matches and whose
+    file still exists isn't rendered at all.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        listings (list[dict]): From collect_listings.
+        template (Template): The compiled page template.
+        basepath (str): URL prefix the site is served from.
+        template_version (str): Hash identifying the template (and its assets).
+        previous (dict): The "generated" section of the previous manifest.
+
+    Returns:
+        dict: "entries" to record in the manifest's "generated" section,
+        the "changed" output paths, and counts of pages "rendered" and
+        "unchanged".
+    """
+    stats = {"entries": {}, "changed": [], "rendered": 0, "unchanged": 0}
+    for listing in listings:
+        output = listing["output"]
+        signature = listing_signature(listing, template_version, basepath)
+        stats["entries"][output] = {"output": output, "signature": signature}
+        path = os.path.join(public_dir, output)
+        if previous.get(output, {}).get("signature") == signature and os.path.exists(path):
+            stats["unchanged"] += 1
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        page = AtomicFile(path)
+        with page as f:
+            f.write(render_listing(listing, template, basepath))
+        stats["rendered"] += 1
+        if page.changed:
+            stats["changed"].append(output)
+    return stats
+
+def generate_listings(public_dir, manifest, previous, metadata_index, template, template_version, page_size=PAGE_SIZE):
+    """Write the blog listing, tag and archive pages for the posts in a build's manifest.
+
+    The posts are the manifest's pages under LISTING_SECTION, with their
+    titles, dates and tags taken from the MetadataIndex. A listing page that
+    would overwrite a content page is skipped.
+
+    Args:
+        public_dir (str): Path to the public output directory.
+        manifest (dict): This build's manifest; the listing pages are added
+            to its "generated" section.
+        previous (dict): The previous build's manifest.
+        metadata_index (MetadataIndex): Front matter of every content file.
+        template (Template): The compiled page template.
+        template_version (str): Hash identifying the template (and its assets).
+        page_size (int): Posts per listing page.
+
+    Returns:
+        dict: As write_listings.
+    """
+    posts = []
+    for rel_path, entry in sorted(manifest["pages"].items()):
+        if rel_path.replace(os.sep, "/").startswith(LISTING_SECTION):
+            metadata = metadata_index.get(rel_path)
+            posts.append({"output": entry["output"], "title": metadata["title"] or rel_path,
+                          "date": metadata["date"], "tags": metadata["tags"]})
+    page_outputs = {entry["output"] for entry in manifest["pages"].values()}
+    listings = []
+    for listing in collect_listings(posts, page_size):
+        if listing["output"] in page_outputs:
+            print(f"Skipping listing {listing['output']}: a content page already writes it")
+        else:
+            listings.append(listing)
+    stats = write_listings(public_dir, listings, template, template.basepath, template_version, previous.get("generated", {}))
+    manifest["generated"].update(stats["entries"])
+    print(f"Listings: {len(posts)} posts on {len(listings)} pages, {stats['rendered']} rendered, {stats['unchanged']} unchanged")
+    return stats
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import re
+
+SLOT_PATTERN = re.compile(r"\{\{ (\w+) \}\}")         # {{ Title }}, {{ Content }}
+ROOT_URL_PATTERN = re.compile(r'(href|src)="(/[^"]*)"')  # Root-relative URLs that need the basepath
+
+def asset_digest(asset_urls):
+    """Return a short digest of a fingerprinted asset mapping, "" for none, for cache keys."""
+    if not asset_urls:
+        return ""
+    return hashlib.sha256(json.dumps(asset_urls, sort_keys=True).encode()).hexdigest()[:16]
+
+def rewrite_url(url, basepath, asset_urls=None):
+    """Prefix a root-relative URL with the basepath the site is served from.
+
+    URLs of fingerprinted assets are also pointed at the asset's
+    content-hashed name, keeping any query string or fragment.
+
+    Args:
+        url (str): The URL as written in the source (e.g. "/images/tom.png").
+        basepath (str): URL prefix ending in "/" (e.g. "/static-site-generator/").
+        asset_urls (Optional[dict]): Site path to fingerprinted site path, using
+            "/" separators (e.g. {"index.css": "index.3f2a1b9c0d.css"}).
+
+    Returns:
+        str: The rewritten URL. URLs that don't start with "/" are unchanged.
+
+    Example:
+        rewrite_url("/images/tom.png", "/static-site-generator/")
+        # => "/static-site-generator/images/tom.png"
+    """
+    if not url.startswith("/"):
+        return url
+    if asset_urls:
+        path, separator, suffix = url[1:].partition("?") if "?" in url else url[1:].partition("#")
+        fingerprinted = asset_urls.get(path)
+        if fingerprinted is not None:
+            url = f"/{fingerprinted}{separator}{suffix}"
+    if basepath == "/":
+        return url
+    return basepath + url[1:]
+
+class Template:
+    def __init__(self, text: str, basepath: str = "/", asset_urls: dict = None):
+        """Compile template text into literal segments and named slots.
+
+        Root-relative href/src attributes in the template are rewritten for the
+        basepath (and fingerprinted asset names) once, here, so rendering a
+        page is a single join.
+
+        Args:
+            text (str): The raw template (e.g. the contents of template.html).
+            basepath (str): URL prefix the site is served from.
+            asset_urls (Optional[dict]): Fingerprinted asset names (see
+                rewrite_url), applied to the template and to every page
+                rendered through it.
+
+        Example:
+            template = Template("<title>{{ Title }}</title>{{ Content }}")
+            template.render(Title="Home", Content="<p>Hi</p>")
+            # => "<title>Home</title><p>Hi</p>"
+        """
+        self.basepath = basepath
+        self.asset_urls = dict(asset_urls or {})
+        self.asset_digest = asset_digest(self.asset_urls)
+        text = ROOT_URL_PATTERN.sub(lambda m: f'{m.group(1)}="{rewrite_url(m.group(2), basepath, self.asset_urls)}"', text)
+        parts = SLOT_PATTERN.split(text)
+        self.literals = parts[0::2]  # Always one more literal than slots
+        self.slots = parts[1::2]
+
+    @classmethod
+    def from_file(cls, path, basepath="/", asset_urls=None):
+        """Read and compile a template file.
+
+        Args:
+            path (str): Path to the template file.
+            basepath (str): URL prefix the site is served from.
+            asset_urls (Optional[dict]): Fingerprinted asset names.
+
+        Returns:
+            Template: The compiled template.
+        """
+        with open(path) as t:
+            return cls(t.read(), basepath, asset_urls)
+
+    def __repr__(self):
+        return f"Template(slots: {self.slots}, basepath: {self.basepath})"
+
+    def render(self, **values):
+        """Fill the slots and return the finished document.
+
+        Slots without a value are left in the output as written.
+
+        Args:
+            **values: Slot name to replacement text (e.g. Title="Home").
+
+        Returns:
+            str: The rendered document.
+        """
+        parts = [self.literals[0]]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            parts.append(values.get(slot, f"{{{{ {slot} }}}}"))
+            parts.append(literal)
+        return "".join(parts)
+
+    def write(self, write, **values):
+        """Stream the rendered document through `write` instead of building it.
+
+        A slot value may be a string or a callable that takes `write` and
+        produces the slot's content itself, so page content can be streamed
+        straight from the markdown.
+
+        Args:
+            write: A callable taking a string, e.g. an open file's write method.
+            **values: Slot name to replacement text or content-writing callable.
+
+        Example:
+            template.write(f.write, Title="Home", Content=node.write_html)
+        """
+        write(self.literals[0])
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            value = values.get(slot, f"{{{{ {slot} }}}}")
+            if callable(value):
+                value(write)
+            else:
+                write(value)
+            write(literal)
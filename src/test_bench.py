@@ -0,0 +1,36 @@
+import json
+import unittest
+from bench import SHAPES, generate_corpus, run_benchmarks, bench_memory
+from block_markdown import extract_title
+from markdown_to_html import markdown_to_html_node
+
+class TestBench(unittest.TestCase):
+    def test_every_shape_renders(self):
+        for shape in SHAPES:
+            corpus = generate_corpus(3, shape, 10)
+            self.assertEqual(len(corpus), 3)
+            for markdown in corpus.values():
+                self.assertTrue(extract_title(markdown).startswith("Page "))
+                self.assertTrue(markdown_to_html_node(markdown).to_html().startswith("<div><h1>"))
+
+    def test_unknown_shape_raises(self):
+        with self.assertRaises(ValueError):
+            generate_corpus(1, "tables", 10)
+
+    def test_report_is_json_with_every_stage(self):
+        report = run_benchmarks(pages=2, shape="mixed", size=5, repeat=1, inline=False)
+        json.dumps(report)
+        self.assertEqual(report["corpus"]["pages"], 2)
+        for stage in ("markdown_to_blocks", "block_to_block_type", "text_to_textnodes", "to_html",
+                      "in_memory_build", "file_write", "file_read", "static_copy", "full_build"):
+            self.assertIn(stage, report["stages"])
+            self.assertGreaterEqual(report["stages"][stage]["seconds"], 0)
+
+    def test_slotted_nodes_use_less_memory(self):
+        memory = bench_memory(generate_corpus(2, "mixed", 10))
+        for name in ("html_nodes", "text_nodes"):
+            self.assertGreater(memory[name]["count"], 0)
+            self.assertLess(memory[name]["slotted_bytes"], memory[name]["dict_bytes"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from block_markdown import block_to_block_type, BlockType
+from block_markdown import block_to_block_type, classify_block, block_lines, BlockType
 
 class TestBlockToBlockType(unittest.TestCase):
     def test_heading(self):
@@ -30,5 +30,23 @@ class TestBlockToBlockType(unittest.TestCase):
         md = "This is just some text, not a list or heading."
         self.assertEqual(block_to_block_type(md), BlockType.PARAGRAPH)
 
+class TestClassifyBlock(unittest.TestCase):
+    def test_strips_syntax(self):
+        self.assertEqual(classify_block("### Title"), (BlockType.HEADING, ["Title"]))
+        self.assertEqual(classify_block("```\ncode\n```"), (BlockType.CODE, ["code\n"]))
+        self.assertEqual(classify_block("> one\n>two"), (BlockType.QUOTE, ["one", "two"]))
+        self.assertEqual(classify_block("- a\n- b"), (BlockType.UNORDERED, ["a", "b"]))
+        self.assertEqual(classify_block("1. a\n2. b. c"), (BlockType.ORDERED, ["a", "b. c"]))
+        self.assertEqual(classify_block("plain\ntext"), (BlockType.PARAGRAPH, ["plain", "text"]))
+
+    def test_near_misses_are_paragraphs(self):
+        for md in ("####### Seven", "#NoSpace", "- a\n-b", "1. a\n3. b", "1. a\n02. b", "10. x", "```inline```", ""):
+            self.assertEqual(classify_block(md)[0], BlockType.PARAGRAPH, md)
+
+    def test_block_lines_for_known_type(self):
+        self.assertEqual(block_lines("- a\n- b", BlockType.UNORDERED), ["a", "b"])
+        with self.assertRaises(ValueError):
+            block_lines("just text", BlockType.ORDERED)
+
 if __name__ == "__main__":
     unittest.main()
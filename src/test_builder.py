@@ -0,0 +1,51 @@
+import io
+import unittest
+
+from builder import Site
+from render_cache import RenderCache
+from search_index import TermCollector
+
+TEMPLATE = '<title>{{ Title }}</title><a href="/">home</a>{{ Content }}'
+
+class TestSite(unittest.TestCase):
+    def test_build_maps_output_paths_to_pages(self):
+        pages = Site(TEMPLATE).build({"index.md": "# Home\n\nWelcome", "blog/tom/index.md": "# Tom\n\n- [Home](/)"})
+        self.assertEqual(sorted(pages), ["blog/tom/index.html", "index.html"])
+        self.assertEqual(pages["index.html"], '<title>Home</title><a href="/">home</a><div><h1>Home</h1><p>Welcome</p></div>')
+
+    def test_basepath_applies_to_template_and_content(self):
+        html = Site(TEMPLATE, "/site/").render("# Tom\n\n[Home](/)")
+        self.assertIn('<a href="/site/">home</a>', html)
+        self.assertIn('<a href="/site/">Home</a>', html)
+
+    def test_pages_is_lazy_and_accepts_pairs(self):
+        pages = Site(TEMPLATE).pages((f"p{i}.md", f"# Page {i}") for i in range(3))
+        self.assertEqual(next(pages)[0], "p0.html")
+        self.assertEqual([path for path, _ in pages], ["p1.html", "p2.html"])
+
+    def test_sites_do_not_share_render_state(self):
+        cache = RenderCache()
+        fingerprinted = Site(TEMPLATE, cache=cache, collector=TermCollector(), asset_urls={"tom.png": "tom.0123456789.png"})
+        plain = Site(TEMPLATE, cache=cache)
+        markdown = "# Tom\n\n![Tom](/tom.png)"
+        for _ in range(2):  # The second round is served from the shared block cache
+            self.assertIn('src="/tom.0123456789.png"', fingerprinted.render(markdown))
+            self.assertIn('src="/tom.png"', plain.render(markdown))
+        self.assertIsNot(fingerprinted.memo, plain.memo)
+        self.assertIsNone(plain.collector)
+        self.assertIn("tom", fingerprinted.collector.take())
+
+    def test_render_stream_matches_render(self):
+        markdown = "# Big\n\n" + "\n\n".join(f"Paragraph **{i}**" for i in range(50))
+        site = Site(TEMPLATE)
+        out = io.StringIO()
+        site.render_stream(io.StringIO(markdown), out.write)
+        self.assertEqual(out.getvalue(), site.render(markdown))
+
+    def test_errors_propagate(self):
+        with self.assertRaises(Exception):
+            Site(TEMPLATE).build({"index.md": "No title here"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import contextlib
+import gzip
+import io
+import os
+import unittest
+from unittest import mock
+
+import compress
+from compress import compress_outputs
+from site_fixture import SiteFixture
+
+class TestCompressOutputs(SiteFixture, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("docs/index.html", "<p>Tom Bombadil</p>" * 100)
+        self.write("docs/index.css", "body {}")
+        self.write("docs/images/tom.png", "png" * 1000)
+
+    def compress_all(self):
+        with contextlib.redirect_stdout(io.StringIO()), mock.patch("compress.brotli", None):
+            return compress_outputs(self.public_dir, ["index.html", "index.css", "images/tom.png"])
+
+    def test_only_large_text_files_get_siblings(self):
+        stats = self.compress_all()
+        self.assertEqual(stats["siblings"], ["index.html.gz"])
+        with gzip.open(os.path.join(self.public_dir, "index.html.gz"), "rt") as f:
+            self.assertEqual(f.read(), "<p>Tom Bombadil</p>" * 100)
+
+    def test_up_to_date_siblings_are_skipped(self):
+        self.compress_all()
+        with mock.patch("compress.encode") as encode:
+            stats = self.compress_all()
+        encode.assert_not_called()
+        self.assertEqual((stats["compressed"], stats["unchanged"]), (0, 1))
+
+    def test_changed_file_is_recompressed(self):
+        self.compress_all()
+        self.write("docs/index.html", "<p>Goldberry</p>" * 100)
+        os.utime(os.path.join(self.public_dir, "index.html"), ns=(0, 0))
+        self.assertEqual(self.compress_all()["written_paths"], ["index.html.gz"])
+        with gzip.open(os.path.join(self.public_dir, "index.html.gz"), "rt") as f:
+            self.assertIn("Goldberry", f.read())
+
+    def test_file_below_threshold_loses_its_sibling(self):
+        self.compress_all()
+        self.write("docs/index.html", "<p>tiny</p>")
+        self.assertEqual(self.compress_all()["siblings"], [])
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "index.html.gz")))
+
+    @unittest.skipIf(compress.brotli is None, "brotli is not installed")
+    def test_brotli_sibling(self):
+        stats = compress_outputs(self.public_dir, ["index.html"])
+        self.assertEqual(stats["siblings"], ["index.html.gz", "index.html.br"])
+
+
+if __name__ == "__main__":
+    unittest.main()
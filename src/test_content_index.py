@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from content_index import ContentIndex
+
+class TestContentIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content_dir = os.path.join(self.tmp.name, "content")
+        self.cache_dir = os.path.join(self.tmp.name, ".cache")
+        self.write("index.md", "# Home")
+        self.write("blog/tom/index.md", "# Tom")
+        self.write("blog/tom/notes.txt", "not markdown")
+        self.write("drafts/wip/index.md", "# WIP")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, text, mtime_ns=1_000_000_000):
+        path = os.path.join(self.content_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        os.utime(path, ns=(mtime_ns, mtime_ns))  # Older than any scan, so the index trusts it
+
+    def rescan(self, **kwargs):
+        index = ContentIndex.load(self.cache_dir, self.content_dir, **kwargs).scan()
+        index.save(self.cache_dir)
+        return index
+
+    def test_indexes_markdown_only(self):
+        index = self.rescan()
+        self.assertEqual(list(index), ["blog/tom/index.md", "drafts/wip/index.md", "index.md"])
+        entry = index.get("blog/tom/index.md")
+        self.assertEqual(entry["output"], "blog/tom/index.html")
+        self.assertEqual(entry["size"], 5)
+
+    def test_exclude_prunes_directories(self):
+        index = self.rescan(exclude=("drafts",))
+        self.assertNotIn("drafts/wip/index.md", index)
+        self.assertEqual(index.glob("blog/*"), ["blog/tom/index.md"])
+
+    def test_unchanged_files_are_not_rehashed(self):
+        self.rescan()
+        index = self.rescan()
+        self.assertEqual(index.stats["files_hashed"], 0)
+        self.assertEqual(index.stats["files_reused"], 3)
+
+    def test_modified_file_is_rehashed(self):
+        before = self.rescan().get("index.md")["hash"]
+        self.write("index.md", "# Home page", mtime_ns=2_000_000_000)
+        index = self.rescan()
+        self.assertEqual(index.stats["files_hashed"], 1)
+        self.assertNotEqual(index.get("index.md")["hash"], before)
+
+    def test_added_and_removed_files(self):
+        self.rescan()
+        os.remove(os.path.join(self.content_dir, "drafts/wip/index.md"))
+        self.write("blog/majesty/index.md", "# Majesty")
+        index = self.rescan()
+        self.assertEqual(list(index), ["blog/majesty/index.md", "blog/tom/index.md", "index.md"])
+
+    def test_different_patterns_discard_saved_index(self):
+        self.rescan()
+        index = ContentIndex.load(self.cache_dir, self.content_dir, include=("*.txt",))
+        self.assertEqual(len(index), 0)
+        self.assertEqual(list(index.scan()), ["blog/tom/notes.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import unittest
+
+from depgraph import DependencyGraph, explain_rebuild, markdown_references, template_references
+
+ENTRY = {"source": "s1", "template": "t1", "basepath": "/", "output": "index.html", "references": ["images/tom.png"]}
+
+class TestReferences(unittest.TestCase):
+    def test_markdown_references(self):
+        markdown = io.StringIO("# Tom\n\n![Tom](/images/tom.png) and [home](/)\n"
+                               "[blog](/blog/tom#top) [elsewhere](https://example.com) ![again](/images/tom.png)\n")
+        self.assertEqual(markdown_references(markdown), ["blog/tom", "images/tom.png"])
+
+    def test_template_references(self):
+        text = '<link href="/index.css" rel="stylesheet"><a href="/">Home</a><img src="/images/logo.png?v=1">'
+        self.assertEqual(template_references(text), ["images/logo.png", "index.css"])
+
+class TestExplainRebuild(unittest.TestCase):
+    def test_up_to_date(self):
+        self.assertEqual(explain_rebuild(ENTRY, dict(ENTRY), True), [])
+
+    def test_reasons(self):
+        self.assertEqual(explain_rebuild(None, ENTRY, False), ["new page"])
+        self.assertEqual(explain_rebuild(ENTRY, dict(ENTRY), False), ["output missing"])
+        changed = dict(ENTRY, source="s2", basepath="/site/", references=[])
+        self.assertEqual(explain_rebuild(ENTRY, changed, True), ["source changed", "basepath changed from / to /site/"])
+
+    def test_referenced_asset_changes_are_reported_on_their_own(self):
+        old = dict(ENTRY, assets={"images/tom.png": "images/tom.0123456789.png"})
+        new = dict(old, assets={"images/tom.png": "images/tom.9876543210.png"})
+        self.assertEqual(explain_rebuild(old, new, True), ["referenced files changed: images/tom.png"])
+        self.assertEqual(explain_rebuild(old, dict(new, source="s2"), True),
+                         ["source changed", "referenced files changed: images/tom.png"])
+        self.assertEqual(explain_rebuild(old, dict(old, source="s2", references=[], assets={}), True), ["source changed"])
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph({
+            "pages": {"index.md": ENTRY, "blog/tom/index.md": dict(ENTRY, references=[])},
+            "static": {},
+            "template": {"hash": "t1", "references": ["index.css"]},
+        })
+
+    def test_dependents(self):
+        self.assertEqual(self.graph.dependents("images/tom.png"), ["index.md"])
+        self.assertEqual(self.graph.dependents("blog/tom/index.md"), ["blog/tom/index.md"])
+        self.assertEqual(self.graph.dependents("index.css"), ["blog/tom/index.md", "index.md"])
+        self.assertEqual(self.graph.dependents("template"), ["blog/tom/index.md", "index.md"])
+        self.assertEqual(self.graph.dependents("images/unused.png"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
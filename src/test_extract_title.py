@@ -1,5 +1,6 @@
+import io
 import unittest
-from block_markdown import extract_title
+from block_markdown import extract_title, read_title
 
 class TestExtractTitle(unittest.TestCase):
     def test_basic_title(self):
@@ -41,5 +42,14 @@ class TestExtractTitle(unittest.TestCase):
         md = "# "
         self.assertEqual(extract_title(md), "")
 
+    def test_read_title_from_stream(self):
+        stream = io.StringIO("Intro\n\n# Streamed Title\n\n" + "body " * 100000)
+        self.assertEqual(read_title(stream), "Streamed Title")
+        self.assertLess(stream.tell(), 100000)
+
+    def test_read_title_missing_raises(self):
+        with self.assertRaises(Exception):
+            read_title(io.StringIO("No\n\ntitle"))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+import main
+from feeds import page_url, read_summary, write_feeds
+from site_fixture import SiteFixture
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+class TestMetadata(unittest.TestCase):
+    def test_page_url_uses_directory_urls(self):
+        self.assertEqual(page_url("https://example.com/", "/site/", "blog/tom/index.html"), "https://example.com/site/blog/tom/")
+        self.assertEqual(page_url("https://example.com", "/", "index.html"), "https://example.com/")
+
+    def test_summary_skips_navigation_and_formatting(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.md")
+            with open(path, "w") as f:
+                f.write("# Tom\n\n[< Back Home](/)\n\n![Tom](/tom.png)\n\nOld **Tom** is [merry](/merry).\n\nMore text")
+            self.assertEqual(read_summary(path), "Old Tom is merry.")
+
+class TestWriteFeeds(unittest.TestCase):
+    def test_one_pass_writes_all_three_files(self):
+        pages = [
+            {"source": "blog/tom/index.md", "output": "blog/tom/index.html", "title": "Tom & Goldberry",
+             "date": None, "mtime_ns": 1_700_000_000 * 10 ** 9, "summary": "Old Tom <3"},
+            {"source": "index.md", "output": "index.html", "title": "Home", "date": None, "mtime_ns": 0, "summary": ""},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = write_feeds(tmp, pages, "https://example.com", "/", "Fan Club")
+            self.assertEqual((stats["pages"], stats["entries"]), (2, 1))
+            sitemap = ET.parse(os.path.join(tmp, "sitemap.xml")).getroot()
+            self.assertEqual([loc.text for loc in sitemap.iter(f"{SITEMAP}loc")],
+                             ["https://example.com/blog/tom/", "https://example.com/"])
+            feed = ET.parse(os.path.join(tmp, "atom.xml")).getroot()
+            entry = feed.find(f"{ATOM}entry")
+            self.assertEqual(entry.find(f"{ATOM}title").text, "Tom & Goldberry")
+            self.assertEqual(entry.find(f"{ATOM}updated").text, "2023-11-14T22:13:20Z")
+            with open(os.path.join(tmp, "pages.json")) as f:
+                self.assertEqual([page["title"] for page in json.load(f)], ["Tom & Goldberry", "Home"])
+
+    def test_feed_updated_is_the_newest_entry(self):
+        pages = [
+            {"source": "blog/old/index.md", "output": "blog/old/index.html", "title": "Old", "date": None,
+             "mtime_ns": 1_700_000_000 * 10 ** 9},
+            {"source": "blog/new/index.md", "output": "blog/new/index.html", "title": "New", "date": "2030-01-01",
+             "mtime_ns": 0},
+            {"source": "index.md", "output": "index.html", "title": "Home", "date": "2040-01-01", "mtime_ns": 0},
+        ]
+        summarized = []
+        with tempfile.TemporaryDirectory() as tmp:
+            write_feeds(tmp, pages, "https://example.com", summarize=lambda page: summarized.append(page["title"]) or "")
+            feed = ET.parse(os.path.join(tmp, "atom.xml")).getroot()
+        self.assertEqual(feed.find(f"{ATOM}updated").text, "2030-01-01T00:00:00Z")
+        self.assertEqual(summarized, ["Old", "New", "Home"])
+
+class TestFeedsBuild(SiteFixture, unittest.TestCase):
+    def test_build_writes_and_keeps_feeds(self):
+        self.write("content/index.md", "# Fan Club\n\nWelcome")
+        self.write("content/blog/tom/index.md", "# Tom\n\nOld Tom")
+        for incremental in (False, True, False):
+            self.build(main.BuildOptions(incremental=incremental, site_url="https://example.com"))
+            feed = ET.parse(os.path.join(self.public_dir, "atom.xml")).getroot()
+            self.assertEqual(feed.find(f"{ATOM}title").text, "Fan Club")
+            self.assertEqual(feed.find(f"{ATOM}entry/{ATOM}summary").text, "Old Tom")
+
+    def test_page_that_fails_keeps_its_entry_without_a_summary(self):
+        self.write("content/index.md", "# Fan Club\n\nWelcome")
+        self.write("content/blog/tom/index.md", "# Tom\n\nOld Tom")
+        options = main.BuildOptions(incremental=True, site_url="https://example.com")
+        self.build(options)
+        self.write("content/blog/tom/index.md", "# Tom\n\nOld _Tom")
+        with self.assertRaises(Exception) as raised:
+            self.build(options)
+        self.assertIn("1 page(s) failed to generate: blog/tom/index.md", str(raised.exception))
+        feed = ET.parse(os.path.join(self.public_dir, "atom.xml")).getroot()
+        self.assertEqual(feed.find(f"{ATOM}entry/{ATOM}title").text, "Tom")
+        self.assertIsNone(feed.find(f"{ATOM}entry/{ATOM}summary").text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import contextlib
+import io
+import json
+import os
+import unittest
+from unittest import mock
+
+import main
+from fingerprint import DEFAULT_PATTERNS, asset_urls, fingerprinted_name
+from site_fixture import SiteFixture
+from static_sync import sync_static
+from template import Template, rewrite_url
+
+TEMPLATE = '<html><link href="/index.css"><title>{{ Title }}</title><body>{{ Content }}</body></html>'
+
+class TestFingerprintedName(unittest.TestCase):
+    def test_hash_goes_before_extension(self):
+        self.assertEqual(fingerprinted_name("images/tom.png", "0123456789abcdef"), "images/tom.0123456789.png")
+
+    def test_asset_urls_skips_plain_files(self):
+        entries = {"index.css": {"output": "index.css", "fingerprinted": "index.0123456789.css"},
+                   "robots.txt": {"output": "robots.txt"}}
+        self.assertEqual(asset_urls(entries), {"index.css": "index.0123456789.css"})
+
+class TestRewriteAssetUrls(unittest.TestCase):
+    def test_rewrites_known_assets_and_keeps_suffix(self):
+        asset_urls = {"images/tom.png": "images/tom.0123456789.png"}
+        self.assertEqual(rewrite_url("/images/tom.png#top", "/site/", asset_urls), "/site/images/tom.0123456789.png#top")
+        self.assertEqual(rewrite_url("/images/other.png", "/", asset_urls), "/images/other.png")
+
+    def test_template_urls_are_rewritten_once(self):
+        template = Template(TEMPLATE, "/site/", {"index.css": "index.0123456789.css"})
+        self.assertIn('href="/site/index.0123456789.css"', template.render(Title="t", Content="c"))
+
+class TestFingerprintBuild(SiteFixture, unittest.TestCase):
+    TEMPLATE = TEMPLATE
+
+    def setUp(self):
+        super().setUp()
+        self.write("static/index.css", "body {}")
+        self.write("static/images/tom.png", "tom")
+        self.write("content/index.md", "# Home\n\nWelcome")
+        self.write("content/tom/index.md", "# Tom\n\n![Tom](/images/tom.png)")
+
+    def build(self, fingerprint=DEFAULT_PATTERNS, incremental=True):
+        with mock.patch("main.generate_page", wraps=main.generate_page) as generate_page:
+            super().build(main.BuildOptions(incremental=incremental, fingerprint=fingerprint))
+        return sorted(os.path.relpath(call.args[0], self.content_dir) for call in generate_page.call_args_list)
+
+    def test_pages_point_at_fingerprinted_assets(self):
+        self.build()
+        mapping = json.loads(self.read_output("asset-manifest.json"))
+        self.assertEqual(sorted(mapping), ["images/tom.png", "index.css"])
+        self.assertIn(f'src="/{mapping["images/tom.png"]}"', self.read_output("tom/index.html"))
+        self.assertIn(f'href="/{mapping["index.css"]}"', self.read_output("index.html"))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, mapping["index.css"])))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.css")))  # For references the build can't rewrite
+
+    def test_changed_asset_rebuilds_only_its_pages(self):
+        self.build()
+        old_name = json.loads(self.read_output("asset-manifest.json"))["images/tom.png"]
+        self.write(os.path.join(self.static_dir, "images", "tom.png"), "a new tom")
+        self.assertEqual(self.build(), ["tom/index.md"])
+        new_name = json.loads(self.read_output("asset-manifest.json"))["images/tom.png"]
+        self.assertNotEqual(new_name, old_name)
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, old_name)))
+        self.assertIn(new_name, self.read_output("tom/index.html"))
+
+    def test_stylesheet_references_still_resolve(self):
+        self.write("static/index.css", "body { background: url(images/tom.png) }")
+        self.write("static/fonts/tom.woff2", "font")
+        self.write("static/fonts/fonts.css", '@font-face { src: url("/fonts/tom.woff2") }')
+        self.build()
+        mapping = json.loads(self.read_output("asset-manifest.json"))
+        stylesheet_dir = os.path.dirname(os.path.join(self.public_dir, mapping["index.css"]))
+        self.assertTrue(os.path.exists(os.path.join(stylesheet_dir, "images", "tom.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "fonts", "tom.woff2")))
+        self.write("static/images/tom.png", "a new tom")
+        self.build()
+        self.assertEqual(self.read_output("images/tom.png"), "a new tom")
+
+    def test_changed_stylesheet_rebuilds_every_page(self):
+        self.build()
+        self.write(os.path.join(self.static_dir, "index.css"), "body { margin: 0 }")
+        self.assertEqual(self.build(), ["index.md", "tom/index.md"])
+
+    def test_turning_fingerprinting_off_restores_plain_names(self):
+        self.build()
+        self.assertEqual(self.build(fingerprint=()), ["index.md", "tom/index.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "asset-manifest.json")))
+        self.assertIn('href="/index.css"', self.read_output("index.html"))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.public_dir, "images"))), ["tom.png"])
+
+    def test_unchanged_assets_are_not_rehashed(self):
+        previous = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync_static(self.static_dir, self.public_dir, {}, previous, fingerprint=DEFAULT_PATTERNS)
+            with mock.patch("static_sync.hash_file") as hash_file:
+                sync_static(self.static_dir, self.public_dir, previous, {}, fingerprint=DEFAULT_PATTERNS)
+        hash_file.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
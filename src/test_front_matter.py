@@ -0,0 +1,128 @@
+import io
+import os
+import tempfile
+import unittest
+
+import main
+from builder import Site
+from content_index import ContentIndex
+from feeds import read_summary
+from front_matter import MetadataIndex, parse_yaml, read_front_matter, split_front_matter
+from site_fixture import SiteFixture
+
+POST = """---
+title: "Tom: a Mistake?"
+date: 2024-05-01
+tags: [songs, hobbits]
+draft: no
+---
+# Why Tom Bombadil Was a Mistake
+
+Old Tom is merry.
+"""
+
+class TestParsing(unittest.TestCase):
+    def test_yaml_subset(self):
+        metadata = parse_yaml(["title: Tom", "count: 3", "tags:", "  - elves", "  - 'songs'", "# comment", "draft: true"])
+        self.assertEqual(metadata, {"title": "Tom", "count": 3, "tags": ["elves", "songs"], "draft": True})
+
+    def test_yaml_rejects_nested_mappings(self):
+        with self.assertRaises(ValueError):
+            parse_yaml(["author:", "  name: Tolkien"])
+
+    def test_toml(self):
+        metadata, body = split_front_matter('+++\ntitle = "Tom"\ndate = 2024-05-01\ntags = ["songs"]\n+++\n# Tom')
+        self.assertEqual(metadata, {"title": "Tom", "date": "2024-05-01", "tags": ["songs"]})
+        self.assertEqual(body, "# Tom")
+
+    def test_header_only_is_read(self):
+        stream = io.StringIO(POST)
+        metadata, body_start = read_front_matter(stream)
+        self.assertEqual(metadata, {"title": "Tom: a Mistake?", "date": "2024-05-01", "tags": ["songs", "hobbits"],
+                                    "draft": False})
+        self.assertEqual(stream.tell(), body_start)
+        self.assertTrue(stream.read().startswith("# Why Tom"))
+
+    def test_scalar_titles_become_strings(self):
+        self.assertEqual(split_front_matter("---\ntitle: 2024\nsummary: yes\n---\n")[0], {"title": "2024", "summary": "True"})
+        self.assertEqual(split_front_matter("+++\ntitle = 2024\n+++\n")[0], {"title": "2024"})
+        html = Site("<title>{{ Title }}</title>{{ Content }}").render("---\ntitle: 2024\n---\n# Year in review")
+        self.assertTrue(html.startswith("<title>2024</title>"))
+
+    def test_no_front_matter(self):
+        self.assertEqual(split_front_matter("# Tom\n\n---\n"), ({}, "# Tom\n\n---\n"))
+
+    def test_unclosed_front_matter_raises(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ntitle: Tom\n# Tom")
+
+class TestRendering(unittest.TestCase):
+    def test_front_matter_is_not_rendered_and_sets_title(self):
+        site = Site("<title>{{ Title }}</title>{{ Content }}")
+        html = site.render(POST)
+        self.assertTrue(html.startswith("<title>Tom: a Mistake?</title><div><h1>"))
+        self.assertNotIn("draft", html)
+        out = io.StringIO()
+        site.render_stream(io.StringIO(POST), out.write)
+        self.assertEqual(out.getvalue(), html)
+
+    def test_feed_summary_skips_front_matter_or_comes_from_it(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.md")
+            with open(path, "w") as f:
+                f.write(POST)
+            self.assertEqual(read_summary(path), "Old Tom is merry.")
+            with open(path, "w") as f:
+                f.write(POST.replace("draft: no", "summary: A song"))
+            self.assertEqual(read_summary(path), "A song")
+
+class TestMetadataIndex(SiteFixture, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("content/blog/tom/index.md", POST)
+        self.write("content/blog/wip/index.md", "---\ndate: 2025-01-01\ntags: hobbits\ndraft: true\n---\n# WIP")
+        self.write("content/index.md", "# Home\n\nWelcome")
+
+    def index(self):
+        index = MetadataIndex.load(self.cache_dir).update(ContentIndex(self.content_dir).scan(), self.content_dir)
+        index.save(self.cache_dir)
+        return index
+
+    def test_titles_tags_and_drafts(self):
+        index = self.index()
+        self.assertEqual(index.get("index.md")["title"], "Home")
+        self.assertEqual(index.get("blog/wip/index.md")["title"], "WIP")
+        self.assertEqual(index.drafts(), ["blog/wip/index.md"])
+        self.assertEqual(index.select(tag="hobbits"), ["blog/tom/index.md"])
+        self.assertEqual(index.select(tag="hobbits", drafts=True, newest_first=True), ["blog/wip/index.md", "blog/tom/index.md"])
+
+    def test_unchanged_files_are_not_read_again(self):
+        self.index()
+        self.write("content/index.md", "# Home page")
+        index = self.index()
+        self.assertEqual(index.stats, {"files_read": 1, "files_reused": 2})
+
+    def test_build_skips_drafts(self):
+        for drafts in (True, False):
+            self.build(main.BuildOptions(incremental=True, drafts=drafts))
+            self.assertEqual(os.path.exists(os.path.join(self.public_dir, "blog", "wip", "index.html")), drafts)
+
+    def test_unreadable_front_matter_is_recorded_per_file(self):
+        self.write("content/blog/broken/index.md", "---\ntitle: Never closed\n# Broken")
+        index = self.index()
+        self.assertEqual(list(index.errors()), ["blog/broken/index.md"])
+        self.assertIn("never closed", index.get("blog/broken/index.md")["error"])
+        self.assertEqual(index.get("index.md")["title"], "Home")
+
+    def test_build_reports_unreadable_front_matter_and_renders_the_rest(self):
+        self.write("content/blog/broken/index.md", "---\ntitle: Never closed\n# Broken")
+        with self.assertRaises(Exception) as raised:
+            self.build()
+        self.assertIn("1 page(s) failed to generate: blog/broken/index.md", str(raised.exception))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "blog", "tom", "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "blog", "broken", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 from htmlnode import HTMLNode, LeafNode, ParentNode
 
@@ -64,6 +65,13 @@ class TestLeafNode(unittest.TestCase):
         node = LeafNode(None, "Just text, no tag")
         self.assertEqual(node.to_html(), "Just text, no tag")
 
+    def test_leaf_is_slotted(self):
+        node = LeafNode("b", "bold")
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertIsNone(node.children)
+        with self.assertRaises(AttributeError):
+            node.extra = True
+
 class TestParentNode(unittest.TestCase):
     def test_to_html_with_children(self):
         child_node = LeafNode("span", "child")
@@ -104,5 +112,34 @@ class TestParentNode(unittest.TestCase):
             node = ParentNode("div", [])
             node.to_html()
 
+    def test_raises_error_for_invalid_grandchild(self):
+        with self.assertRaises(ValueError):
+            node = ParentNode("div", [ParentNode("ul", [LeafNode("li", None)])])
+            node.to_html()
+
+    def test_write_html_to_stream(self):
+        parent_node = ParentNode("ul", [LeafNode("li", "One"), ParentNode("li", [LeafNode("b", "Two")])])
+        stream = io.StringIO()
+        parent_node.write_html(stream.write)
+        self.assertEqual(stream.getvalue(), parent_node.to_html())
+        self.assertEqual(stream.getvalue(), "<ul><li>One</li><li><b>Two</b></li></ul>")
+
+    def test_to_html_deeply_nested(self):
+        node = LeafNode("b", "core")
+        for _ in range(200):
+            node = ParentNode("blockquote", [node])
+        self.assertEqual(node.to_html(), "<blockquote>" * 200 + "<b>core</b>" + "</blockquote>" * 200)
+
+    def test_to_html_long_list(self):
+        items = [LeafNode("li", str(i)) for i in range(5000)]
+        html = ParentNode("ul", items).to_html()
+        self.assertTrue(html.startswith("<ul><li>0</li><li>1</li>"))
+        self.assertTrue(html.endswith("<li>4999</li></ul>"))
+
+    def test_parent_is_slotted(self):
+        node = ParentNode("p", [LeafNode(None, "text")])
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertIsNone(node.value)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+import main
+from site_fixture import SiteFixture
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestIncrementalBuild(SiteFixture, unittest.TestCase):
+    TEMPLATE = TEMPLATE
+
+    def setUp(self):
+        super().setUp()
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home\n\nWelcome")
+        self.write("content/blog/tom/index.md", "# Tom\n\nBombadil")
+
+    def build(self, basepath="/", incremental=True, **kwargs):
+        with mock.patch("main.generate_page", wraps=main.generate_page) as generate_page:
+            super().build(main.BuildOptions(incremental=incremental, **kwargs), basepath)
+        return sorted(os.path.relpath(call.args[0], self.content_dir) for call in generate_page.call_args_list)
+
+    def test_first_build_renders_everything(self):
+        self.assertEqual(self.build(), ["blog/tom/index.md", "index.md"])
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.css")))
+
+    def test_unchanged_rebuild_renders_nothing(self):
+        self.build()
+        self.assertEqual(self.build(), [])
+
+    def test_only_changed_page_is_rerendered(self):
+        self.build()
+        self.write(os.path.join(self.content_dir, "blog", "tom", "index.md"), "# Tom\n\nA mistake")
+        self.assertEqual(self.build(), ["blog/tom/index.md"])
+        self.assertIn("A mistake", self.read_output("blog/tom/index.html"))
+
+    def test_template_change_rerenders_all_pages(self):
+        self.build()
+        self.write(self.template_path, TEMPLATE.replace("<body>", "<body class=\"x\">"))
+        self.assertEqual(self.build(), ["blog/tom/index.md", "index.md"])
+
+    def test_basepath_change_rerenders_all_pages(self):
+        self.build()
+        self.assertEqual(self.build(basepath="/site/"), ["blog/tom/index.md", "index.md"])
+
+    def test_missing_output_is_regenerated(self):
+        self.build()
+        os.remove(os.path.join(self.public_dir, "index.html"))
+        self.assertEqual(self.build(), ["index.md"])
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content_dir, "blog", "tom", "index.md"))
+        os.remove(os.path.join(self.static_dir, "index.css"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "blog")))
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "index.css")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.html")))
+
+    def test_full_build_writes_manifest_for_next_incremental(self):
+        self.build(incremental=False)
+        self.assertEqual(self.build(), [])
+
+    def test_full_build_removes_untracked_files(self):
+        self.build(incremental=False)
+        self.write(os.path.join(self.public_dir, "old", "leftover.html"), "stale")
+        self.build(incremental=False)
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "old")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.css")))
+
+    def test_identical_pages_are_not_rewritten(self):
+        self.build(incremental=False)
+        index_path = os.path.join(self.public_dir, "index.html")
+        os.utime(index_path, ns=(0, 0))
+        changes_path = os.path.join(self.tmp.name, "changes.json")
+        self.write(os.path.join(self.content_dir, "blog", "tom", "index.md"), "# Tom\n\nA mistake")
+        self.build(incremental=False, changes_path=changes_path)
+        self.assertEqual(os.stat(index_path).st_mtime_ns, 0)
+        with open(changes_path) as f:
+            self.assertEqual(json.load(f), {"changed": ["blog/tom/index.html"], "removed": []})
+
+    def test_failing_page_keeps_its_output_on_a_full_build(self):
+        self.build(incremental=False)
+        for broken in ("---\ntitle: Never closed\n# Tom", "# Tom\n\nOld _Tom"):
+            self.write("content/blog/tom/index.md", broken)
+            with self.assertRaises(Exception) as raised:
+                self.build(incremental=False)
+            self.assertIn("blog/tom/index.md", str(raised.exception))
+            self.assertIn("Bombadil", self.read_output("blog/tom/index.html"))
+
+    def test_caches_and_manifest_are_saved_under_unique_temporary_names(self):
+        names = ["content-index.json", "metadata-index.json", "render-cache.json", "search-terms.json"]
+        for name in names:  # Another build sharing .cache/ may be writing these right now
+            os.makedirs(os.path.join(self.cache_dir, name + ".tmp"))
+        os.makedirs(os.path.join(self.public_dir, ".manifest.json.tmp"))
+        self.build(cache_dir=self.cache_dir, search=True)
+        self.assertEqual(sorted(name for name in os.listdir(self.cache_dir) if not name.endswith(".tmp")), names)
+        self.assertEqual(self.build(cache_dir=self.cache_dir, search=True), [])
+
+    def test_compressed_siblings_follow_their_pages(self):
+        self.write(os.path.join(self.content_dir, "blog", "tom", "index.md"), "# Tom\n\n" + "Old Tom Bombadil " * 100)
+        self.build(compress=True)
+        sibling = os.path.join(self.public_dir, "blog", "tom", "index.html.gz")
+        self.assertTrue(os.path.exists(sibling))
+        self.build(incremental=False, compress=True)
+        self.assertTrue(os.path.exists(sibling))
+        os.remove(os.path.join(self.content_dir, "blog", "tom", "index.md"))
+        self.build(compress=True)
+        self.assertFalse(os.path.exists(sibling))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import main
+from instrument import Instrumentation, NullInstrumentation
+
+class TestInstrumentation(unittest.TestCase):
+    def test_stage_and_page_timings(self):
+        instrument = Instrumentation()
+        with instrument.stage("render"):
+            with instrument.stage("inner"):
+                pass
+        instrument.page("index.md", 0.25)
+        instrument.count("pages_rendered", 2)
+        self.assertEqual(set(instrument.stage_seconds), {"render", "inner"})
+        self.assertEqual([event["name"] for event in instrument.events], ["inner", "render", "index.md"])
+        summary = instrument.summary()
+        self.assertIn("render", summary)
+        self.assertIn("index.md", summary)
+        self.assertIn("pages_rendered: 2", summary)
+
+    def test_tracemalloc_records_peak_memory(self):
+        instrument = Instrumentation(trace_memory=True)
+        instrument.start()
+        with instrument.stage("allocate"):
+            data = [str(i) for i in range(10000)]
+        instrument.stop()
+        self.assertGreater(instrument.stage_memory["allocate"], 0)
+        self.assertEqual(len(data), 10000)
+
+    def test_write_trace(self):
+        instrument = Instrumentation()
+        with instrument.stage("render"):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            instrument.write_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        self.assertEqual(trace["traceEvents"][0]["ph"], "X")
+        self.assertEqual(trace["traceEvents"][0]["name"], "render")
+
+    def test_null_instrumentation_records_nothing(self):
+        instrument = NullInstrumentation()
+        with instrument.stage("render"):
+            instrument.page("index.md", 1.0)
+        self.assertEqual(instrument.events, [])
+        self.assertEqual(instrument.page_seconds, {})
+
+    def test_generate_site_records_stages_and_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            static_dir = os.path.join(tmp, "static")
+            content_dir = os.path.join(tmp, "content")
+            template_path = os.path.join(tmp, "template.html")
+            os.makedirs(static_dir)
+            os.makedirs(content_dir)
+            with open(template_path, "w") as f:
+                f.write("{{ Title }}{{ Content }}")
+            with open(os.path.join(content_dir, "index.md"), "w") as f:
+                f.write("# Home")
+            instrument = Instrumentation()
+            with contextlib.redirect_stdout(io.StringIO()):
+                main.generate_site(static_dir, os.path.join(tmp, "docs"), template_path, content_dir, "/", instrument=instrument)
+        self.assertIn("render", instrument.stage_seconds)
+        self.assertIn("static_copy", instrument.stage_seconds)
+        self.assertEqual(list(instrument.page_seconds), ["index.md"])
+        self.assertEqual(instrument.counters["pages_rendered"], 1)
+
+    def test_failed_build_still_writes_the_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profile_path = os.path.join(tmp, "build.prof")
+            os.makedirs(os.path.join(tmp, "static"))
+            instrument = Instrumentation(profile_path=profile_path)
+            with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(FileNotFoundError):
+                main.generate_site(os.path.join(tmp, "static"), os.path.join(tmp, "docs"), os.path.join(tmp, "missing.html"),
+                                   os.path.join(tmp, "content"), "/", instrument=instrument)
+            self.assertTrue(os.path.exists(profile_path))
+            self.assertIn("cumulative", instrument.summary())
+
+    def test_summary_without_profile_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            instrument = Instrumentation(profile_path=os.path.join(tmp, "build.prof"))
+            instrument.start()
+            try:
+                instrument.summary()  # The stats file isn't written until stop()
+            finally:
+                instrument.profiler.disable()
+
+if __name__ == "__main__":
+    unittest.main()
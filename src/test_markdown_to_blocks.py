@@ -1,5 +1,6 @@
+import io
 import unittest
-from block_markdown import markdown_to_blocks
+from block_markdown import markdown_to_blocks, read_blocks, read_raw_blocks, split_raw_blocks
 
 class TestMarkdownToBlocks(unittest.TestCase):
 
@@ -51,3 +52,34 @@ This is the same paragraph on a new line
 
     def test_only_whitespace_string(self):
         self.assertEqual(markdown_to_blocks("   \n  \n"), [])
+
+class TestReadBlocks(unittest.TestCase):
+    SAMPLES = [
+        "",
+        "one block",
+        "a\n\nb",
+        "a\n\n\nb\n\n\n\nc",
+        "\n\n# Title\n\ntext\nmore\n\n- x\n- y\n",
+        "trailing\n\n",
+        "   \n  \n",
+        "```\ncode\n\nwith blank\n```",
+    ]
+
+    def test_raw_blocks_match_split_for_any_chunk_size(self):
+        for md in self.SAMPLES:
+            for chunk_size in (1, 2, 3, 7, 65536):
+                self.assertEqual(list(read_raw_blocks(io.StringIO(md), chunk_size)), md.split("\n\n"), (md, chunk_size))
+
+    def test_split_raw_blocks_matches_split(self):
+        for md in self.SAMPLES:
+            self.assertEqual(list(split_raw_blocks(md)), md.split("\n\n"))
+
+    def test_read_blocks_matches_markdown_to_blocks(self):
+        for md in self.SAMPLES:
+            self.assertEqual(list(read_blocks(io.StringIO(md), 4)), markdown_to_blocks(md))
+
+    def test_read_blocks_is_lazy(self):
+        stream = io.StringIO("first\n\n" + "x" * 100000)
+        blocks = read_blocks(stream, chunk_size=16)
+        self.assertEqual(next(blocks), "first")
+        self.assertLess(stream.tell(), 100)
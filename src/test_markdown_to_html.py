@@ -1,5 +1,13 @@
+import io
+import os
+import tempfile
 import unittest
-from markdown_to_html import markdown_to_html_node
+from unittest import mock
+import main
+from builder import Site
+from block_markdown import read_blocks
+from markdown_to_html import markdown_to_html_node, write_markdown_html
+from template import Template
 
 class TestMarkdownToBlocks(unittest.TestCase):
 
@@ -98,3 +106,37 @@ Paragraph with **bold**, _italic_, and `code`.
             html,
             "<div><h1>Title</h1><p>Paragraph with <b>bold</b>, <i>italic</i>, and <code>code</code>.</p><ul><li>List item with a <a href=\"https://example.com\">link</a></li><li>Another with <img src=\"image.png\" alt=\"alt\"></li></ul></div>",
         )
+
+class TestStreamingRender(unittest.TestCase):
+    MARKDOWN = """# Title
+
+Paragraph with **bold** and a [link](/blog/tom).
+
+- one
+- two
+
+```
+code
+```
+"""
+
+    def test_write_markdown_html_matches_to_html(self):
+        stream = io.StringIO()
+        write_markdown_html(read_blocks(io.StringIO(self.MARKDOWN), 8), stream.write, "/site/")
+        self.assertEqual(stream.getvalue(), markdown_to_html_node(self.MARKDOWN, "/site/").to_html())
+
+    def test_write_markdown_html_empty_raises(self):
+        with self.assertRaises(ValueError):
+            write_markdown_html(iter([]), io.StringIO().write)
+
+    def test_large_files_are_streamed_to_the_same_page(self):
+        template = Template('<title>{{ Title }}</title><a href="/">home</a>{{ Content }}', "/site/")
+        with tempfile.TemporaryDirectory() as tmp:
+            md_path = os.path.join(tmp, "index.md")
+            with open(md_path, "w") as f:
+                f.write(self.MARKDOWN)
+            with mock.patch("main.stream_page", wraps=main.stream_page) as stream_page, mock.patch("main.STREAM_THRESHOLD", 0):
+                main.write_page(md_path, Site(template), os.path.join(tmp, "out", "index.html"))
+            self.assertEqual(stream_page.call_count, 1)
+            with open(os.path.join(tmp, "out", "index.html")) as f:
+                self.assertEqual(f.read(), main.render_page(self.MARKDOWN, template))
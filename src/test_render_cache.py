@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from htmlnode import LeafNode
+from render_cache import LRUCache, RenderCache, InlineMemo, CACHE_FILE, NODE_BYTES
+from markdown_to_html import markdown_to_html_node
+
+MARKDOWN = "# Title\n\nSome **bold** text with a [link](/blog)\n\n- one\n- two"
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = LRUCache(100)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", "value")
+        self.assertEqual(cache.get("a"), "value")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = LRUCache(10)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")  # "b" is now the oldest
+        cache.put("c", "cccc")
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.size, 8)
+
+    def test_replacing_value_updates_size(self):
+        cache = LRUCache(100)
+        cache.put("a", "aaaa")
+        cache.put("a", "aa")
+        self.assertEqual(cache.size, 2)
+
+class TestInlineMemo(unittest.TestCase):
+    def test_repeated_fragments_render_once(self):
+        markdown = "# Nav\n\n- [Home](/)\n- [Blog](/blog)\n\n" * 3
+        expected = markdown_to_html_node(markdown, "/site/").to_html()
+        memo = InlineMemo()
+        self.assertEqual(markdown_to_html_node(markdown, "/site/", memo=memo).to_html(), expected)
+        self.assertEqual((memo.hits, memo.misses), (6, 3))
+        self.assertEqual(memo.take_stats(), (6, 3))
+        self.assertEqual(memo.hit_rate(), 0.0)
+
+    def test_basepath_is_part_of_the_key(self):
+        memo = InlineMemo()
+        self.assertIn('href="/a/x"', markdown_to_html_node("[x](/x)", "/a/", memo=memo).to_html())
+        self.assertIn('href="/b/x"', markdown_to_html_node("[x](/x)", "/b/", memo=memo).to_html())
+
+    def test_long_fragments_and_size_cap(self):
+        memo = InlineMemo(max_bytes=2 * NODE_BYTES, max_fragment=10)
+        markdown_to_html_node("a paragraph longer than ten characters", memo=memo)
+        self.assertEqual(len(memo), 0)
+        memo.put(("/", "12345"), (LeafNode(None, "1234567890"),))
+        memo.put(("/", "abcde"), (LeafNode(None, "abcdefghij"),))
+        self.assertEqual(list(memo.entries), [("/", "abcde")])
+        self.assertEqual(memo.size, 5 + NODE_BYTES + 10)
+
+class TestRenderCache(unittest.TestCase):
+    def test_cached_render_matches_uncached(self):
+        cache = RenderCache()
+        expected = markdown_to_html_node(MARKDOWN, "/site/").to_html()
+        self.assertEqual(markdown_to_html_node(MARKDOWN, "/site/", cache).to_html(), expected)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(markdown_to_html_node(MARKDOWN, "/site/", cache).to_html(), expected)
+        self.assertEqual(cache.hits, 3)
+
+    def test_key_depends_on_basepath_and_version(self):
+        cache = RenderCache(version="a" * 16)
+        other = RenderCache(version="b" * 16)
+        self.assertNotEqual(cache.key("[x](/y)", "/"), cache.key("[x](/y)", "/site/"))
+        self.assertNotEqual(cache.key("text", "/"), other.key("text", "/"))
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = RenderCache()
+            markdown_to_html_node(MARKDOWN, "/", cache)
+            cache.save(tmp)
+            loaded = RenderCache.load(tmp)
+            self.assertEqual(loaded.entries, cache.entries)
+
+    def test_renderer_change_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = RenderCache()
+            markdown_to_html_node(MARKDOWN, "/", cache)
+            cache.save(tmp)
+            with open(os.path.join(tmp, CACHE_FILE)) as f:
+                data = json.load(f)
+            data["version"] = "0" * 16
+            with open(os.path.join(tmp, CACHE_FILE), "w") as f:
+                json.dump(data, f)
+            self.assertEqual(len(RenderCache.load(tmp)), 0)
+
+    def test_drain_and_merge(self):
+        worker = RenderCache()
+        worker.put("k1", ["<p>1</p>", {"one": 1}])
+        worker.get("k1")
+        parent = RenderCache(version=worker.version)
+        parent.merge(worker.drain())
+        self.assertEqual(parent.entries["k1"], ["<p>1</p>", {"one": 1}])
+        self.assertEqual(worker.drain(), ([], {}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import unittest
+
+import main
+from render_pool import run_jobs, chunk_size
+from site_fixture import SiteFixture
+
+class TestRunJobs(unittest.TestCase):
+    def test_serial_results_in_order(self):
+        results = list(run_jobs(divmod, [(7, 2), (9, 4)]))
+        self.assertEqual(results, [((3, 1), None), ((2, 1), None)])
+
+    def test_parallel_results_in_order(self):
+        tasks = [(i, 3) for i in range(50)]
+        results = list(run_jobs(divmod, tasks, jobs=4))
+        self.assertEqual(results, [(divmod(i, 3), None) for i in range(50)])
+
+    def test_error_does_not_abort_other_tasks(self):
+        results = list(run_jobs(divmod, [(1, 0), (4, 2), (5, 0)], jobs=2))
+        self.assertIsNone(results[0][0])
+        self.assertTrue(results[0][1].startswith("ZeroDivisionError"))
+        self.assertEqual(results[1], ((2, 0), None))
+        self.assertTrue(results[2][1].startswith("ZeroDivisionError"))
+
+    def test_chunk_size(self):
+        self.assertEqual(chunk_size(1000, 4), 62)
+        self.assertEqual(chunk_size(3, 8), 1)
+
+class TestParallelBuild(SiteFixture, unittest.TestCase):
+    TEMPLATE = '<title>{{ Title }}</title><a href="/">home</a>{{ Content }}'
+
+    def setUp(self):
+        super().setUp()
+        for i in range(12):
+            self.write(f"content/page{i}/index.md", f"# Page {i}\n\nSee [home](/) and **item {i}**")
+
+    def build(self, public_name, jobs):
+        public_dir = os.path.join(self.tmp.name, public_name)
+        super().build(main.BuildOptions(jobs=jobs), "/site/", public_dir)
+        return public_dir
+
+    def read_outputs(self, public_dir):
+        outputs = {}
+        for dirpath, _, filenames in os.walk(public_dir):
+            for name in filenames:
+                if name.endswith(".html"):
+                    path = os.path.join(dirpath, name)
+                    with open(path) as f:
+                        outputs[os.path.relpath(path, public_dir)] = f.read()
+        return outputs
+
+    def test_parallel_output_matches_serial(self):
+        serial_dir = self.build("serial", jobs=1)
+        parallel_dir = self.build("parallel", jobs=4)
+        self.assertEqual(len(self.read_outputs(serial_dir)), 12)
+        self.assertEqual(self.read_outputs(serial_dir), self.read_outputs(parallel_dir))
+
+    def test_failing_page_is_reported_and_others_written(self):
+        self.write("content/broken/index.md", "No title here")
+        with self.assertRaises(Exception) as raised:
+            self.build("parallel", jobs=4)
+        self.assertIn("broken/index.md", str(raised.exception))
+        public_dir = os.path.join(self.tmp.name, "parallel")
+        self.assertEqual(len(self.read_outputs(public_dir)), 12)
+
+class TestCommandLine(unittest.TestCase):
+    def test_jobs_does_not_swallow_basepath(self):
+        for argv in (["-j", "4", "/static-site-generator/"], ["/static-site-generator/", "-j", "4"]):
+            args = main.build_parser().parse_args(argv)
+            self.assertEqual((args.jobs, args.basepath), (4, "/static-site-generator/"))
+
+if __name__ == "__main__":
+    unittest.main()
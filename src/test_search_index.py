@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+import search_index
+from htmlnode import LeafNode, ParentNode
+from markdown_to_html import markdown_to_html_node
+from render_cache import InlineMemo, RenderCache
+from search_index import (TermCollector, count_terms, decode_shard, decode_varint, encode_shard, encode_varint,
+                          node_text, write_search_index)
+from site_fixture import SiteFixture
+
+class TestEncoding(unittest.TestCase):
+    def test_varint_round_trip(self):
+        out = bytearray()
+        for value in (0, 127, 128, 300, 2 ** 32):
+            encode_varint(value, out)
+        pos, values = 0, []
+        while pos < len(out):
+            value, pos = decode_varint(out, pos)
+            values.append(value)
+        self.assertEqual(values, [0, 127, 128, 300, 2 ** 32])
+        self.assertEqual(len(out), 1 + 1 + 2 + 2 + 5)
+
+    def test_shard_round_trip(self):
+        postings = {"tom": [(0, 3), (7, 1), (300, 2)], "túrin": [(5, 1)]}
+        self.assertEqual(decode_shard(encode_shard(postings)), postings)
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            decode_shard(b"<html>")
+
+class TestTerms(unittest.TestCase):
+    def test_node_text_includes_alt_text(self):
+        node = ParentNode("div", [LeafNode("p", "Old Tom"), LeafNode("img", "", {"src": "/tom.png", "alt": "Bombadil"})])
+        self.assertEqual(count_terms(node_text(node)), {"old": 1, "tom": 1, "bombadil": 1})
+
+    def test_cached_and_memoized_blocks_give_the_same_terms(self):
+        markdown = "![Bombadil portrait](/x.png)\n\nOld Tom <elf> merry\n\n- ![Goldberry](/g.png) sings"
+        cache, memo = RenderCache(), InlineMemo()
+        terms = []
+        for _ in range(3):  # Cold, then served from the render cache, then from the inline memo only
+            collector = TermCollector()
+            markdown_to_html_node(markdown, cache=cache if len(terms) < 2 else None, memo=memo, collector=collector)
+            terms.append(collector.take())
+        self.assertEqual(cache.hits, 3)
+        self.assertGreater(memo.hits, 0)
+        self.assertEqual(terms[0], {"bombadil": 1, "portrait": 1, "old": 1, "tom": 1, "elf": 1, "merry": 1, "goldberry": 1, "sings": 1})
+        self.assertEqual(terms[1], terms[0])
+        self.assertEqual(terms[2], terms[0])
+
+    def test_cache_entries_without_terms_are_rendered_again(self):
+        cache = RenderCache()
+        markdown_to_html_node("![Bombadil portrait](/x.png)", cache=cache)
+        collector = TermCollector()
+        markdown_to_html_node("![Bombadil portrait](/x.png)", cache=cache, collector=collector)
+        self.assertEqual(collector.take(), {"bombadil": 1, "portrait": 1})
+
+    def test_collector_sees_every_rendered_block(self):
+        collector = TermCollector()
+        markdown_to_html_node("# Tom\n\nTom is **merry**\n\n- a list item", collector=collector)
+        self.assertEqual(collector.take(), {"tom": 2, "is": 1, "merry": 1, "list": 1, "item": 1})
+        self.assertEqual(collector.take(), {})
+
+class TestWriteSearchIndex(unittest.TestCase):
+    def test_shards_by_first_character(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = write_search_index(tmp, [("index.html", "Home", {"tom": 1, "elves": 2}),
+                                             ("tom/index.html", "Tom", {"tom": 4})])
+            self.assertEqual(stats["outputs"], ["search/e.bin", "search/index.json", "search/t.bin"])
+            with open(os.path.join(tmp, "search", "t.bin"), "rb") as f:
+                self.assertEqual(decode_shard(f.read()), {"tom": [(0, 1), (1, 4)]})
+            with open(os.path.join(tmp, "search", "index.json")) as f:
+                self.assertEqual(json.load(f)["pages"], [["index.html", "Home"], ["tom/index.html", "Tom"]])
+            again = write_search_index(tmp, [("index.html", "Home", {"tom": 1, "elves": 2}),
+                                             ("tom/index.html", "Tom", {"tom": 4})])
+            self.assertEqual(again["changed"], [])
+
+class TestSearchBuild(SiteFixture, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("content/index.md", "# Home\n\nWelcome")
+        self.write("content/tom/index.md", "# Tom\n\nOld Tom Bombadil")
+
+    def build(self, incremental=True, search=True, cache=True):
+        with mock.patch("search_index.index_page", wraps=search_index.index_page) as index_page:
+            super().build(main.BuildOptions(incremental=incremental, cache_dir=self.cache_dir if cache else None,
+                                            search=search))
+        return index_page.call_count
+
+    def postings(self, term):
+        try:
+            with open(os.path.join(self.public_dir, "search", f"{term[0]}.bin"), "rb") as f:
+                return decode_shard(f.read()).get(term)
+        except FileNotFoundError:  # No term in the index starts with this letter
+            return None
+
+    def test_index_covers_every_page(self):
+        self.assertEqual(self.build(), 0)
+        self.assertEqual(self.postings("tom"), [(1, 2)])
+        self.assertEqual(self.postings("welcome"), [(0, 1)])
+
+    def test_unchanged_pages_reuse_saved_terms(self):
+        self.build()
+        self.write("content/index.md", "# Home\n\nWelcome, Tom")
+        self.assertEqual(self.build(), 0)
+        self.assertEqual(self.postings("tom"), [(0, 1), (1, 2)])
+
+    def test_failed_page_keeps_its_saved_terms_or_is_left_out(self):
+        for cache in (True, False):
+            self.build(incremental=False, cache=cache)
+            self.write("content/tom/index.md", "# Tom\n\nOld _Tom Tomcat")
+            with self.assertRaises(Exception) as raised:
+                self.build(cache=cache)
+            self.assertIn("tom/index.md", str(raised.exception))
+            self.assertIsNone(self.postings("tomcat"))
+            self.assertEqual(self.postings("tom"), [(1, 2)] if cache else None)
+            self.assertEqual(self.postings("welcome"), [(0, 1)])
+            self.write("content/tom/index.md", "# Tom\n\nOld Tom Bombadil")
+
+    def test_index_is_removed_with_the_option(self):
+        self.build()
+        self.build(search=False)
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "search")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import main
+from serve import Watcher, diff_snapshots, snapshot
+
+class TestSnapshots(unittest.TestCase):
+    def test_diff_added_removed_modified(self):
+        old = {"a.md": (1, 5), "b.md": (1, 5), "c.md": (1, 5)}
+        new = {"a.md": (1, 5), "b.md": (2, 5), "d.md": (1, 1)}
+        self.assertEqual(diff_snapshots(old, new), {"b.md", "c.md", "d.md"})
+
+    def test_snapshot_files_and_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "content", "blog"))
+            for path in ("content/blog/index.md", "template.html"):
+                with open(os.path.join(tmp, path), "w") as f:
+                    f.write("x")
+            files = snapshot([os.path.join(tmp, "content"), os.path.join(tmp, "template.html")])
+            self.assertEqual(sorted(os.path.relpath(p, tmp) for p in files), ["content/blog/index.md", "template.html"])
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.md")
+        self.write("# One")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text):
+        with open(self.path, "w") as f:
+            f.write(text)
+
+    def test_poll_reports_each_change_once(self):
+        watcher = Watcher([self.tmp.name])
+        self.assertEqual(watcher.poll(), set())
+        self.write("# Two, longer")
+        self.assertEqual(watcher.poll(), {self.path})
+        self.assertEqual(watcher.poll(), set())
+
+    def test_burst_of_saves_is_one_batch(self):
+        watcher = Watcher([self.tmp.name], interval=0.01, debounce=0.1)
+        other = os.path.join(self.tmp.name, "other.md")
+
+        def burst():
+            self.write("# Edit 1!")
+            time.sleep(0.03)
+            with open(other, "w") as f:
+                f.write("new")
+            time.sleep(0.03)
+            self.write("# Edit 2!!")
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        changed = watcher.wait_for_changes()
+        thread.join()
+        self.assertEqual(changed, {self.path, other})
+        self.assertEqual(watcher.poll(), set())
+
+class TestServeCommand(unittest.TestCase):
+    def test_builds_outside_docs_and_survives_a_broken_first_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("static", "docs", "template.html", "content", ".cache")]
+            os.makedirs(paths[0])
+            for rel_path, text in (("template.html", "{{ Title }}{{ Content }}"), ("content/index.md", "# Home"),
+                                   ("content/broken/index.md", "No title")):
+                os.makedirs(os.path.dirname(os.path.join(tmp, rel_path)), exist_ok=True)
+                with open(os.path.join(tmp, rel_path), "w") as f:
+                    f.write(text)
+            output = io.StringIO()
+            with mock.patch("main.project_paths", return_value=tuple(paths)), \
+                    mock.patch("main.start_server") as start_server, \
+                    mock.patch("main.Watcher"), mock.patch("main.watch", side_effect=KeyboardInterrupt), \
+                    contextlib.redirect_stdout(output):
+                main.serve_command(["--watch"])
+            serve_dir = os.path.join(tmp, ".cache", main.SERVE_DIR)
+            start_server.assert_called_once_with(serve_dir, 8888)
+            self.assertIn("Rebuild failed", output.getvalue())
+            self.assertTrue(os.path.exists(os.path.join(serve_dir, "index.html")))
+            self.assertFalse(os.path.exists(paths[1]))
+    def test_watch_rebuilds_share_one_warm_render_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("static", "docs", "template.html", "content", ".cache")]
+            os.makedirs(paths[0])
+            os.makedirs(paths[3])
+            with open(paths[2], "w") as f:
+                f.write("{{ Title }}{{ Content }}")
+            index_path = os.path.join(paths[3], "index.md")
+            cache_path = os.path.join(paths[4], "render-cache.json")
+            hits = []
+
+            def edit_twice(watcher, rebuild):
+                for text in ("# Home\n\nOne", "# Home\n\nOne\n\nTwo"):
+                    with open(index_path, "w") as f:
+                        f.write(text)
+                    rebuild({index_path})
+                    hits.append(cache.hits)
+                self.assertFalse(os.path.exists(cache_path))  # Kept in memory until the server stops
+                raise KeyboardInterrupt
+
+            with open(index_path, "w") as f:
+                f.write("# Home")
+            cache = main.RenderCache()
+            with mock.patch("main.project_paths", return_value=tuple(paths)), mock.patch("main.start_server"), \
+                    mock.patch("main.Watcher"), mock.patch("main.watch", side_effect=edit_twice), \
+                    mock.patch.object(main.RenderCache, "load", return_value=cache) as load, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                main.serve_command(["--watch"])
+            load.assert_called_once()
+            self.assertEqual(hits, [1, 3])
+            self.assertTrue(os.path.exists(cache_path))
+
+if __name__ == "__main__":
+    unittest.main()
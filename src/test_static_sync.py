@@ -0,0 +1,85 @@
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+import static_sync
+from site_fixture import SiteFixture
+from static_sync import sync_static, copy_file, scan_static
+
+class TestStaticSync(SiteFixture, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.public_dir)
+        self.write("static/index.css", "body {}")
+        self.write("static/images/tolkien.png", "png bytes")
+
+    def sync(self, previous=None, **kwargs):
+        current = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = sync_static(self.static_dir, self.public_dir, previous or {}, current, **kwargs)
+        return stats, current
+
+    def test_copies_tree_and_preserves_mtime(self):
+        stats, current = self.sync()
+        self.assertEqual(stats["copied"], 2)
+        self.assertEqual(self.read_output("images/tolkien.png"), "png bytes")
+        self.assertEqual(sorted(current), ["images/tolkien.png", "index.css"])
+        src = os.stat(os.path.join(self.static_dir, "index.css"))
+        dest = os.stat(os.path.join(self.public_dir, "index.css"))
+        self.assertEqual(src.st_mtime_ns, dest.st_mtime_ns)
+
+    def test_second_sync_skips_unchanged_files(self):
+        _, current = self.sync()
+        self.write("static/index.css", "body { color: red; }")
+        stats, _ = self.sync(current)
+        self.assertEqual((stats["copied"], stats["unchanged"]), (1, 1))
+        self.assertEqual(self.read_output("index.css"), "body { color: red; }")
+
+    def test_checksum_skips_touched_but_identical_files(self):
+        _, current = self.sync()
+        os.utime(os.path.join(self.static_dir, "index.css"), ns=(0, 0))
+        stats, _ = self.sync(current, checksum=True)
+        self.assertEqual(stats["copied"], 0)
+        self.assertEqual(os.stat(os.path.join(self.public_dir, "index.css")).st_mtime_ns, 0)
+
+    def test_removed_files_are_pruned(self):
+        _, current = self.sync()
+        os.remove(os.path.join(self.static_dir, "images/tolkien.png"))
+        stats, _ = self.sync(current)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "images")))
+
+    def test_hardlink_mode_shares_inode(self):
+        self.sync(mode="hardlink")
+        src = os.stat(os.path.join(self.static_dir, "index.css"))
+        dest = os.stat(os.path.join(self.public_dir, "index.css"))
+        self.assertEqual(src.st_ino, dest.st_ino)
+
+    def test_failed_hardlink_leaves_source_intact(self):
+        src_path = os.path.join(self.static_dir, "index.css")
+        dest_path = os.path.join(self.public_dir, "index.css")
+        os.makedirs(os.path.join(dest_path, "occupied"))
+        with self.assertRaises(OSError):
+            copy_file(src_path, dest_path, os.stat(src_path), mode="hardlink")
+        with open(src_path) as f:
+            self.assertEqual(f.read(), "body {}")
+        self.assertEqual(os.listdir(self.public_dir), ["index.css"])
+
+    def test_falls_back_to_plain_copy(self):
+        src_path = os.path.join(self.static_dir, "index.css")
+        dest_path = os.path.join(self.public_dir, "index.css")
+        with mock.patch.object(static_sync, "fcntl", None), \
+             mock.patch.object(static_sync.os, "copy_file_range", side_effect=OSError(static_sync.errno.EXDEV, "cross-device"), create=True), \
+             mock.patch.object(static_sync.os, "sendfile", side_effect=OSError(static_sync.errno.ENOSYS, "unsupported"), create=True):
+            method = copy_file(src_path, dest_path, os.stat(src_path))
+        self.assertEqual(method, "read/write")
+        self.assertEqual(self.read_output("index.css"), "body {}")
+
+    def test_scan_is_sorted_relative_paths(self):
+        self.assertEqual([rel for rel, _, _ in scan_static(self.static_dir)], ["images/tolkien.png", "index.css"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+import main
+import taxonomy
+from site_fixture import SiteFixture
+from taxonomy import collect_listings, slugify, tag_slugs
+from template import Template
+
+def post(name, date=None, tags=()):
+    return {"output": f"blog/{name}/index.html", "title": name.title(), "date": date, "tags": list(tags)}
+
+class TestCollectListings(unittest.TestCase):
+    def test_groups_and_paginates_newest_first(self):
+        posts = [post("tom", "2023-05-01", ["songs"]), post("glorfindel", "2024-02-01", ["Elf Lords"]),
+                 post("majesty", "2024-01-01", ["songs"]), post("undated")]
+        listings = {listing["output"]: listing for listing in collect_listings(posts, page_size=2)}
+        self.assertEqual(sorted(listings), [
+            "archive/2023/index.html", "archive/2024/index.html", "blog/index.html", "blog/page/2/index.html",
+            "tags/elf-lords/index.html", "tags/songs/index.html",
+        ])
+        first = listings["blog/index.html"]
+        self.assertEqual([p["title"] for p in first["members"]], ["Glorfindel", "Majesty"])
+        self.assertEqual((first["prev"], first["next"]), (None, "blog/page/2/index.html"))
+        self.assertEqual([p["title"] for p in listings["blog/page/2/index.html"]["members"]], ["Tom", "Undated"])
+        self.assertEqual([p["title"] for p in listings["tags/songs/index.html"]["members"]], ["Majesty", "Tom"])
+
+    def test_slugify(self):
+        self.assertEqual(slugify("Middle-earth Lore!"), "middle-earth-lore")
+
+    def test_colliding_tag_slugs_are_numbered(self):
+        self.assertEqual(tag_slugs(["C++", "C", "c-2"]), {"C": "c", "C++": "c-2", "c-2": "c-2-2"})
+        outputs = [listing["output"] for listing in collect_listings([post("tom", tags=["C++"]), post("sam", tags=["C"])])]
+        self.assertEqual(sorted(output for output in outputs if output.startswith("tags/")),
+                         ["tags/c-2/index.html", "tags/c/index.html"])
+
+    def test_page_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            collect_listings([post("tom")], page_size=0)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main.build_parser().parse_args(["--page-size", "0"])
+
+    def test_dates_are_escaped(self):
+        listing = collect_listings([post("tom", '2024"><script>')])[0]
+        page = taxonomy.render_listing(listing, Template("{{ Content }}"), "/")
+        self.assertIn('<time datetime="2024&quot;&gt;&lt;script&gt;">2024&quot;&gt;&lt;script&gt;</time>', page)
+        self.assertNotIn("<script>", page)
+
+class TestListingBuild(SiteFixture, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_post("tom", "2023-05-01", "songs")
+        self.write_post("majesty", "2024-01-01", "books")
+
+    def write_post(self, name, date, tag, body="Text"):
+        self.write(f"content/blog/{name}/index.md", f"---\ndate: {date}\ntags: [{tag}]\n---\n# {name.title()}\n\n{body}")
+
+    def build(self):
+        with mock.patch("taxonomy.render_listing", wraps=taxonomy.render_listing) as render:
+            super().build(main.BuildOptions(incremental=True, listings=True))
+        return sorted(call.args[0]["output"] for call in render.call_args_list)
+
+    def test_only_listings_whose_membership_changed_are_rendered(self):
+        self.assertEqual(len(self.build()), 5)
+        self.assertEqual(self.build(), [])
+        self.write_post("tom", "2023-05-01", "songs", body="Edited text only")
+        self.assertEqual(self.build(), [])
+        self.write_post("tom", "2023-05-01", "elves")
+        self.assertEqual(self.build(), ["tags/elves/index.html"])
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "tags", "songs", "index.html")))
+        self.assertIn('<a href="/blog/majesty/">Majesty</a>', self.read_output("blog/index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
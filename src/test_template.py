@@ -0,0 +1,55 @@
+import unittest
+from template import Template, rewrite_url
+from markdown_to_html import markdown_to_html_node
+
+class TestTemplate(unittest.TestCase):
+    def test_render_slots(self):
+        template = Template("<title>{{ Title }}</title><article>{{ Content }}</article>")
+        self.assertEqual(
+            template.render(Title="Home", Content="<p>Hi</p>"),
+            "<title>Home</title><article><p>Hi</p></article>",
+        )
+
+    def test_slots_parsed_once(self):
+        template = Template("a{{ Title }}b{{ Content }}c")
+        self.assertEqual(template.literals, ["a", "b", "c"])
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+    def test_missing_slot_left_as_written(self):
+        template = Template("{{ Title }} {{ Footer }}")
+        self.assertEqual(template.render(Title="Home"), "Home {{ Footer }}")
+
+    def test_basepath_rewritten_in_template(self):
+        template = Template('<link href="/index.css"><img src="/logo.png"><a href="https://x.com">', "/site/")
+        self.assertEqual(
+            template.render(),
+            '<link href="/site/index.css"><img src="/site/logo.png"><a href="https://x.com">',
+        )
+
+    def test_slot_values_are_not_rewritten(self):
+        template = Template("{{ Content }}", "/site/")
+        self.assertEqual(template.render(Content='<code>href="/x"</code>'), '<code>href="/x"</code>')
+
+    def test_write_streams_strings_and_callables(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}{{ Footer }}")
+        parts = []
+        template.write(parts.append, Title="Home", Content=lambda write: write("<p>streamed</p>"))
+        self.assertEqual("".join(parts), "<title>Home</title><p>streamed</p>{{ Footer }}")
+
+class TestRewriteUrl(unittest.TestCase):
+    def test_root_relative(self):
+        self.assertEqual(rewrite_url("/images/tom.png", "/site/"), "/site/images/tom.png")
+
+    def test_absolute_and_relative_unchanged(self):
+        self.assertEqual(rewrite_url("https://example.com", "/site/"), "https://example.com")
+        self.assertEqual(rewrite_url("images/tom.png", "/site/"), "images/tom.png")
+
+    def test_default_basepath(self):
+        self.assertEqual(rewrite_url("/blog/tom", "/"), "/blog/tom")
+
+    def test_basepath_applied_while_rendering_nodes(self):
+        html = markdown_to_html_node("[home](/) and ![tom](/images/tom.png)", "/site/").to_html()
+        self.assertEqual(html, '<div><p><a href="/site/">home</a> and <img src="/site/images/tom.png" alt="tom"></p></div>')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import random
 import unittest
 from textnode import TextNode, TextType
-from inline_markdown import text_to_textnodes
+from inline_markdown import text_to_textnodes, text_to_textnodes_multipass
 
 class TestTextToTextNodes(unittest.TestCase):
     def test_plain_text(self):
@@ -67,5 +68,55 @@ class TestTextToTextNodes(unittest.TestCase):
             TextNode("alt", TextType.IMAGE, "https://example.com/img.png")
         ])
 
+    def test_adjacent_spans(self):
+        text = "**bold**_italic_`code`[link](/a)![img](/b.png)"
+        self.assertEqual(text_to_textnodes(text), [
+            TextNode("bold", TextType.BOLD),
+            TextNode("italic", TextType.ITALIC),
+            TextNode("code", TextType.CODE),
+            TextNode("link", TextType.LINK, "/a"),
+            TextNode("img", TextType.IMAGE, "/b.png"),
+        ])
+
+    def test_empty_string(self):
+        self.assertEqual(text_to_textnodes(""), [])
+
+    def test_unmatched_delimiter_raises(self):
+        for text in ["This is **bold", "an _italic", "some `code", "***"]:
+            with self.assertRaises(ValueError):
+                text_to_textnodes(text)
+
+    def test_brackets_that_are_not_links(self):
+        text = "a [note] (b) and ![x and [y](z"
+        self.assertEqual(text_to_textnodes(text), [TextNode(text, TextType.TEXT)])
+
+    def test_delimiters_inside_code_and_urls_are_literal(self):
+        self.assertEqual(text_to_textnodes("`snake_case` at [docs](/a_b)"), [
+            TextNode("snake_case", TextType.CODE),
+            TextNode(" at ", TextType.TEXT),
+            TextNode("docs", TextType.LINK, "/a_b"),
+        ])
+
+    def test_emphasis_inside_link_text_is_literal(self):
+        text = "see [the _docs_](url) now"
+        self.assertEqual(text_to_textnodes(text), [
+            TextNode("see ", TextType.TEXT),
+            TextNode("the _docs_", TextType.LINK, "url"),
+            TextNode(" now", TextType.TEXT),
+        ])
+        self.assertNotEqual(text_to_textnodes(text), text_to_textnodes_multipass(text))
+
+    def test_matches_multipass_chain(self):
+        rng = random.Random(1234)
+        spans = [
+            lambda w: w, lambda w: f" {w} ", lambda w: f"**{w}**", lambda w: f"_{w}_",
+            lambda w: f"`{w}`", lambda w: f"[{w}](https://example.com/{w})",
+            lambda w: f"![{w}](/images/{w}.png)", lambda w: "[", lambda w: "! ", lambda w: "(x)",
+        ]
+        words = ["alpha", "beta", "gamma delta", "e", "ring-bearer"]
+        for _ in range(500):
+            text = "".join(rng.choice(spans)(rng.choice(words)) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(text_to_textnodes(text), text_to_textnodes_multipass(text), text)
+
 if __name__ == "__main__":
     unittest.main()
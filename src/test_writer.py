@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from writer import PageWriter, AtomicFile
+
+class TestAtomicFile(unittest.TestCase):
+    def test_failed_write_keeps_old_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with AtomicFile(path) as f:
+                f.write("old")
+            with self.assertRaises(RuntimeError):
+                with AtomicFile(path) as f:
+                    f.write("half a pa")
+                    raise RuntimeError("interrupted")
+            with open(path) as f:
+                self.assertEqual(f.read(), "old")
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+class TestPageWriter(unittest.TestCase):
+    def test_writes_pages_and_creates_each_directory_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, "blog", f"post-{i}.html") for i in range(20)]
+            with mock.patch("writer.os.makedirs", wraps=os.makedirs) as makedirs:
+                with PageWriter(workers=4, max_pending=2) as writer:
+                    for i, path in enumerate(paths):
+                        writer.write(path, f"<p>{i}</p>")
+            self.assertEqual(makedirs.call_count, 1)
+            self.assertEqual(len(writer.changed), 20)
+            self.assertEqual(writer.errors, {})
+            with open(paths[7]) as f:
+                self.assertEqual(f.read(), "<p>7</p>")
+
+    def test_identical_page_is_left_untouched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with PageWriter() as writer:
+                writer.write(path, "<p>same</p>")
+            os.utime(path, ns=(0, 0))
+            with PageWriter() as writer:
+                writer.write(path, "<p>same</p>")
+            self.assertEqual((writer.changed, writer.unchanged), ([], 1))
+            self.assertEqual(os.stat(path).st_mtime_ns, 0)
+
+    def test_errors_are_collected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            blocker = os.path.join(tmp, "blog")
+            with open(blocker, "w") as f:
+                f.write("a file where a directory should be")
+            writer = PageWriter()
+            writer.write(os.path.join(tmp, "ok.html"), "fine")
+            writer.write(os.path.join(blocker, "post.html"), "broken")
+            errors = writer.close()
+            self.assertEqual(list(errors), [os.path.join(blocker, "post.html")])
+            self.assertEqual(writer.changed, [os.path.join(tmp, "ok.html")])
+
+
+if __name__ == "__main__":
+    unittest.main()
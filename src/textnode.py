@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Optional
 from htmlnode import LeafNode
+from template import rewrite_url
 
 class TextType(Enum):
     """Enum representing different types of inline text formatting."""
@@ -12,6 +13,8 @@ class TextType(Enum):
     IMAGE = "image"    # Images ![alt text](url)
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text: str, text_type: TextType, url: Optional[str] = None):
         """Initialize a TextNode.
     
@@ -33,7 +36,7 @@ class TextNode:
     def __repr__(self):
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
-def text_node_to_html_node(text_node: TextNode):
+def text_node_to_html_node(text_node: TextNode, basepath: str = "/", asset_urls: Optional[dict] = None):
     """Convert a TextNode into its corresponding HTML node representation.
 
     Maps the TextType of the given TextNode to a specific HTML tag and
@@ -41,6 +44,8 @@ def text_node_to_html_node(text_node: TextNode):
 
     Args:
         text_node: The TextNode instance to convert.
+        basepath: URL prefix applied to root-relative link and image URLs. Defaults to "/".
+        asset_urls: (Optional) Fingerprinted asset names, see rewrite_url.
 
     Returns:
         LeafNode: An HTML representation of the text node with the appropriate
@@ -63,7 +68,7 @@ def text_node_to_html_node(text_node: TextNode):
     if text_node.text_type == TextType.CODE:
         return LeafNode("code", text_node.text, None)
     if text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href":text_node.url})
+        return LeafNode("a", text_node.text, {"href":rewrite_url(text_node.url, basepath, asset_urls)})
     if text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src":text_node.url, "alt":text_node.text})
+        return LeafNode("img", "", {"src":rewrite_url(text_node.url, basepath, asset_urls), "alt":text_node.text})
     raise ValueError("Not a valid TextNode - no valid TextType")
\ No newline at end of file
@@ -0,0 +1,157 @@
+import contextlib
+import filecmp
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+WRITE_WORKERS = 4
+MAX_PENDING = 64  # Rendered pages waiting to be written before the render loop blocks
+
+def same_contents(path, data):
+    """Return True if the file at path exists and holds exactly `data` (bytes)."""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+class AtomicFile:
+    def __init__(self, path, mode="w", skip_unchanged=True):
+        """Open a temporary file that replaces `path` only once it is fully written.
+
+        If the block raises, the temporary file is deleted and `path` is left
+        as it was, so an interrupted build never leaves a half-written page
+        behind. With skip_unchanged, a result identical to the existing file
+        is discarded so the file keeps its mtime and downstream caches stay
+        valid; `changed` records which happened.
+
+        Args:
+            path (str): The file to write.
+            mode (str): Open mode, "w" or "wb".
+            skip_unchanged (bool): Leave `path` untouched if the new contents are identical.
+
+        Example:
+            output = AtomicFile("docs/index.html")
+            with output as f:
+                f.write(html)
+            print(output.changed)
+        """
+        self.path = path
+        self.mode = mode
+        self.skip_unchanged = skip_unchanged
+        self.tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        self.file = None
+        self.changed = None
+
+    def __enter__(self):
+        self.file = open(self.tmp_path, self.mode)
+        return self.file
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        identical = exc_type is None and self.skip_unchanged and os.path.exists(self.path) \
+            and filecmp.cmp(self.tmp_path, self.path, shallow=False)
+        if exc_type is not None or identical:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.tmp_path)
+            if identical:
+                self.changed = False
+            return False
+        os.replace(self.tmp_path, self.path)
+        self.changed = True
+        return False
+
+class PageWriter:
+    def __init__(self, workers=WRITE_WORKERS, max_pending=MAX_PENDING):
+        """Writes rendered pages on background threads.
+
+        The render loop hands pages over with write() and carries on with the
+        next render while the file I/O happens on a thread pool. At most
+        `max_pending` pages are held in memory; write() blocks when the
+        writers fall behind. Each output directory is created once, every
+        page is written atomically (see AtomicFile), and pages whose bytes
+        match the existing file aren't rewritten at all.
+
+        Args:
+            workers (int): Number of writer threads.
+            max_pending (int): Maximum number of queued, unwritten pages.
+
+        Example:
+            with PageWriter() as writer:
+                writer.write("docs/index.html", html)
+            print(writer.changed, writer.errors)
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page-writer")
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.created_dirs = set()
+        self.futures = []
+        self.errors = {}
+        self.changed = []
+        self.unchanged = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, path, content):
+        """Queue a page to be written, blocking while the queue is full.
+
+        Args:
+            path (str): Where to write the page.
+            content (str): The page's HTML.
+        """
+        self.slots.acquire()
+        future = self.executor.submit(self.write_now, path, content)
+        future.add_done_callback(lambda _: self.slots.release())
+        self.futures.append((path, future))
+
+    def write_now(self, path, content):
+        """Write a page unless the file already holds the same bytes.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        data = content.encode("utf-8")
+        if same_contents(path, data):
+            return False
+        self.ensure_dir(os.path.dirname(path))
+        with AtomicFile(path, "wb", skip_unchanged=False) as f:
+            f.write(data)
+        return True
+
+    def record(self, path, changed):
+        """Count a page that was written elsewhere (e.g. streamed by a worker)."""
+        if changed:
+            self.changed.append(path)
+        else:
+            self.unchanged += 1
+
+    def ensure_dir(self, path):
+        with self.lock:
+            if path not in self.created_dirs:
+                os.makedirs(path, exist_ok=True)
+                self.created_dirs.add(path)
+
+    def close(self):
+        """Wait for every queued page to be written.
+
+        Afterwards `changed` lists the paths whose contents changed and
+        `unchanged` counts the pages that were identical and left alone.
+
+        Returns:
+            dict: Maps the path of each page that couldn't be written to the error.
+        """
+        self.executor.shutdown(wait=True)
+        for path, future in self.futures:
+            error = future.exception()
+            if error is None:
+                self.record(path, future.result())
+            else:
+                self.errors[path] = f"{type(error).__name__}: {error}"
+        self.futures = []
+        return self.errors